@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Bundle the cheshire package into a single executable zipapp (cheshire.pyz).
+
+The archive ships pre-compiled bytecode next to the sources, so imports are
+served from one zip file instead of stat/open calls on every module.
+Third-party dependencies (duckdb, textual, ...) are not bundled and must be
+installed in the interpreter that runs the archive.
+"""
+
+import compileall
+import os
+import shutil
+import tempfile
+import zipapp
+
+PACKAGE = 'cheshire'
+TARGET = 'cheshire.pyz'
+
+
+def tree_sizes(path):
+    """Return total (.py, .pyc) bytes under path in a single directory walk."""
+    py_size = pyc_size = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    py_size += entry.stat(follow_symlinks=False).st_size
+                elif entry.name.endswith('.pyc'):
+                    pyc_size += entry.stat(follow_symlinks=False).st_size
+    return py_size, pyc_size
+
+
+def build_zipapp(target=TARGET):
+    """Compile the package and write it into a zipapp archive."""
+
+    with tempfile.TemporaryDirectory() as staging:
+        # Stage a clean copy so the archive contains the package directory itself
+        package_dir = os.path.join(staging, PACKAGE)
+        shutil.copytree(
+            PACKAGE,
+            package_dir,
+            ignore=shutil.ignore_patterns('__pycache__', '*.pyc', '*.pyo')
+        )
+
+        print("Compiling cheshire package...")
+        # zipimport only looks for legacy (non-__pycache__) .pyc files.
+        # optimize=1 strips asserts but keeps docstrings, which click uses for --help.
+        success = compileall.compile_dir(
+            package_dir,
+            ddir=PACKAGE,
+            force=True,
+            optimize=1,
+            legacy=True,
+            workers=os.cpu_count() or 1,
+            quiet=1
+        )
+        if not success:
+            print("✗ Compilation failed")
+            return 1
+
+        py_size, pyc_size = tree_sizes(package_dir)
+        print(f"\nSource files (.py): {py_size:,} bytes")
+        print(f"Compiled files (.pyc): {pyc_size:,} bytes")
+
+        zipapp.create_archive(
+            staging,
+            target=target,
+            interpreter='/usr/bin/env python3',
+            main='cheshire.main:main',
+            compressed=True
+        )
+
+    print(f"✓ Built {target} ({os.path.getsize(target):,} bytes)")
+    print(f"Run with: python {target} --help")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(build_zipapp())
@@ -4,19 +4,187 @@ Database Analyzer for cheshire
 Analyzes database tables to recommend appropriate visualizations
 """
 
+import heapq
 import json
 import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import combinations, islice
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 import duckdb
-from .db_connectors import create_connector, execute_query_compat
+from .db_connectors import compat_connector, create_connector, execute_query_compat
+
+# orjson is an optional speedup for writing large analysis files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Database types whose queries are executed by DuckDB (directly or via scanner extensions)
+DUCKDB_BACKED_TYPES = {'duckdb', 'sqlite', 'postgres', 'postgresql', 'mysql'}
+
+# Common date prefixes: YYYY-MM-DD, MM/DD/YYYY or DD/MM/YYYY, YYYY/MM/DD, DD-MM-YYYY or MM-DD-YYYY
+_DATE_PREFIX_RE = re.compile(r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{4}/\d{2}/\d{2}|\d{2}-\d{2}-\d{4}')
+
+# Path separators in a database name become underscores in its sidecar file names
+_SAFE_NAME_TABLE = str.maketrans({'/': '_', '\\': '_'})
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for use in SQL"""
+    return '"' + name.replace('"', '""') + '"'
+
+def write_json(path: str, data: Any, pretty: bool = False) -> None:
+    """Write data to a JSON file, serializing with orjson when it is installed.
+    
+    Output is compact unless pretty is set, which indents it for reading.
+    """
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            # orjson rejects some values json accepts (e.g. integers wider than 64 bits)
+            payload = None
+        if payload is not None:
+            with open(path, 'wb') as f:
+                f.write(payload)
+            return
+    with open(path, 'w') as f:
+        if pretty:
+            json.dump(data, f, indent=2, default=str)
+        else:
+            json.dump(data, f, separators=(',', ':'), default=str)
+
+
+# Fraction of a text column's sample values that must look like dates for it to be a date
+DATE_SAMPLE_FRACTION = 0.8
+
+# Full-value date shapes. Each shape maps to the strptime formats that can parse it,
+# in the order they are tried, so at most two formats are attempted per value.
+# Day fields allow a leading space, as strptime's %d does.
+_DATE_SHAPE_RE = re.compile(
+    r'(?P<ymd_dash>\d{4}-\d{1,2}-[ \d]?\d)'
+    r'|(?P<ymd_slash>\d{4}/\d{1,2}/[ \d]?\d)'
+    r'|(?P<dmy_slash>[ \d]?\d/[ \d]?\d/\d{4})'
+    r'|(?P<dmy_dash>[ \d]?\d-[ \d]?\d-\d{4})'
+    r'|(?P<ymd_time>\d{4}-\d{1,2}-[ \d]?\d\s+\d{1,2}:\d{1,2}:\d{1,2})'
+)
+_DATE_SHAPE_FORMATS = {
+    'ymd_dash': (('%Y-%m-%d', 'YYYY-MM-DD'),),
+    'ymd_slash': (('%Y/%m/%d', 'YYYY/MM/DD'),),
+    'dmy_slash': (('%d/%m/%Y', 'DD/MM/YYYY'), ('%m/%d/%Y', 'MM/DD/YYYY')),
+    'dmy_dash': (('%d-%m-%Y', 'DD-MM-YYYY'), ('%m-%d-%Y', 'MM-DD-YYYY')),
+    'ymd_time': (('%Y-%m-%d %H:%M:%S', 'YYYY-MM-DD HH:MM:SS'),),
+}
+
+
+def _classify_date_shape(value: str) -> Optional[str]:
+    """Return the name of the date shape the whole value matches, if any"""
+    match = _DATE_SHAPE_RE.fullmatch(value)
+    return match.lastgroup if match else None
+
+
+def _parse_date_shape(value: str, shape: str) -> Optional[Tuple[datetime, str]]:
+    """Parse a value of a known shape, returning (datetime, format name)"""
+    if shape == 'ymd_dash':
+        # Plain ISO dates are built directly, skipping strptime
+        year, month, day = value.split('-')
+        try:
+            return datetime(int(year), int(month), int(day)), 'YYYY-MM-DD'
+        except ValueError:
+            return None
+    
+    for fmt, name in _DATE_SHAPE_FORMATS[shape]:
+        try:
+            return datetime.strptime(value, fmt), name
+        except ValueError:
+            continue
+    return None
+
+
+# SQL type families, matched anywhere in the upper-cased type name
+_NUMERIC_TYPE_RE = re.compile(r'INT|FLOAT|DOUBLE|DECIMAL|NUMERIC|REAL')
+_DATE_TYPE_RE = re.compile(r'DATE|TIME')
+
+# Column name fragments hinting at a calendar dimension (YEAR, MONTH, etc.)
+_DATE_TERM_RE = re.compile(r'YEAR|MONTH|QUARTER|WEEK|DAY|HOUR', re.IGNORECASE)
+
+# Column name fragments (lower case) hinting at geographic data
+_GEO_NAME_RE = re.compile(r'lat|lon|coord|geo|location|position|gps')
+_LAT_NAME_RE = re.compile(r'lat|y_coord|y_pos')
+_LON_NAME_RE = re.compile(r'lon|lng|x_coord|x_pos')
+
+# Column names that look like identifiers (id, user_id, id_customer, ...)
+_ID_NAME_RE = re.compile(r'^id$|_id$|^id_', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _geo_name_flags(col_name: str) -> Tuple[bool, bool, bool]:
+    """Classify a column name as (geographic, latitude-like, longitude-like) by name alone"""
+    col_lower = col_name.lower()
+    
+    # Check column name patterns
+    has_geo_name = _GEO_NAME_RE.search(col_lower) is not None
+    
+    # Strong latitude/longitude indicators, or just called 'y'/'x'
+    has_lat_name = _LAT_NAME_RE.search(col_lower) is not None or col_lower == 'y'
+    has_lon_name = _LON_NAME_RE.search(col_lower) is not None or col_lower == 'x'
+    
+    return has_geo_name, has_lat_name, has_lon_name
+
+
+# Cardinalities at or below this must be exact, since the recommendation
+# thresholds (5, 10, 30, 50, 100, 200) are sensitive to small errors
+EXACT_CARDINALITY_LIMIT = 200
+# HyperLogLog estimates up to this are recounted exactly. The margin covers
+# overshoot (a 180-value column can be estimated above 200), so no column that
+# is truly within the limit is left with its estimate.
+CARDINALITY_RECOUNT_LIMIT = int(EXACT_CARDINALITY_LIMIT * 1.5)
+
+# Query shapes shared by several recommendation types. {t} is the table, {x} the
+# grouping column, {y} the aggregated column and {n} a row limit.
+_SQL_TEMPLATES = {
+    'count_by': "SELECT {x} as x, COUNT(*) as y FROM {t} WHERE {x} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
+    'count_by_top': "SELECT {x} as x, COUNT(*) as y FROM {t} WHERE {x} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT {n}",
+    'sum_by': "SELECT {x} as x, SUM({y}) as y FROM {t} WHERE {x} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
+    'avg_by': "SELECT {x} as x, AVG({y}) as y FROM {t} WHERE {x} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
+}
+
+# Upper bound on stored chart recommendations per table (best scores are kept)
+MAX_RECOMMENDATIONS_PER_TABLE = 200
+
+# Tables with fewer rows than these get no matrix heatmaps / scatter plots,
+# since a handful of points can't show a pattern
+MIN_ROWS_FOR_HEATMAP = 50
+MIN_ROWS_FOR_SCATTER = 100
+
+# Column stats of tables above this many rows are computed on a reservoir sample
+SAMPLE_THRESHOLD_ROWS = 500_000
+SAMPLE_ROWS = 100_000
+SAMPLE_SEED = 42
+# Sample values of such tables are drawn from a much smaller reservoir
+SAMPLE_VALUES_ROWS = 1000
 
 
 class ColumnAnalysis:
     """Analysis results for a single column"""
+    # One instance per analyzed column; slots keep wide schemas compact
+    __slots__ = (
+        'name', 'qname', 'data_type', 'sql_type',
+        'is_date', 'is_numeric', 'is_dimension', 'is_measure',
+        'is_latitude', 'is_longitude', 'is_geographic',
+        'cardinality', 'null_count', 'total_count',
+        'min_value', 'max_value', 'avg_value', 'sample_values',
+        'date_format', 'date_range_days', 'recommended_for'
+    )
+    
     def __init__(self, name: str, data_type: str):
         self.name = name
+        self.qname = quote_identifier(name)  # Name as used in SQL
         self.data_type = data_type
         self.sql_type = None
         self.is_date = False
@@ -60,23 +228,49 @@ class ColumnAnalysis:
             'date_range_days': self.date_range_days,
             'recommended_for': self.recommended_for
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ColumnAnalysis':
+        """Rebuild a column analysis from its to_dict() form"""
+        analysis = cls(data['name'], data['data_type'])
+        for key, value in data.items():
+            setattr(analysis, key, value)
+        return analysis
 
 
 class TableAnalysis:
     """Analysis results for a single table"""
+    __slots__ = ('name', 'qname', 'row_count', 'columns', 'recommended_charts', 'sample_data', '_columns_dict')
+    
     def __init__(self, name: str):
         self.name = name
+        self.qname = quote_identifier(name)  # Name (or table expression) as used in SQL
         self.row_count = 0
         self.columns: Dict[str, ColumnAnalysis] = {}
         self.recommended_charts = []  # List of (chart_type, config) tuples
+        self.sample_data = []  # Sample rows, filled in for remote files
+        self._columns_dict: Optional[Dict[str, Any]] = None
         
     def to_dict(self) -> Dict[str, Any]:
+        # Column stats are final once the table is analyzed, so their dict form is
+        # built on first use and shared by the stats cache and the saved analysis.
+        # Recommendations are read fresh since they are assigned after the stats.
+        if self._columns_dict is None:
+            self._columns_dict = {name: col.to_dict() for name, col in self.columns.items()}
         return {
             'name': self.name,
             'row_count': self.row_count,
-            'columns': {name: col.to_dict() for name, col in self.columns.items()},
+            'columns': self._columns_dict,
             'recommended_charts': self.recommended_charts
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TableAnalysis':
+        """Rebuild a table analysis (without recommendations) from its to_dict() form"""
+        analysis = cls(data['name'])
+        analysis.row_count = data['row_count']
+        analysis.columns = {name: ColumnAnalysis.from_dict(col) for name, col in data['columns'].items()}
+        return analysis
 
 
 class DatabaseAnalyzer:
@@ -87,25 +281,68 @@ class DatabaseAnalyzer:
         self.db_type = db_type
         self.db_name = db_name
         self.analysis_results: Dict[str, TableAnalysis] = {}
+        self._schema: Optional[Dict[str, List[Tuple[str, str]]]] = None
+        self._stats_cache: Dict[str, Any] = {}
+        self._fingerprints: Dict[str, Dict[str, Any]] = {}
+        self._output = threading.local()
         
     def analyze(self) -> Dict[str, TableAnalysis]:
         """Run full analysis on all tables"""
+        # The analysis runs many queries, so the database stays open for the whole
+        # run (file-backed DuckDB is otherwise reopened per query) and is released after
+        with compat_connector(self.db_config).hold():
+            return self._analyze_tables()
+    
+    def _analyze_tables(self) -> Dict[str, TableAnalysis]:
+        """Analyze every table and generate its chart recommendations"""
         print("🔍 Starting database analysis...")
         
-        # Get all tables
-        tables = self._get_tables()
+        # Get all tables (and their columns, when the backend can list them in one query)
+        self._schema = self._load_schema()
+        tables = list(self._schema) if self._schema else self._get_tables()
         print(f"Found {len(tables)} tables to analyze")
         
-        for table_name in tables:
-            print(f"\n📊 Analyzing table: {table_name}")
-            self._analyze_table(table_name)
-            
-        # Generate recommendations
-        print("\n💡 Generating chart recommendations...")
-        self._generate_recommendations()
+        # Reuse stats from a previous run for tables that haven't changed
+        cache_path = self._stats_cache_path()
+        self._stats_cache = self._load_stats_cache(cache_path)
+        self._fingerprints = {}
+        analyze_table = self._analyze_or_restore_table if cache_path else self._analyze_table
+        
+        def analyze_and_recommend(table_name: str) -> Tuple[TableAnalysis, List[str]]:
+            self._output.lines = lines = []
+            try:
+                analysis = analyze_table(table_name)
+                analysis.recommended_charts = self._recommend_charts(table_name, analysis)
+            finally:
+                self._output.lines = None
+            return analysis, lines
+        
+        # Tables are independent and the work is query-bound, so analyze them concurrently.
+        # Each worker generates its table's recommendations as soon as the stats are in,
+        # so that step overlaps with the queries still running for other tables.
+        # Results (and each table's buffered progress messages) are handled in table
+        # order to keep the output deterministic.
+        if tables:
+            with ThreadPoolExecutor(max_workers=min(8, len(tables))) as executor:
+                for table_name, (analysis, lines) in zip(tables, executor.map(analyze_and_recommend, tables)):
+                    if lines:
+                        print('\n'.join(lines))
+                    self.analysis_results[table_name] = analysis
+        print("\n💡 Generated chart recommendations")
+        
+        if cache_path:
+            self._save_stats_cache(cache_path)
         
         return self.analysis_results
     
+    def _log(self, message: str) -> None:
+        """Print a progress message, or buffer it while running in a table worker"""
+        lines = getattr(self._output, 'lines', None)
+        if lines is None:
+            print(message)
+        else:
+            lines.append(message)
+    
     def _get_tables(self) -> List[str]:
         """Get list of all tables in database"""
         if self.db_type == 'duckdb':
@@ -126,81 +363,322 @@ class DatabaseAnalyzer:
         
         return tables
     
-    def _analyze_table(self, table_name: str) -> None:
-        """Analyze a single table"""
-        analysis = TableAnalysis(table_name)
+    def _load_schema(self) -> Optional[Dict[str, List[Tuple[str, str]]]]:
+        """Fetch columns of every table in one information_schema query.
         
-        # Get row count
-        count_query = f"SELECT COUNT(*) as cnt FROM {table_name}"
-        results = execute_query_compat(count_query, self.db_config)
-        if results:
-            analysis.row_count = results[0].get('cnt', 0)
-        
-        print(f"  Row count: {analysis.row_count:,}")
-        
-        # Get columns
+        Returns None when the backend is not covered or the query fails, in which
+        case tables and columns are discovered per table instead.
+        """
         if self.db_type == 'duckdb':
-            columns_query = f"DESCRIBE {table_name}"
+            catalog_filter = "table_catalog = current_database()"
         elif self.db_type == 'sqlite':
-            columns_query = f"PRAGMA table_info({table_name})"
+            # SQLite files are attached to DuckDB as sqlite_db
+            catalog_filter = "table_catalog = 'sqlite_db'"
         else:
-            columns_query = f"DESCRIBE {table_name}"
-            
+            return None
+        
+        query = (
+            "SELECT table_name, column_name, data_type FROM information_schema.columns "
+            f"WHERE {catalog_filter} AND table_schema = 'main' "
+            "ORDER BY table_name, ordinal_position"
+        )
+        try:
+            results = execute_query_compat(query, self.db_config)
+        except Exception:
+            return None
+        
+        schema: Dict[str, List[Tuple[str, str]]] = {}
+        for row in results:
+            schema.setdefault(row['table_name'], []).append((row['column_name'], row['data_type']))
+        return schema or None
+    
+    def _describe_columns(self, table_name: str) -> List[Tuple[str, str]]:
+        """Get (name, type) pairs for a table's columns with a per-table query"""
+        columns_query = f"DESCRIBE {quote_identifier(table_name)}"
         columns = execute_query_compat(columns_query, self.db_config)
         
-        # Analyze each column
+        column_list = []
         for col_info in columns:
-            if self.db_type == 'duckdb':
+            # SQLite tables are attached to DuckDB, so DESCRIBE reports them like native ones
+            if self.db_type in ('duckdb', 'sqlite'):
                 col_name = col_info.get('column_name', '')
                 col_type = col_info.get('column_type', '')
-            elif self.db_type == 'sqlite':
-                col_name = col_info.get('name', '')
-                col_type = col_info.get('type', '')
             else:
                 col_name = list(col_info.values())[0]
                 col_type = list(col_info.values())[1] if len(col_info.values()) > 1 else ''
                 
             if col_name:
-                print(f"  Analyzing column: {col_name} ({col_type})")
-                col_analysis = self._analyze_column(table_name, col_name, col_type)
-                analysis.columns[col_name] = col_analysis
+                column_list.append((col_name, col_type))
         
-        self.analysis_results[table_name] = analysis
+        return column_list
+    
+    def _stats_cache_path(self) -> Optional[Path]:
+        """Sidecar file for cached column stats, or None when caching doesn't apply"""
+        # The fingerprint only notices in-place changes (an UPDATE keeping the row
+        # count) through the file's mtime, so server databases are never cached
+        if self._db_mtime() is None:
+            return None
+        if self.db_name:
+            safe_name = self.db_name.translate(_SAFE_NAME_TABLE)
+        elif isinstance(self.db_config, str) and self.db_config not in ('', ':memory:'):
+            safe_name = Path(self.db_config).stem.replace('.', '_')
+        else:
+            return None
+        return Path(f'.cheshire_stats_{safe_name}.json')
+    
+    def _db_mtime(self) -> Optional[float]:
+        """Modification time of a file-backed database, if there is one"""
+        path = self.db_config if isinstance(self.db_config, str) else None
+        if isinstance(self.db_config, dict):
+            path = self.db_config.get('path')
+        if path and Path(path).is_file():
+            return Path(path).stat().st_mtime
+        return None
+    
+    def _load_stats_cache(self, cache_path: Optional[Path]) -> Dict[str, Any]:
+        """Load cached table stats, ignoring a missing or unreadable cache"""
+        if not cache_path or not cache_path.exists():
+            return {}
+        try:
+            with open(cache_path, 'r') as f:
+                return json.load(f).get('tables', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+    
+    def _save_stats_cache(self, cache_path: Path) -> None:
+        """Store the stats of every analyzed table with the fingerprint they were computed for"""
+        tables = {}
+        for table_name, analysis in self.analysis_results.items():
+            fingerprint = self._fingerprints.get(table_name)
+            if fingerprint is None:
+                continue
+            table_stats = analysis.to_dict()
+            del table_stats['recommended_charts']
+            tables[table_name] = {'fingerprint': fingerprint, 'analysis': table_stats}
+        try:
+            write_json(cache_path, {'tables': tables})
+        except OSError as e:
+            print(f"  Warning: Could not write stats cache {cache_path}: {e}")
     
-    def _analyze_column(self, table_name: str, col_name: str, col_type: str) -> ColumnAnalysis:
-        """Analyze a single column"""
+    def _analyze_or_restore_table(self, table_name: str) -> TableAnalysis:
+        """Restore a table's stats from the cache if its fingerprint still matches, else analyze it"""
+        row_count = self._count_rows(table_name)
+        column_list = self._table_columns(table_name)
+        fingerprint = {
+            'row_count': row_count,
+            'columns': [list(col) for col in column_list],
+            'mtime': self._db_mtime()
+        }
+        self._fingerprints[table_name] = fingerprint
+        
+        cached = self._stats_cache.get(table_name)
+        if cached and cached.get('fingerprint') == fingerprint:
+            self._log(f"\n📊 Using cached stats for table: {table_name}")
+            try:
+                return TableAnalysis.from_dict(cached['analysis'])
+            except (KeyError, TypeError, AttributeError):
+                pass  # Malformed entry, analyze again
+        
+        return self._analyze_table(table_name, row_count, column_list)
+    
+    def _count_rows(self, table_name: str) -> int:
+        """Get a table's row count"""
+        count_query = f"SELECT COUNT(*) as cnt FROM {quote_identifier(table_name)}"
+        results = execute_query_compat(count_query, self.db_config)
+        if results:
+            return results[0].get('cnt', 0)
+        return 0
+    
+    def _table_columns(self, table_name: str) -> List[Tuple[str, str]]:
+        """Get a table's columns, from the schema loaded up front when available"""
+        column_list = (self._schema or {}).get(table_name)
+        if column_list is None:
+            column_list = self._describe_columns(table_name)
+        return column_list
+    
+    def _analyze_table(self, table_name: str, row_count: Optional[int] = None,
+                       column_list: Optional[List[Tuple[str, str]]] = None) -> TableAnalysis:
+        """Analyze a single table"""
+        self._log(f"\n📊 Analyzing table: {table_name}")
+        analysis = TableAnalysis(table_name)
+        
+        # Get row count
+        analysis.row_count = self._count_rows(table_name) if row_count is None else row_count
+        
+        self._log(f"  Row count: {analysis.row_count:,}")
+        
+        # Get columns
+        if column_list is None:
+            column_list = self._table_columns(table_name)
+        
+        # Gather stats for every column in a single table scan
+        stats = self._fetch_column_stats(table_name, column_list, analysis.row_count)
+        
+        for col_name, col_type in column_list:
+            self._log(f"  Analyzing column: {col_name} ({col_type})")
+            col_analysis = self._analyze_column(table_name, col_name, col_type, stats.get(col_name))
+            analysis.columns[col_name] = col_analysis
+        
+        return analysis
+    
+    def _column_kind(self, col_type: str) -> str:
+        """Classify a SQL type as 'numeric', 'date' or 'text'"""
+        col_type_upper = col_type.upper()
+        if _NUMERIC_TYPE_RE.search(col_type_upper):
+            return 'numeric'
+        elif _DATE_TYPE_RE.search(col_type_upper):
+            return 'date'
+        return 'text'
+    
+    def _uses_approx_distinct(self) -> bool:
+        """Whether cardinality can be estimated with DuckDB's HyperLogLog"""
+        return self.db_type.lower() in DUCKDB_BACKED_TYPES
+    
+    def _distinct_count_expr(self, col_ref: str) -> str:
+        """SQL expression for a column's cardinality
+        
+        Cardinality is only compared against thresholds, so DuckDB's HyperLogLog
+        estimate is used where available instead of building an exact hash set.
+        """
+        if self._uses_approx_distinct():
+            return f"approx_count_distinct({col_ref})"
+        return f"COUNT(DISTINCT {col_ref})"
+    
+    def _sample_clause(self, row_count: int, sample_rows: int = SAMPLE_ROWS,
+                       keyword: str = 'USING SAMPLE') -> str:
+        """DuckDB sampling clause for tables too large to scan in full, else ''"""
+        if row_count > SAMPLE_THRESHOLD_ROWS and self.db_type.lower() in DUCKDB_BACKED_TYPES:
+            return f" {keyword} reservoir({sample_rows} ROWS) REPEATABLE ({SAMPLE_SEED})"
+        return ""
+    
+    def _fetch_column_stats(self, table_name: str, columns: List[Tuple[str, str]],
+                            row_count: int = 0) -> Dict[str, Dict[str, Any]]:
+        """Compute counts, cardinality and value ranges for columns with one aggregate query
+        
+        Falls back to one query per column if the combined query fails, so a single
+        problematic column doesn't prevent the rest of the table from being analyzed.
+        Large tables are sampled and the counts scaled back up to row_count.
+        
+        DuckDB's SUMMARIZE also profiles every column in one pass, but it computes
+        quantiles and standard deviations we don't use (several times slower than this
+        query), returns min/max as text and rounds nulls to a percentage.
+        """
+        if not columns:
+            return {}
+        
+        sample_clause = self._sample_clause(row_count)
+        
+        select_parts = ["COUNT(*) AS total"]
+        for i, (col_name, col_type) in enumerate(columns):
+            col_q = quote_identifier(col_name)
+            select_parts.append(f"COUNT({col_q}) AS nn_{i}")
+            select_parts.append(f"{self._distinct_count_expr(col_q)} AS dc_{i}")
+            kind = self._column_kind(col_type)
+            if kind == 'numeric':
+                select_parts.append(f"MIN(CAST({col_q} AS DOUBLE)) AS mn_{i}")
+                select_parts.append(f"MAX(CAST({col_q} AS DOUBLE)) AS mx_{i}")
+                select_parts.append(f"AVG(CAST({col_q} AS DOUBLE)) AS av_{i}")
+            elif kind == 'date':
+                select_parts.append(f"MIN({col_q}) AS mn_{i}")
+                select_parts.append(f"MAX({col_q}) AS mx_{i}")
+        
+        table_q = quote_identifier(table_name)
+        stats_query = f"SELECT {', '.join(select_parts)} FROM {table_q}{sample_clause}"
+        try:
+            results = execute_query_compat(stats_query, self.db_config)
+        except Exception as e:
+            if len(columns) > 1:
+                stats = {}
+                for column in columns:
+                    stats.update(self._fetch_column_stats(table_name, [column], row_count))
+                return stats
+            self._log(f"    Warning: Error analyzing column {columns[0][0]}: {e}")
+            return {}
+        
+        if not results:
+            return {}
+        row = results[0]
+        total = row.get('total', 0)
+        
+        if self._uses_approx_distinct():
+            # Estimates can overshoot the number of values; low ones are recounted exactly
+            exact_parts = []
+            for i, (col_name, _) in enumerate(columns):
+                estimate = min(row.get(f'dc_{i}') or 0, row.get(f'nn_{i}') or 0)
+                row[f'dc_{i}'] = estimate
+                if estimate <= CARDINALITY_RECOUNT_LIMIT:
+                    exact_parts.append(f"COUNT(DISTINCT {quote_identifier(col_name)}) AS dc_{i}")
+            if exact_parts:
+                try:
+                    exact = execute_query_compat(
+                        f"SELECT {', '.join(exact_parts)} FROM {table_q}{sample_clause}", self.db_config)
+                    if exact:
+                        row.update(exact[0])
+                except Exception:
+                    pass  # Keep the estimates
+        
+        stats = {}
+        for i, (col_name, _) in enumerate(columns):
+            non_null = row.get(f'nn_{i}', 0)
+            distinct_count = row.get(f'dc_{i}', 0)
+            if sample_clause and total:
+                # Scale sample counts to the full table. Low-cardinality columns have
+                # all their values in the sample already; near-unique ones keep growing
+                # with the row count, so their distinct count is scaled with it.
+                scale = row_count / total
+                sample_non_null = non_null or 0
+                non_null = round(sample_non_null * scale)
+                if distinct_count and distinct_count > sample_non_null * 0.5:
+                    distinct_count = min(round(distinct_count * scale), non_null)
+            stats[col_name] = {
+                'total': row_count if sample_clause else total,
+                'non_null': non_null,
+                'distinct_count': distinct_count,
+                'min_val': row.get(f'mn_{i}'),
+                'max_val': row.get(f'mx_{i}'),
+                'avg_val': row.get(f'av_{i}'),
+            }
+        return stats
+    
+    def _analyze_column(self, table_name: str, col_name: str, col_type: str,
+                        stats: Optional[Dict[str, Any]] = None) -> ColumnAnalysis:
+        """Analyze a single column from its precomputed stats"""
         analysis = ColumnAnalysis(col_name, col_type)
         analysis.sql_type = col_type
         
         # Determine basic type
-        col_type_upper = col_type.upper()
-        if any(t in col_type_upper for t in ['INT', 'FLOAT', 'DOUBLE', 'DECIMAL', 'NUMERIC', 'REAL']):
+        kind = self._column_kind(col_type)
+        if kind == 'numeric':
             analysis.is_numeric = True
-        elif any(t in col_type_upper for t in ['DATE', 'TIME', 'TIMESTAMP']):
+        elif kind == 'date':
             analysis.is_date = True
+        
+        # Stats query failed for this column (warning already printed)
+        if stats is None:
+            return analysis
             
-        # Get basic statistics
         try:
-            # Count total and nulls
-            stats_query = f"""
-            SELECT 
-                COUNT(*) as total,
-                COUNT({col_name}) as non_null,
-                COUNT(DISTINCT {col_name}) as distinct_count
-            FROM {table_name}
-            """
-            results = execute_query_compat(stats_query, self.db_config)
-            if results:
-                stats = results[0]
-                analysis.total_count = stats.get('total', 0)
-                analysis.null_count = analysis.total_count - stats.get('non_null', 0)
-                analysis.cardinality = stats.get('distinct_count', 0)
+            analysis.total_count = stats['total']
+            analysis.null_count = analysis.total_count - stats['non_null']
+            analysis.cardinality = stats['distinct_count']
             
-            # Get sample values
-            sample_query = f"""
-            SELECT DISTINCT {col_name} as val
-            FROM {table_name}
-            WHERE {col_name} IS NOT NULL
+            # Get sample values. On large DuckDB tables, pick them from a small reservoir
+            # of non-null values so the DISTINCT hash table doesn't span the whole column.
+            sample_clause = self._sample_clause(analysis.total_count, SAMPLE_VALUES_ROWS, 'TABLESAMPLE')
+            col_q = analysis.qname
+            table_q = quote_identifier(table_name)
+            if sample_clause:
+                sample_query = f"""
+            SELECT {col_q} as val
+            FROM (SELECT {col_q} FROM {table_q} WHERE {col_q} IS NOT NULL){sample_clause}
+            GROUP BY 1
+            LIMIT 10
+            """
+            else:
+                sample_query = f"""
+            SELECT DISTINCT {col_q} as val
+            FROM {table_q}
+            WHERE {col_q} IS NOT NULL
             LIMIT 10
             """
             results = execute_query_compat(sample_query, self.db_config)
@@ -208,28 +686,17 @@ class DatabaseAnalyzer:
             
             # Numeric column analysis
             if analysis.is_numeric:
-                numeric_query = f"""
-                SELECT 
-                    MIN(CAST({col_name} AS DOUBLE)) as min_val,
-                    MAX(CAST({col_name} AS DOUBLE)) as max_val,
-                    AVG(CAST({col_name} AS DOUBLE)) as avg_val
-                FROM {table_name}
-                WHERE {col_name} IS NOT NULL
-                """
-                results = execute_query_compat(numeric_query, self.db_config)
-                if results:
-                    stats = results[0]
-                    analysis.min_value = stats.get('min_val')
-                    analysis.max_value = stats.get('max_val')
-                    analysis.avg_value = stats.get('avg_val')
-                    
-                    # Check if this might be latitude or longitude
-                    if self._is_geographic_column(col_name, analysis.min_value, analysis.max_value):
-                        analysis.is_geographic = True
-                        if self._is_latitude_column(col_name, analysis.min_value, analysis.max_value):
-                            analysis.is_latitude = True
-                        elif self._is_longitude_column(col_name, analysis.min_value, analysis.max_value):
-                            analysis.is_longitude = True
+                analysis.min_value = stats['min_val']
+                analysis.max_value = stats['max_val']
+                analysis.avg_value = stats['avg_val']
+                
+                # Check if this might be latitude or longitude
+                if self._is_geographic_column(col_name, analysis.min_value, analysis.max_value):
+                    analysis.is_geographic = True
+                    if self._is_latitude_column(col_name, analysis.min_value, analysis.max_value):
+                        analysis.is_latitude = True
+                    elif self._is_longitude_column(col_name, analysis.min_value, analysis.max_value):
+                        analysis.is_longitude = True
                     
                 # Numeric columns are usually measures (unless geographic)
                 if not analysis.is_geographic:
@@ -239,39 +706,30 @@ class DatabaseAnalyzer:
                 
             # Date column analysis
             elif analysis.is_date:
-                date_query = f"""
-                SELECT 
-                    MIN({col_name}) as min_date,
-                    MAX({col_name}) as max_date
-                FROM {table_name}
-                WHERE {col_name} IS NOT NULL
-                """
-                results = execute_query_compat(date_query, self.db_config)
-                if results:
-                    stats = results[0]
-                    analysis.min_value = stats.get('min_date')
-                    analysis.max_value = stats.get('max_date')
-                    
-                    # Calculate date range in days
-                    try:
-                        if analysis.min_value and analysis.max_value:
-                            min_date = self._parse_date(str(analysis.min_value))
-                            max_date = self._parse_date(str(analysis.max_value))
-                            if min_date and max_date:
-                                analysis.date_range_days = (max_date - min_date).days
-                    except:
-                        pass
+                analysis.min_value = stats['min_val']
+                analysis.max_value = stats['max_val']
+                
+                # Calculate date range in days
+                try:
+                    if analysis.min_value and analysis.max_value:
+                        min_date = self._parse_date(str(analysis.min_value))
+                        max_date = self._parse_date(str(analysis.max_value))
+                        if min_date and max_date:
+                            analysis.date_range_days = (max_date - min_date).days
+                except:
+                    pass
                         
                 # Dates are dimensions
                 analysis.is_dimension = True
                 
             # Text column analysis
             else:
-                # Check if it might be a date stored as text
-                if analysis.sample_values and self._looks_like_date(analysis.sample_values[0]):
+                # Check if it might be a date stored as text (most sample values look like dates)
+                date_values = self._date_like_values(analysis.sample_values)
+                if date_values and len(date_values) >= DATE_SAMPLE_FRACTION * len(analysis.sample_values):
                     analysis.is_date = True
                     analysis.is_dimension = True
-                    analysis.date_format = self._detect_date_format(analysis.sample_values[0])
+                    analysis.date_format = self._detect_date_format(date_values[0])
                 else:
                     # Low cardinality text columns are dimensions
                     if analysis.cardinality > 0 and analysis.cardinality <= 100:
@@ -289,7 +747,7 @@ class DatabaseAnalyzer:
                     analysis.is_dimension = True
                     
         except Exception as e:
-            print(f"    Warning: Error analyzing column {col_name}: {e}")
+            self._log(f"    Warning: Error analyzing column {col_name}: {e}")
             
         return analysis
     
@@ -298,13 +756,7 @@ class DatabaseAnalyzer:
         if min_val is None or max_val is None:
             return False
             
-        col_lower = col_name.lower()
-        
-        # Check column name patterns
-        geo_patterns = ['lat', 'lon', 'latitude', 'longitude', 'coord', 'geo', 
-                       'location', 'position', 'gps', 'y_coord', 'x_coord']
-        
-        has_geo_name = any(pattern in col_lower for pattern in geo_patterns)
+        has_geo_name = _geo_name_flags(col_name)[0]
         
         # Check value ranges
         is_lat_range = -90 <= min_val <= 90 and -90 <= max_val <= 90
@@ -317,16 +769,9 @@ class DatabaseAnalyzer:
         if min_val is None or max_val is None:
             return False
             
-        col_lower = col_name.lower()
-        
-        # Strong latitude indicators
-        if any(x in col_lower for x in ['lat', 'latitude', 'y_coord', 'y_pos']):
+        if _geo_name_flags(col_name)[1]:
             return -90 <= min_val <= 90 and -90 <= max_val <= 90
             
-        # If just called 'y' and in latitude range
-        if col_lower == 'y' and -90 <= min_val <= 90 and -90 <= max_val <= 90:
-            return True
-            
         return False
     
     def _is_longitude_column(self, col_name: str, min_val: float, max_val: float) -> bool:
@@ -334,799 +779,794 @@ class DatabaseAnalyzer:
         if min_val is None or max_val is None:
             return False
             
-        col_lower = col_name.lower()
-        
-        # Strong longitude indicators
-        if any(x in col_lower for x in ['lon', 'lng', 'long', 'longitude', 'x_coord', 'x_pos']):
+        if _geo_name_flags(col_name)[2]:
             return -180 <= min_val <= 180 and -180 <= max_val <= 180
             
-        # If just called 'x' and in longitude range
-        if col_lower == 'x' and -180 <= min_val <= 180 and -180 <= max_val <= 180:
-            return True
-            
         return False
     
-    def _looks_like_date(self, value: Any) -> bool:
-        """Check if a value looks like a date"""
-        if not value:
-            return False
-        value_str = str(value)
-        # Common date patterns
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY or DD/MM/YYYY
-            r'\d{4}/\d{2}/\d{2}',  # YYYY/MM/DD
-            r'\d{2}-\d{2}-\d{4}',  # DD-MM-YYYY or MM-DD-YYYY
-        ]
-        return any(re.match(pattern, value_str) for pattern in date_patterns)
+    def _date_like_values(self, values: List[Any]) -> List[Any]:
+        """Filter sample values down to the ones that look like dates, in one pass"""
+        matches = map(_DATE_PREFIX_RE.match, map(str, values))
+        return [value for value, match in zip(values, matches) if value and match]
     
     def _detect_date_format(self, value: Any) -> Optional[str]:
         """Detect the date format of a value"""
         if not value:
             return None
-        value_str = str(value)
-        
-        formats = [
-            ('%Y-%m-%d', 'YYYY-MM-DD'),
-            ('%Y/%m/%d', 'YYYY/MM/DD'),
-            ('%d/%m/%Y', 'DD/MM/YYYY'),
-            ('%m/%d/%Y', 'MM/DD/YYYY'),
-            ('%d-%m-%Y', 'DD-MM-YYYY'),
-            ('%m-%d-%Y', 'MM-DD-YYYY'),
-            ('%Y-%m-%d %H:%M:%S', 'YYYY-MM-DD HH:MM:SS'),
-        ]
+        value_str = str(value).split('.')[0]
         
-        for fmt, name in formats:
-            try:
-                datetime.strptime(value_str.split('.')[0], fmt)
-                return name
-            except:
-                continue
-        return None
+        shape = _classify_date_shape(value_str)
+        if shape is None:
+            return None
+        parsed = _parse_date_shape(value_str, shape)
+        return parsed[1] if parsed else None
     
     def _parse_date(self, value: str) -> Optional[datetime]:
         """Parse a date string"""
-        formats = [
-            '%Y-%m-%d',
-            '%Y/%m/%d',
-            '%d/%m/%Y',
-            '%m/%d/%Y',
-            '%Y-%m-%d %H:%M:%S',
-        ]
+        value_str = value.split('.')[0]
         
-        for fmt in formats:
-            try:
-                return datetime.strptime(value.split('.')[0], fmt)
-            except:
-                continue
-        return None
+        # Day-first/month-first dashed dates are detected but never parsed
+        shape = _classify_date_shape(value_str)
+        if shape is None or shape == 'dmy_dash':
+            return None
+        parsed = _parse_date_shape(value_str, shape)
+        return parsed[0] if parsed else None
     
     def _generate_recommendations(self) -> None:
         """Generate chart recommendations for each table"""
         for table_name, table_analysis in self.analysis_results.items():
-            recommendations = []
+            table_analysis.recommended_charts = self._recommend_charts(table_name, table_analysis)
+    
+    def _recommend_charts(self, table_name: str, table_analysis: TableAnalysis) -> List[Dict[str, Any]]:
+        """Return the best-scoring chart recommendations for a single table"""
+        # nlargest consumes the generator with a bounded heap and, like a stable
+        # sort, keeps generation order for ties. Many chart types run the same
+        # query (e.g. the density/heatmap maps), so each SQL string is interned
+        # to keep a single shared copy.
+        return heapq.nlargest(
+            MAX_RECOMMENDATIONS_PER_TABLE,
+            self._intern_sql(self._iter_recommendations(table_name, table_analysis)),
+            key=itemgetter('score')
+        )
+    
+    @staticmethod
+    def _intern_sql(recommendations: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Share one copy of each distinct SQL string across recommendations"""
+        for rec in recommendations:
+            rec['sql'] = sys.intern(rec['sql'])
+            yield rec
+    
+    def _iter_recommendations(self, table_name: str, table_analysis: TableAnalysis) -> Iterator[Dict[str, Any]]:
+        """Yield chart recommendations for a single table"""
+        row_count = table_analysis.row_count
+        # Every chart of an empty table would come back empty
+        if row_count == 0:
+            return
+        
+        table_q = table_analysis.qname
+        
+        # Several chart types run the same query shape over the same columns, so
+        # format each (template, columns) combination once per table
+        sql_cache: Dict[Tuple[str, str, str, int], str] = {}
+        
+        def _sql(template: str, x: str, y: str = '', n: int = 0) -> str:
+            key = (template, x, y, n)
+            sql = sql_cache.get(key)
+            if sql is None:
+                sql = sql_cache[key] = _SQL_TEMPLATES[template].format(t=table_q, x=x, y=y, n=n)
+            return sql
+        
+        # Bucket columns in a single pass:
+        # date columns, numeric columns (measures), dimension columns (excluding
+        # geographic ones), string columns that might be dimensions (including high
+        # cardinality) and geographic columns
+        date_cols = []
+        numeric_cols = []
+        dimension_cols = []
+        string_cols = []
+        lat_cols = []
+        lon_cols = []
+        geo_cols = []
+        for col in table_analysis.columns.values():
+            # Every chart filters on or aggregates a column's non-NULL values, so a
+            # column that is entirely NULL can't produce one
+            if col.null_count >= row_count:
+                continue
+            if col.is_latitude:
+                lat_cols.append(col)
+            if col.is_longitude:
+                lon_cols.append(col)
+            if col.is_geographic:
+                geo_cols.append(col)
+            if col.is_date:
+                date_cols.append(col)
+            if col.is_numeric:
+                numeric_cols.append(col)
+            # A column with one value per row (an identifier) never passes the
+            # cardinality gates below unless the table itself is tiny, so keep it
+            # out of the dimension pair loops and string top-N charts up front
+            is_unique = col.cardinality == row_count
+            if col.is_dimension and not col.is_date and not col.is_geographic:
+                if not is_unique or col.cardinality <= 30:
+                    dimension_cols.append(col)
+            if not col.is_numeric and not col.is_date and not is_unique:
+                string_cols.append(col)
+        
+        # Partition dimensions by cardinality once (dimension_cols already excludes
+        # date and geographic columns): pie-sized, color-sized and matrix-sized
+        pie_dims = []           # 2-8 values
+        small_dims = []         # 2-10 values
+        low_card_dims = []      # 2-20 values
+        at_most_10_dims = []    # up to 10 values, including constant columns
+        for col in dimension_cols:
+            cardinality = col.cardinality
+            if cardinality <= 10:
+                at_most_10_dims.append(col)
+            if cardinality >= 2:
+                if cardinality <= 8:
+                    pie_dims.append(col)
+                if cardinality <= 10:
+                    small_dims.append(col)
+                if cardinality <= 20:
+                    low_card_dims.append(col)
+        
+        # Generate map recommendations if we have lat/lon pairs
+        if lat_cols and lon_cols:
+            lat_col = lat_cols[0]  # Use first lat column found
+            lon_col = lon_cols[0]  # Use first lon column found
             
-            # Find date columns
-            date_cols = [col for col in table_analysis.columns.values() if col.is_date]
+            # Every map shares the same SELECT prefix and NOT NULL filter for this
+            # lat/lon pair, so build those fragments once and concatenate per chart
+            base_title = table_name + ': '
+            base_select = f"SELECT {lat_col.qname} as lat, {lon_col.qname} as lon"
+            base_from_where = f" FROM {table_q} WHERE {lat_col.qname} IS NOT NULL AND {lon_col.qname} IS NOT NULL"
             
-            # Find numeric columns (measures)
-            numeric_cols = [col for col in table_analysis.columns.values() if col.is_numeric]
+            def _map_rec(chart_type, title_suffix, desc, extra_select, extra_where, score):
+                return {
+                    'chart_type': chart_type,
+                    'title': base_title + title_suffix,
+                    'description': desc,
+                    'sql': base_select + extra_select + base_from_where + extra_where,
+                    'score': score
+                }
             
-            # Find dimension columns (excluding geographic ones)
-            dimension_cols = [col for col in table_analysis.columns.values() 
-                            if col.is_dimension and not col.is_date and not col.is_geographic]
+            # Points map (Braille - higher precision)
+            yield _map_rec(
+                'map_points', 'Geographic Distribution (Braille)',
+                f'High-precision map with Braille dots showing points from {table_name}',
+                '', '', 0.98)
             
-            # Find all string columns that might be dimensions (including high cardinality)
-            string_cols = [col for col in table_analysis.columns.values()
-                          if not col.is_numeric and not col.is_date]
+            # Blocks map (more visible)
+            yield _map_rec(
+                'map_blocks', 'Geographic Distribution (Blocks)',
+                f'Map with solid blocks showing points from {table_name}',
+                '', '', 0.97)
             
-            # Find geographic columns
-            lat_cols = [col for col in table_analysis.columns.values() if col.is_latitude]
-            lon_cols = [col for col in table_analysis.columns.values() if col.is_longitude]
-            geo_cols = [col for col in table_analysis.columns.values() if col.is_geographic]
+            # Density map
+            yield _map_rec(
+                'map_density', 'Density Heatmap',
+                f'Geographic density visualization of {table_name}',
+                ', 1 as value', '', 0.96)
             
-            # Generate map recommendations if we have lat/lon pairs
-            if lat_cols and lon_cols:
-                lat_col = lat_cols[0]  # Use first lat column found
-                lon_col = lon_cols[0]  # Use first lon column found
-                
-                # Points map (Braille - higher precision)
-                recommendations.append({
-                    'chart_type': 'map_points',
-                    'title': f'{table_name}: Geographic Distribution (Braille)',
-                    'description': f'High-precision map with Braille dots showing points from {table_name}',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.98
-                })
-                
-                # Blocks map (more visible)
-                recommendations.append({
-                    'chart_type': 'map_blocks',
-                    'title': f'{table_name}: Geographic Distribution (Blocks)',
-                    'description': f'Map with solid blocks showing points from {table_name}',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.97
-                })
-                
-                # Density map
-                recommendations.append({
-                    'chart_type': 'map_density',
-                    'title': f'{table_name}: Density Heatmap',
-                    'description': f'Geographic density visualization of {table_name}',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, 1 as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.96
-                })
-                
-                # Clusters map
-                recommendations.append({
-                    'chart_type': 'map_clusters',
-                    'title': f'{table_name}: Location Clusters',
-                    'description': f'Clustered view of geographic points in {table_name}',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.94
-                })
-                
-                # If there are categorical dimensions, suggest colored maps
-                # Sort dimensions by cardinality (lower is better for colors)
-                color_dims = [col for col in dimension_cols if not col.is_geographic]
-                color_dims.sort(key=lambda x: (x.cardinality > 30, x.cardinality))
-                
-                # Generate maps for more low-cardinality dimensions
-                for i, dim_col in enumerate(color_dims[:6]):  # Increase to 6 dimensions
-                    # Include dimensions up to 30 cardinality (was 10)
-                    if 1 < dim_col.cardinality <= 30:
-                        # Calculate score based on position and cardinality
-                        base_score = 0.93 - (i * 0.015)  # Small decrease for each dimension
-                        if dim_col.cardinality > 15:
-                            base_score -= 0.02  # Small penalty for higher cardinality
-                        
-                        # Braille version
-                        recommendations.append({
-                            'chart_type': 'map_points',
-                            'title': f'{table_name}: Map by {dim_col.name} (Braille)',
-                            'description': f'Geographic points colored by {dim_col.name} ({dim_col.cardinality} values) using Braille dots',
-                            'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, {dim_col.name} as color FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL AND {dim_col.name} IS NOT NULL",
-                            'score': base_score
-                        })
-                        # Blocks version
-                        recommendations.append({
-                            'chart_type': 'map_blocks',
-                            'title': f'{table_name}: Map by {dim_col.name} (Blocks)',
-                            'description': f'Geographic points colored by {dim_col.name} ({dim_col.cardinality} values) using solid blocks',
-                            'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, {dim_col.name} as color FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL AND {dim_col.name} IS NOT NULL",
-                            'score': base_score - 0.005
-                        })
-                
-                # Also suggest combined dimensions for richer coloring
-                if len(color_dims) >= 2:
-                    # Find pairs of very low cardinality dimensions that combine well
-                    for dim1 in color_dims[:3]:
-                        for dim2 in color_dims[:3]:
-                            if dim1 != dim2 and dim1.cardinality <= 5 and dim2.cardinality <= 5:
-                                combined_card = dim1.cardinality * dim2.cardinality
-                                if combined_card <= 20:
-                                    recommendations.append({
-                                        'chart_type': 'map_points',
-                                        'title': f'{table_name}: Map by {dim1.name}+{dim2.name} (Braille)',
-                                        'description': f'Points colored by {dim1.name} and {dim2.name} combination',
-                                        'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, {dim1.name} || '-' || {dim2.name} as color FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL AND {dim1.name} IS NOT NULL AND {dim2.name} IS NOT NULL",
-                                        'score': 0.89
-                                    })
-                                    recommendations.append({
-                                        'chart_type': 'map_blocks',
-                                        'title': f'{table_name}: Map by {dim1.name}+{dim2.name} (Blocks)',
-                                        'description': f'Points colored by {dim1.name} and {dim2.name} combination',
-                                        'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, {dim1.name} || '-' || {dim2.name} as color FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL AND {dim1.name} IS NOT NULL AND {dim2.name} IS NOT NULL",
-                                        'score': 0.885
-                                    })
-                                    break  # Only one combination per dim1
-                
-                # Always add COUNT-based density/heatmap as it's often most useful
-                recommendations.append({
-                    'chart_type': 'map_density',
-                    'title': f'{table_name}: Point Density Map',
-                    'description': f'Density heatmap showing concentration of records',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, 1 as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.95
-                })
-                
-                recommendations.append({
-                    'chart_type': 'map_blocks_heatmap',
-                    'title': f'{table_name}: True Color Heatmap',
-                    'description': f'True color gradient heatmap (green-yellow-red) showing record density',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, 1 as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.96
-                })
-                
-                # Add Braille heatmap visualization
-                recommendations.append({
-                    'chart_type': 'map_braille_heatmap',
-                    'title': f'{table_name}: Braille Heatmap',
-                    'description': f'Braille points with density-based color gradient',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, 1 as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.95
-                })
-                
-                recommendations.append({
-                    'chart_type': 'map_heatmap',
-                    'title': f'{table_name}: Record Count Heatmap',
-                    'description': f'Geographic heatmap showing record count distribution',
-                    'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, 1 as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL",
-                    'score': 0.94
-                })
-                
-                # If there are numeric measures, suggest value-based heatmaps
-                for num_col in numeric_cols[:2]:  # Limit to 2 best measures
-                    if not num_col.is_geographic:  # Don't use lat/lon as values
-                        recommendations.append({
-                            'chart_type': 'map_blocks_heatmap',
-                            'title': f'{table_name}: {num_col.name} True Color Heatmap',
-                            'description': f'True color gradient heatmap showing {num_col.name} values',
-                            'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, {num_col.name} as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL AND {num_col.name} IS NOT NULL",
-                            'score': 0.93
-                        })
-                        
-                        recommendations.append({
-                            'chart_type': 'map_braille_heatmap',
-                            'title': f'{table_name}: {num_col.name} Braille Heatmap',
-                            'description': f'Braille points colored by {num_col.name} values',
-                            'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, {num_col.name} as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL AND {num_col.name} IS NOT NULL",
-                            'score': 0.92
-                        })
-                        
-                        recommendations.append({
-                            'chart_type': 'map_heatmap',
-                            'title': f'{table_name}: {num_col.name} Heatmap',
-                            'description': f'Geographic heatmap showing {num_col.name} distribution',
-                            'sql': f"SELECT {lat_col.name} as lat, {lon_col.name} as lon, {num_col.name} as value FROM {table_name} WHERE {lat_col.name} IS NOT NULL AND {lon_col.name} IS NOT NULL AND {num_col.name} IS NOT NULL",
-                            'score': 0.92
-                        })
+            # Clusters map
+            yield _map_rec(
+                'map_clusters', 'Location Clusters',
+                f'Clustered view of geographic points in {table_name}',
+                '', '', 0.94)
             
-            # Simple table metrics (figlet)
-            recommendations.append({
-                'chart_type': 'figlet',
-                'title': f'{table_name}: Total Record Count',
-                'description': f'Count of all records in {table_name}',
-                'sql': f"SELECT COUNT(*) as x, COUNT(*) as y FROM {table_name}",
-                'score': 0.95
-            })
+            # If there are categorical dimensions, suggest colored maps
+            # Sort dimensions by cardinality (lower is better for colors)
+            color_dims = [col for col in dimension_cols if not col.is_geographic]
+            color_dims.sort(key=lambda x: (x.cardinality > 30, x.cardinality))
             
-            # Dimension analysis - COUNT(*) for all low/medium cardinality dimensions
-            for dim_col in dimension_cols:
-                if dim_col.cardinality <= 50 and dim_col.cardinality > 1:
-                    # Bar chart for counts
-                    recommendations.append({
-                        'chart_type': 'bar',
-                        'title': f'{table_name}: Record Count by {dim_col.name}',
-                        'description': f'Count of records grouped by {dim_col.name}',
-                        'sql': f"SELECT {dim_col.name} as x, COUNT(*) as y FROM {table_name} GROUP BY 1 ORDER BY 2 DESC",
-                        'x_column': dim_col.name,
-                        'y_column': 'count',
-                        'score': 0.9
-                    })
+            # Generate maps for more low-cardinality dimensions
+            for i, dim_col in enumerate(color_dims[:6]):  # Increase to 6 dimensions
+                # Include dimensions up to 30 cardinality (was 10)
+                if 1 < dim_col.cardinality <= 30:
+                    # Calculate score based on position and cardinality
+                    base_score = 0.93 - (i * 0.015)  # Small decrease for each dimension
+                    if dim_col.cardinality > 15:
+                        base_score -= 0.02  # Small penalty for higher cardinality
                     
-                    # Add colored bar chart variations with other low cardinality dimensions
-                    # Find other low cardinality dimensions to use as color
-                    color_dims = [col for col in dimension_cols 
-                                 if col != dim_col 
-                                 and 2 <= col.cardinality <= 10
-                                 and not col.is_geographic]
+                    color_select = f", {dim_col.qname} as color"
+                    color_where = f" AND {dim_col.qname} IS NOT NULL"
                     
-                    # Create colored bar charts (limit to top 2 color dimensions)
-                    for color_dim in color_dims[:2]:
-                        recommendations.append({
-                            'chart_type': 'bar',
-                            'title': f'{table_name}: {dim_col.name} by {color_dim.name}',
-                            'description': f'Stacked bar chart: {dim_col.name} colored by {color_dim.name}',
-                            'sql': f"SELECT {dim_col.name} as x, COUNT(*) as y, {color_dim.name} as color FROM {table_name} WHERE {dim_col.name} IS NOT NULL AND {color_dim.name} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 2",
-                            'x_column': dim_col.name,
-                            'y_column': 'count',
-                            'color_column': color_dim.name,
-                            'score': 0.88
-                        })
-                    
-                    # Termgraph horizontal bar for counts
-                    recommendations.append({
-                        'chart_type': 'tg_bar',
-                        'title': f'{table_name}: Count by {dim_col.name} (Horizontal Bar)',
-                        'description': f'Horizontal bar chart showing record counts by {dim_col.name}',
-                        'sql': f"SELECT {dim_col.name} as x, COUNT(*) as y FROM {table_name} WHERE {dim_col.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT 20",
-                        'x_column': dim_col.name,
-                        'y_column': 'count',
-                        'score': 0.85
-                    })
-                    
-                    # Simple bar for smaller cardinality
-                    if dim_col.cardinality <= 10:
-                        recommendations.append({
-                            'chart_type': 'simple_bar',
-                            'title': f'{table_name}: {dim_col.name} Distribution',
-                            'description': f'Simple bar chart of {dim_col.name} counts',
-                            'sql': f"SELECT {dim_col.name} as x, COUNT(*) as y FROM {table_name} WHERE {dim_col.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
-                            'x_column': dim_col.name,
-                            'y_column': 'count',
-                            'score': 0.87
-                        })
+                    # Braille version
+                    yield _map_rec(
+                        'map_points', f'Map by {dim_col.name} (Braille)',
+                        f'Geographic points colored by {dim_col.name} ({dim_col.cardinality} values) using Braille dots',
+                        color_select, color_where, base_score)
+                    # Blocks version
+                    yield _map_rec(
+                        'map_blocks', f'Map by {dim_col.name} (Blocks)',
+                        f'Geographic points colored by {dim_col.name} ({dim_col.cardinality} values) using solid blocks',
+                        color_select, color_where, base_score - 0.005)
             
-            # Matrix heatmap recommendations for pairs of low-cardinality dimensions
-            low_card_dims = [col for col in dimension_cols if 2 <= col.cardinality <= 20]
+            # Also suggest combined dimensions for richer coloring
+            if len(color_dims) >= 2:
+                # Find pairs of very low cardinality dimensions that combine well.
+                # color_dims is sorted by cardinality, so scan forward from each dim1.
+                eligible = [dim for dim in color_dims[:3] if dim.cardinality <= 5]
+                for i, dim1 in enumerate(eligible):
+                    for dim2 in eligible[i + 1:]:
+                        if dim1.cardinality * dim2.cardinality <= 20:
+                            pair_name = f'{dim1.name}+{dim2.name}'
+                            pair_desc = f'Points colored by {dim1.name} and {dim2.name} combination'
+                            pair_select = f", {dim1.qname} || '-' || {dim2.qname} as color"
+                            pair_where = f" AND {dim1.qname} IS NOT NULL AND {dim2.qname} IS NOT NULL"
+                            yield _map_rec(
+                                'map_points', f'Map by {pair_name} (Braille)',
+                                pair_desc, pair_select, pair_where, 0.89)
+                            yield _map_rec(
+                                'map_blocks', f'Map by {pair_name} (Blocks)',
+                                pair_desc, pair_select, pair_where, 0.885)
+                            break  # Only one combination per dim1
             
-            # Look for date-like columns (YEAR, MONTH, etc.)
-            date_like_dims = []
-            for col in dimension_cols:
-                col_upper = col.name.upper()
-                if any(term in col_upper for term in ['YEAR', 'MONTH', 'QUARTER', 'WEEK', 'DAY', 'HOUR']):
-                    if col.cardinality <= 50:
-                        date_like_dims.append(col)
+            # Always add COUNT-based density/heatmap as it's often most useful
+            yield _map_rec(
+                'map_density', 'Point Density Map',
+                'Density heatmap showing concentration of records',
+                ', 1 as value', '', 0.95)
             
-            # Generate matrix heatmaps for dimension pairs
-            if len(low_card_dims) >= 2:
-                # Take best dimension pairs (prioritize date-like dimensions)
-                priority_dims = date_like_dims[:2] if len(date_like_dims) >= 2 else []
-                other_dims = [d for d in low_card_dims if d not in date_like_dims]
-                
-                dim_pairs = []
+            yield _map_rec(
+                'map_blocks_heatmap', 'True Color Heatmap',
+                'True color gradient heatmap (green-yellow-red) showing record density',
+                ', 1 as value', '', 0.96)
+            
+            # Add Braille heatmap visualization
+            yield _map_rec(
+                'map_braille_heatmap', 'Braille Heatmap',
+                'Braille points with density-based color gradient',
+                ', 1 as value', '', 0.95)
+            
+            yield _map_rec(
+                'map_heatmap', 'Record Count Heatmap',
+                'Geographic heatmap showing record count distribution',
+                ', 1 as value', '', 0.94)
+            
+            # If there are numeric measures, suggest value-based heatmaps
+            for num_col in numeric_cols[:2]:  # Limit to 2 best measures
+                if not num_col.is_geographic:  # Don't use lat/lon as values
+                    value_select = f", {num_col.qname} as value"
+                    value_where = f" AND {num_col.qname} IS NOT NULL"
+                    
+                    yield _map_rec(
+                        'map_blocks_heatmap', f'{num_col.name} True Color Heatmap',
+                        f'True color gradient heatmap showing {num_col.name} values',
+                        value_select, value_where, 0.93)
+                    
+                    yield _map_rec(
+                        'map_braille_heatmap', f'{num_col.name} Braille Heatmap',
+                        f'Braille points colored by {num_col.name} values',
+                        value_select, value_where, 0.92)
+                    
+                    yield _map_rec(
+                        'map_heatmap', f'{num_col.name} Heatmap',
+                        f'Geographic heatmap showing {num_col.name} distribution',
+                        value_select, value_where, 0.92)
+        
+        # Simple table metrics (figlet)
+        yield {
+            'chart_type': 'figlet',
+            'title': f'{table_name}: Total Record Count',
+            'description': f'Count of all records in {table_name}',
+            'sql': f"SELECT COUNT(*) as x, COUNT(*) as y FROM {table_q}",
+            'score': 0.95
+        }
+        
+        # Dimension analysis - COUNT(*) for all low/medium cardinality dimensions
+        for dim_col in dimension_cols:
+            if dim_col.cardinality <= 50 and dim_col.cardinality > 1:
+                # Bar chart for counts
+                yield {
+                    'chart_type': 'bar',
+                    'title': f'{table_name}: Record Count by {dim_col.name}',
+                    'description': f'Count of records grouped by {dim_col.name}',
+                    'sql': f"SELECT {dim_col.qname} as x, COUNT(*) as y FROM {table_q} GROUP BY 1 ORDER BY 2 DESC",
+                    'x_column': dim_col.name,
+                    'y_column': 'count',
+                    'score': 0.9
+                }
                 
-                # First priority: date x date combinations
-                if len(date_like_dims) >= 2:
-                    for i in range(len(date_like_dims)-1):
-                        for j in range(i+1, min(i+2, len(date_like_dims))):
-                            dim_pairs.append((date_like_dims[i], date_like_dims[j]))
+                # Add colored bar chart variations with other low cardinality dimensions
+                # Find other low cardinality dimensions to use as color
+                color_dims = [col for col in small_dims if col != dim_col]
                 
-                # Second priority: date x other dimension
-                if date_like_dims and other_dims:
-                    for date_dim in date_like_dims[:2]:
-                        for other_dim in other_dims[:2]:
-                            dim_pairs.append((date_dim, other_dim))
+                # Create colored bar charts (limit to top 2 color dimensions)
+                for color_dim in color_dims[:2]:
+                    yield {
+                        'chart_type': 'bar',
+                        'title': f'{table_name}: {dim_col.name} by {color_dim.name}',
+                        'description': f'Stacked bar chart: {dim_col.name} colored by {color_dim.name}',
+                        'sql': f"SELECT {dim_col.qname} as x, COUNT(*) as y, {color_dim.qname} as color FROM {table_q} WHERE {dim_col.qname} IS NOT NULL AND {color_dim.qname} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 2",
+                        'x_column': dim_col.name,
+                        'y_column': 'count',
+                        'color_column': color_dim.name,
+                        'score': 0.88
+                    }
                 
-                # Third priority: other dimension pairs
-                if len(other_dims) >= 2:
-                    for i in range(min(2, len(other_dims)-1)):
-                        for j in range(i+1, min(i+2, len(other_dims))):
-                            dim_pairs.append((other_dims[i], other_dims[j]))
+                # Termgraph horizontal bar for counts
+                yield {
+                    'chart_type': 'tg_bar',
+                    'title': f'{table_name}: Count by {dim_col.name} (Horizontal Bar)',
+                    'description': f'Horizontal bar chart showing record counts by {dim_col.name}',
+                    'sql': _sql('count_by_top', dim_col.qname, n=20),
+                    'x_column': dim_col.name,
+                    'y_column': 'count',
+                    'score': 0.85
+                }
                 
-                # Generate recommendations for top dimension pairs
-                for dim1, dim2 in dim_pairs[:3]:  # Limit to 3 matrix heatmaps
-                    recommendations.append({
-                        'chart_type': 'matrix_heatmap',
-                        'title': f'{table_name}: {dim1.name} vs {dim2.name} Heatmap',
-                        'description': f'Matrix heatmap showing record counts by {dim1.name} and {dim2.name}',
-                        'sql': f"SELECT {dim1.name} as x, {dim2.name} as y, COUNT(*) as value FROM {table_name} WHERE {dim1.name} IS NOT NULL AND {dim2.name} IS NOT NULL GROUP BY 1, 2",
-                        'x_column': dim1.name,
-                        'y_column': dim2.name,
-                        'score': 0.88 + (0.03 if dim1 in date_like_dims or dim2 in date_like_dims else 0)
-                    })
-                    
-                    # If there are numeric measures, also suggest value-based matrix heatmaps
-                    for num_col in numeric_cols[:1]:  # Just top measure
-                        if not num_col.is_geographic:
-                            recommendations.append({
-                                'chart_type': 'matrix_heatmap',
-                                'title': f'{table_name}: {num_col.name} by {dim1.name} vs {dim2.name}',
-                                'description': f'Matrix heatmap showing sum of {num_col.name} by dimensions',
-                                'sql': f"SELECT {dim1.name} as x, {dim2.name} as y, SUM({num_col.name}) as value FROM {table_name} WHERE {dim1.name} IS NOT NULL AND {dim2.name} IS NOT NULL AND {num_col.name} IS NOT NULL GROUP BY 1, 2",
-                                'x_column': dim1.name,
-                                'y_column': dim2.name,
-                                'value_column': num_col.name,
-                                'score': 0.85 + (0.03 if dim1 in date_like_dims or dim2 in date_like_dims else 0)
-                            })
+                # Simple bar for smaller cardinality
+                if dim_col.cardinality <= 10:
+                    yield {
+                        'chart_type': 'simple_bar',
+                        'title': f'{table_name}: {dim_col.name} Distribution',
+                        'description': f'Simple bar chart of {dim_col.name} counts',
+                        'sql': _sql('count_by', dim_col.qname),
+                        'x_column': dim_col.name,
+                        'y_column': 'count',
+                        'score': 0.87
+                    }
+        
+        # Matrix heatmap recommendations for pairs of low-cardinality dimensions
+        # Look for date-like columns (YEAR, MONTH, etc.)
+        date_like_dims = [col for col in dimension_cols
+                          if col.cardinality <= 50 and _DATE_TERM_RE.search(col.name)]
+        date_like_ids = {id(col) for col in date_like_dims}
+        
+        # Generate matrix heatmaps for dimension pairs
+        if len(low_card_dims) >= 2 and row_count >= MIN_ROWS_FOR_HEATMAP:
+            # Take best dimension pairs (prioritize date-like dimensions)
+            priority_dims = date_like_dims[:2] if len(date_like_dims) >= 2 else []
+            other_dims = [d for d in low_card_dims if id(d) not in date_like_ids]
             
-            # Pie and Waffle chart recommendations for low-cardinality dimensions
-            suitable_pie_dims = [col for col in dimension_cols if 2 <= col.cardinality <= 8]
-            suitable_waffle_dims = [col for col in dimension_cols if 2 <= col.cardinality <= 10]
+            dim_pairs = []
             
-            # Pie charts for the lowest cardinality dimensions
-            if suitable_pie_dims:
-                for dim in suitable_pie_dims[:1]:  # Limit to 1 pie chart per table
-                    recommendations.append({
-                        'chart_type': 'pie',
-                        'title': f'{table_name}: {dim.name} Distribution',
-                        'description': f'Pie chart showing proportion of records by {dim.name}',
-                        'sql': f"SELECT {dim.name} as x, COUNT(*) as y FROM {table_name} WHERE {dim.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
-                        'x_column': 'x',
-                        'y_column': 'y',
-                        'score': 0.83
-                    })
+            # First priority: date x date combinations (neighbouring dims only)
+            dim_pairs.extend(zip(date_like_dims, date_like_dims[1:]))
             
-            # Waffle charts
-            if suitable_waffle_dims:
-                for dim in suitable_waffle_dims[:2]:  # Limit to 2 waffle charts per table
-                    # Waffle with COUNT(*)
-                    recommendations.append({
+            # Second priority: date x other dimension
+            if date_like_dims and other_dims:
+                for date_dim in date_like_dims[:2]:
+                    for other_dim in other_dims[:2]:
+                        dim_pairs.append((date_dim, other_dim))
+            
+            # Third priority: other dimension pairs (first two neighbouring pairs)
+            dim_pairs.extend(islice(zip(other_dims, other_dims[1:]), 2))
+            
+            # Generate recommendations for top dimension pairs
+            for dim1, dim2 in dim_pairs[:3]:  # Limit to 3 matrix heatmaps
+                yield {
+                    'chart_type': 'matrix_heatmap',
+                    'title': f'{table_name}: {dim1.name} vs {dim2.name} Heatmap',
+                    'description': f'Matrix heatmap showing record counts by {dim1.name} and {dim2.name}',
+                    'sql': f"SELECT {dim1.qname} as x, {dim2.qname} as y, COUNT(*) as value FROM {table_q} WHERE {dim1.qname} IS NOT NULL AND {dim2.qname} IS NOT NULL GROUP BY 1, 2",
+                    'x_column': dim1.name,
+                    'y_column': dim2.name,
+                    'score': 0.88 + (0.03 if id(dim1) in date_like_ids or id(dim2) in date_like_ids else 0)
+                }
+                
+                # If there are numeric measures, also suggest value-based matrix heatmaps
+                for num_col in numeric_cols[:1]:  # Just top measure
+                    if not num_col.is_geographic:
+                        yield {
+                            'chart_type': 'matrix_heatmap',
+                            'title': f'{table_name}: {num_col.name} by {dim1.name} vs {dim2.name}',
+                            'description': f'Matrix heatmap showing sum of {num_col.name} by dimensions',
+                            'sql': f"SELECT {dim1.qname} as x, {dim2.qname} as y, SUM({num_col.qname}) as value FROM {table_q} WHERE {dim1.qname} IS NOT NULL AND {dim2.qname} IS NOT NULL AND {num_col.qname} IS NOT NULL GROUP BY 1, 2",
+                            'x_column': dim1.name,
+                            'y_column': dim2.name,
+                            'value_column': num_col.name,
+                            'score': 0.85 + (0.03 if id(dim1) in date_like_ids or id(dim2) in date_like_ids else 0)
+                        }
+        
+        # Pie and Waffle chart recommendations for low-cardinality dimensions
+        # Pie charts for the lowest cardinality dimensions
+        if pie_dims:
+            for dim in pie_dims[:1]:  # Limit to 1 pie chart per table
+                yield {
+                    'chart_type': 'pie',
+                    'title': f'{table_name}: {dim.name} Distribution',
+                    'description': f'Pie chart showing proportion of records by {dim.name}',
+                    'sql': _sql('count_by', dim.qname),
+                    'x_column': 'x',
+                    'y_column': 'y',
+                    'score': 0.83
+                }
+        
+        # Waffle charts
+        if small_dims:
+            for dim in small_dims[:2]:  # Limit to 2 waffle charts per table
+                # Waffle with COUNT(*)
+                yield {
+                    'chart_type': 'waffle',
+                    'title': f'{table_name}: {dim.name} Distribution',
+                    'description': f'Waffle chart showing proportion of records by {dim.name}',
+                    'sql': _sql('count_by', dim.qname),
+                    'x_column': 'x',
+                    'y_column': 'y',
+                    'score': 0.82
+                }
+                
+                # Waffle with a measure if available
+                if numeric_cols:
+                    measure = numeric_cols[0]
+                    yield {
                         'chart_type': 'waffle',
-                        'title': f'{table_name}: {dim.name} Distribution',
-                        'description': f'Waffle chart showing proportion of records by {dim.name}',
-                        'sql': f"SELECT {dim.name} as x, COUNT(*) as y FROM {table_name} WHERE {dim.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
+                        'title': f'{table_name}: {measure.name} by {dim.name}',
+                        'description': f'Waffle chart showing {measure.name} proportions by {dim.name}',
+                        'sql': _sql('sum_by', dim.qname, measure.qname),
                         'x_column': 'x',
                         'y_column': 'y',
-                        'score': 0.82
-                    })
-                    
-                    # Waffle with a measure if available
-                    if numeric_cols:
-                        measure = numeric_cols[0]
-                        recommendations.append({
-                            'chart_type': 'waffle',
-                            'title': f'{table_name}: {measure.name} by {dim.name}',
-                            'description': f'Waffle chart showing {measure.name} proportions by {dim.name}',
-                            'sql': f"SELECT {dim.name} as x, SUM({measure.name}) as y FROM {table_name} WHERE {dim.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
-                            'x_column': 'x',
-                            'y_column': 'y',
-                            'score': 0.81
-                        })
-            
-            # Add recommendations for medium-high cardinality string dimensions
-            for str_col in string_cols:
-                if 50 < str_col.cardinality <= 200:  # Medium-high cardinality
-                    # Top N values
-                    recommendations.append({
-                        'chart_type': 'bar',
-                        'title': f'{table_name}: Top 20 {str_col.name} by Count',
-                        'description': f'Top 20 most frequent {str_col.name} values',
-                        'sql': f"SELECT {str_col.name} as x, COUNT(*) as y FROM {table_name} WHERE {str_col.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT 20",
-                        'x_column': str_col.name,
+                        'score': 0.81
+                    }
+        
+        # Add recommendations for medium-high cardinality string dimensions
+        for str_col in string_cols:
+            if 50 < str_col.cardinality <= 200:  # Medium-high cardinality
+                # Top N values
+                yield {
+                    'chart_type': 'bar',
+                    'title': f'{table_name}: Top 20 {str_col.name} by Count',
+                    'description': f'Top 20 most frequent {str_col.name} values',
+                    'sql': _sql('count_by_top', str_col.qname, n=20),
+                    'x_column': str_col.name,
+                    'y_column': 'count',
+                    'score': 0.75
+                }
+                
+                # Termgraph for better horizontal display
+                yield {
+                    'chart_type': 'tg_bar',
+                    'title': f'{table_name}: Top 15 {str_col.name} (Horizontal)',
+                    'description': f'Horizontal view of top {str_col.name} values',
+                    'sql': _sql('count_by_top', str_col.qname, n=15),
+                    'x_column': str_col.name,
+                    'y_column': 'count',
+                    'score': 0.73
+                }
+        
+        # Time series recommendations with proper date formatting
+        if date_cols:
+            for date_col in date_cols:
+                # Simple daily counts - plotext needs d/m/Y format
+                yield {
+                    'chart_type': 'line',
+                    'title': f'{table_name}: Daily Record Count by {date_col.name}',
+                    'description': f'Time series showing count of records per day',
+                    'sql': f"SELECT strftime('%d/%m/%Y', {date_col.qname}) as x, COUNT(*) as y FROM {table_q} GROUP BY {date_col.qname} ORDER BY {date_col.qname}",
+                    'x_column': date_col.name,
+                    'y_column': 'count',
+                    'score': 0.88
+                }
+                
+                # Calendar heatmap for daily counts
+                if date_col.date_range_days and date_col.date_range_days > 30:
+                    yield {
+                        'chart_type': 'tg_calendar',
+                        'title': f'{table_name}: Activity Heatmap by {date_col.name}',
+                        'description': f'Calendar heatmap showing daily record counts',
+                        'sql': f"SELECT strftime('%Y-%m-%d', {date_col.qname}) as x, COUNT(*) as y FROM {table_q} GROUP BY 1 ORDER BY 1",
+                        'x_column': date_col.name,
                         'y_column': 'count',
-                        'score': 0.75
-                    })
-                    
-                    # Termgraph for better horizontal display
-                    recommendations.append({
-                        'chart_type': 'tg_bar',
-                        'title': f'{table_name}: Top 15 {str_col.name} (Horizontal)',
-                        'description': f'Horizontal view of top {str_col.name} values',
-                        'sql': f"SELECT {str_col.name} as x, COUNT(*) as y FROM {table_name} WHERE {str_col.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT 15",
-                        'x_column': str_col.name,
+                        'score': 0.85
+                    }
+                
+                # Monthly aggregation
+                yield {
+                    'chart_type': 'bar',
+                    'title': f'{table_name}: Monthly Count by {date_col.name}',
+                    'description': f'Bar chart showing record counts by month',
+                    'sql': f"SELECT strftime('%Y-%m', {date_col.qname}) as x, COUNT(*) as y FROM {table_q} GROUP BY 1 ORDER BY 1",
+                    'x_column': 'month',
+                    'y_column': 'count',
+                    'score': 0.85
+                }
+                
+                # Monthly aggregation with color dimension if available
+                color_dims = small_dims
+                
+                for color_dim in color_dims[:1]:  # Just one color variation for monthly
+                    yield {
+                        'chart_type': 'bar',
+                        'title': f'{table_name}: Monthly by {color_dim.name}',
+                        'description': f'Monthly counts colored by {color_dim.name}',
+                        'sql': f"SELECT strftime('%Y-%m', {date_col.qname}) as x, COUNT(*) as y, {color_dim.qname} as color FROM {table_q} WHERE {color_dim.qname} IS NOT NULL GROUP BY 1, 3 ORDER BY 1",
+                        'x_column': 'month',
                         'y_column': 'count',
-                        'score': 0.73
-                    })
-            
-            # Time series recommendations with proper date formatting
-            if date_cols:
-                for date_col in date_cols:
-                    # Simple daily counts - plotext needs d/m/Y format
-                    recommendations.append({
+                        'color_column': color_dim.name,
+                        'score': 0.84
+                    }
+                
+                # Day of week analysis
+                yield {
+                    'chart_type': 'bar',
+                    'title': f'{table_name}: Day of Week Pattern from {date_col.name}',
+                    'description': f'Record count distribution by day of week',
+                    'sql': f"SELECT strftime('%w', {date_col.qname}) || '-' || CASE strftime('%w', {date_col.qname}) WHEN '0' THEN 'Sun' WHEN '1' THEN 'Mon' WHEN '2' THEN 'Tue' WHEN '3' THEN 'Wed' WHEN '4' THEN 'Thu' WHEN '5' THEN 'Fri' WHEN '6' THEN 'Sat' END as x, COUNT(*) as y FROM {table_q} GROUP BY strftime('%w', {date_col.qname}) ORDER BY strftime('%w', {date_col.qname})",
+                    'x_column': 'day_of_week',
+                    'y_column': 'count',
+                    'score': 0.82
+                }
+                
+                for num_col in numeric_cols:
+                    # Line chart for time series with EU date format for plotext
+                    yield {
                         'chart_type': 'line',
-                        'title': f'{table_name}: Daily Record Count by {date_col.name}',
-                        'description': f'Time series showing count of records per day',
-                        'sql': f"SELECT strftime('%d/%m/%Y', {date_col.name}) as x, COUNT(*) as y FROM {table_name} GROUP BY {date_col.name} ORDER BY {date_col.name}",
+                        'title': f'{table_name}: {num_col.name} by {date_col.name}',
+                        'description': f'Time series showing sum of {num_col.name} over time',
+                        'sql': f"SELECT strftime('%d/%m/%Y', {date_col.qname}) as x, SUM({num_col.qname}) as y FROM {table_q} GROUP BY {date_col.qname} ORDER BY {date_col.qname}",
                         'x_column': date_col.name,
-                        'y_column': 'count',
-                        'score': 0.88
-                    })
+                        'y_column': num_col.name,
+                        'score': 0.85
+                    }
                     
-                    # Calendar heatmap for daily counts
+                    # Calendar heatmap for daily data (termgraph uses Y-m-d)
                     if date_col.date_range_days and date_col.date_range_days > 30:
-                        recommendations.append({
+                        yield {
                             'chart_type': 'tg_calendar',
-                            'title': f'{table_name}: Activity Heatmap by {date_col.name}',
-                            'description': f'Calendar heatmap showing daily record counts',
-                            'sql': f"SELECT strftime('%Y-%m-%d', {date_col.name}) as x, COUNT(*) as y FROM {table_name} GROUP BY 1 ORDER BY 1",
+                            'title': f'{table_name}: {num_col.name} Heatmap by {date_col.name}',
+                            'description': f'Calendar heatmap showing daily sum of {num_col.name}',
+                            'sql': f"SELECT strftime('%Y-%m-%d', {date_col.qname}) as x, SUM({num_col.qname}) as y FROM {table_q} GROUP BY 1 ORDER BY 1",
                             'x_column': date_col.name,
-                            'y_column': 'count',
-                            'score': 0.85
-                        })
-                    
-                    # Monthly aggregation
-                    recommendations.append({
+                            'y_column': num_col.name,
+                            'score': 0.8
+                        }
+        
+        # Dimensions with COUNT (most fundamental analysis)
+        if dimension_cols:
+            for dim_col in dimension_cols:
+                if dim_col.cardinality <= 30 and dim_col.cardinality > 1:  # Good for bar charts
+                    # Count by dimension (often most important)
+                    yield {
                         'chart_type': 'bar',
-                        'title': f'{table_name}: Monthly Count by {date_col.name}',
-                        'description': f'Bar chart showing record counts by month',
-                        'sql': f"SELECT strftime('%Y-%m', {date_col.name}) as x, COUNT(*) as y FROM {table_name} GROUP BY 1 ORDER BY 1",
-                        'x_column': 'month',
+                        'title': f'{table_name}: Count by {dim_col.name}',
+                        'description': f'Bar chart showing record count for each {dim_col.name}',
+                        'sql': _sql('count_by', dim_col.qname),
+                        'x_column': dim_col.name,
                         'y_column': 'count',
                         'score': 0.85
-                    })
-                    
-                    # Monthly aggregation with color dimension if available
-                    color_dims = [col for col in dimension_cols 
-                                 if 2 <= col.cardinality <= 10
-                                 and not col.is_geographic
-                                 and not col.is_date]
-                    
-                    for color_dim in color_dims[:1]:  # Just one color variation for monthly
-                        recommendations.append({
-                            'chart_type': 'bar',
-                            'title': f'{table_name}: Monthly by {color_dim.name}',
-                            'description': f'Monthly counts colored by {color_dim.name}',
-                            'sql': f"SELECT strftime('%Y-%m', {date_col.name}) as x, COUNT(*) as y, {color_dim.name} as color FROM {table_name} WHERE {color_dim.name} IS NOT NULL GROUP BY 1, 3 ORDER BY 1",
-                            'x_column': 'month',
-                            'y_column': 'count',
-                            'color_column': color_dim.name,
-                            'score': 0.84
-                        })
+                    }
+        
+        # Numeric measures with dimensions
+        if dimension_cols and numeric_cols:
+            # This is the widest loop (dimensions x measures), so the per-column
+            # names are bound to locals instead of being re-read for every chart
+            for dim_col in dimension_cols:
+                if 1 < dim_col.cardinality <= 30:  # Good for bar charts
+                    dim_name, dim_q = dim_col.name, dim_col.qname
                     
-                    # Day of week analysis
-                    recommendations.append({
-                        'chart_type': 'bar',
-                        'title': f'{table_name}: Day of Week Pattern from {date_col.name}',
-                        'description': f'Record count distribution by day of week',
-                        'sql': f"SELECT strftime('%w', {date_col.name}) || '-' || CASE strftime('%w', {date_col.name}) WHEN '0' THEN 'Sun' WHEN '1' THEN 'Mon' WHEN '2' THEN 'Tue' WHEN '3' THEN 'Wed' WHEN '4' THEN 'Thu' WHEN '5' THEN 'Fri' WHEN '6' THEN 'Sat' END as x, COUNT(*) as y FROM {table_name} GROUP BY strftime('%w', {date_col.name}) ORDER BY strftime('%w', {date_col.name})",
-                        'x_column': 'day_of_week',
-                        'y_column': 'count',
-                        'score': 0.82
-                    })
+                    # Find a suitable color dimension (low cardinality, different from x-axis);
+                    # colored bars use SUM and only one color dimension to avoid explosion
+                    color_dim = next((col for col in small_dims if col is not dim_col), None)
+                    if color_dim is not None:
+                        color_name, color_q = color_dim.name, color_dim.qname
                     
                     for num_col in numeric_cols:
-                        # Line chart for time series with EU date format for plotext
-                        recommendations.append({
-                            'chart_type': 'line',
-                            'title': f'{table_name}: {num_col.name} by {date_col.name}',
-                            'description': f'Time series showing sum of {num_col.name} over time',
-                            'sql': f"SELECT strftime('%d/%m/%Y', {date_col.name}) as x, SUM({num_col.name}) as y FROM {table_name} GROUP BY {date_col.name} ORDER BY {date_col.name}",
-                            'x_column': date_col.name,
-                            'y_column': num_col.name,
-                            'score': 0.85
-                        })
+                        num_name, num_q = num_col.name, num_col.qname
                         
-                        # Calendar heatmap for daily data (termgraph uses Y-m-d)
-                        if date_col.date_range_days and date_col.date_range_days > 30:
-                            recommendations.append({
-                                'chart_type': 'tg_calendar',
-                                'title': f'{table_name}: {num_col.name} Heatmap by {date_col.name}',
-                                'description': f'Calendar heatmap showing daily sum of {num_col.name}',
-                                'sql': f"SELECT strftime('%Y-%m-%d', {date_col.name}) as x, SUM({num_col.name}) as y FROM {table_name} GROUP BY 1 ORDER BY 1",
-                                'x_column': date_col.name,
-                                'y_column': num_col.name,
-                                'score': 0.8
-                            })
-            
-            # Dimensions with COUNT (most fundamental analysis)
-            if dimension_cols:
-                for dim_col in dimension_cols:
-                    if dim_col.cardinality <= 30 and dim_col.cardinality > 1:  # Good for bar charts
-                        # Count by dimension (often most important)
-                        recommendations.append({
+                        # Sum by dimension
+                        yield {
                             'chart_type': 'bar',
-                            'title': f'{table_name}: Count by {dim_col.name}',
-                            'description': f'Bar chart showing record count for each {dim_col.name}',
-                            'sql': f"SELECT {dim_col.name} as x, COUNT(*) as y FROM {table_name} WHERE {dim_col.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
-                            'x_column': dim_col.name,
-                            'y_column': 'count',
-                            'score': 0.85
-                        })
-            
-            # Numeric measures with dimensions
-            if dimension_cols and numeric_cols:
-                for dim_col in dimension_cols:
-                    if dim_col.cardinality <= 30 and dim_col.cardinality > 1:  # Good for bar charts
-                        for num_col in numeric_cols:
-                            # Sum by dimension
-                            recommendations.append({
-                                'chart_type': 'bar',
-                                'title': f'{table_name}: Sum of {num_col.name} by {dim_col.name}',
-                                'description': f'Bar chart showing total {num_col.name} for each {dim_col.name}',
-                                'sql': f"SELECT {dim_col.name} as x, SUM({num_col.name}) as y FROM {table_name} WHERE {dim_col.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
-                                'x_column': dim_col.name,
-                                'y_column': num_col.name,
-                                'score': 0.82
-                            })
-                            
-                            # Average by dimension
-                            recommendations.append({
+                            'title': f'{table_name}: Sum of {num_name} by {dim_name}',
+                            'description': f'Bar chart showing total {num_name} for each {dim_name}',
+                            'sql': _sql('sum_by', dim_q, num_q),
+                            'x_column': dim_name,
+                            'y_column': num_name,
+                            'score': 0.82
+                        }
+                        
+                        # Average by dimension
+                        yield {
+                            'chart_type': 'bar',
+                            'title': f'{table_name}: Average {num_name} by {dim_name}',
+                            'description': f'Bar chart showing average {num_name} for each {dim_name}',
+                            'sql': _sql('avg_by', dim_q, num_q),
+                            'x_column': dim_name,
+                            'y_column': num_name,
+                            'score': 0.8
+                        }
+                        
+                        # Add colored variations for bar charts with numeric measures
+                        if color_dim is not None:
+                            yield {
                                 'chart_type': 'bar',
-                                'title': f'{table_name}: Average {num_col.name} by {dim_col.name}',
-                                'description': f'Bar chart showing average {num_col.name} for each {dim_col.name}',
-                                'sql': f"SELECT {dim_col.name} as x, AVG({num_col.name}) as y FROM {table_name} WHERE {dim_col.name} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC",
-                                'x_column': dim_col.name,
-                                'y_column': num_col.name,
-                                'score': 0.8
-                            })
-                            
-                            # Add colored variations for bar charts with numeric measures
-                            # Find suitable color dimensions (low cardinality, different from x-axis)
-                            color_dims = [col for col in dimension_cols 
-                                        if col != dim_col 
-                                        and 2 <= col.cardinality <= 10
-                                        and not col.is_geographic]
-                            
-                            # Create colored bar charts with SUM (limit to 1 color dimension to avoid explosion)
-                            for color_dim in color_dims[:1]:
-                                recommendations.append({
-                                    'chart_type': 'bar',
-                                    'title': f'{table_name}: {num_col.name} by {dim_col.name} and {color_dim.name}',
-                                    'description': f'Stacked bar: {num_col.name} by {dim_col.name}, colored by {color_dim.name}',
-                                    'sql': f"SELECT {dim_col.name} as x, SUM({num_col.name}) as y, {color_dim.name} as color FROM {table_name} WHERE {dim_col.name} IS NOT NULL AND {color_dim.name} IS NOT NULL AND {num_col.name} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 2",
-                                    'x_column': dim_col.name,
-                                    'y_column': num_col.name,
-                                    'color_column': color_dim.name,
-                                    'score': 0.81
-                                })
-            
-            # Histogram for numeric distributions
-            for num_col in numeric_cols:
-                recommendations.append({
-                    'chart_type': 'histogram',
-                    'title': f'{table_name}: Distribution of {num_col.name}',
-                    'description': f'Histogram showing value distribution of {num_col.name}',
-                    'sql': f"SELECT {num_col.name} as x, {num_col.name} as y FROM {table_name} WHERE {num_col.name} IS NOT NULL",
-                    'x_column': num_col.name,
-                    'y_column': num_col.name,
-                    'score': 0.7
-                })
+                                'title': f'{table_name}: {num_name} by {dim_name} and {color_name}',
+                                'description': f'Stacked bar: {num_name} by {dim_name}, colored by {color_name}',
+                                'sql': f"SELECT {dim_q} as x, SUM({num_q}) as y, {color_q} as color FROM {table_q} WHERE {dim_q} IS NOT NULL AND {color_q} IS NOT NULL AND {num_q} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 2",
+                                'x_column': dim_name,
+                                'y_column': num_name,
+                                'color_column': color_name,
+                                'score': 0.81
+                            }
+        
+        # Histogram for numeric distributions
+        for num_col in numeric_cols:
+            yield {
+                'chart_type': 'histogram',
+                'title': f'{table_name}: Distribution of {num_col.name}',
+                'description': f'Histogram showing value distribution of {num_col.name}',
+                'sql': f"SELECT {num_col.qname} as x, {num_col.qname} as y FROM {table_q} WHERE {num_col.qname} IS NOT NULL",
+                'x_column': num_col.name,
+                'y_column': num_col.name,
+                'score': 0.7
+            }
+        
+        # Scatter plots with numeric pairs
+        if len(numeric_cols) >= 2 and row_count >= MIN_ROWS_FOR_SCATTER:
+            for i, x_col in enumerate(numeric_cols[:4]):
+                for y_col in numeric_cols[i+1:min(i+3, len(numeric_cols))]:
+                    if not x_col.is_geographic and not y_col.is_geographic:
+                        yield {
+                            'chart_type': 'scatter',
+                            'title': f'{table_name}: {y_col.name} vs {x_col.name}',
+                            'description': f'Scatter plot showing relationship between {x_col.name} and {y_col.name}',
+                            'sql': f"SELECT {x_col.qname} as x, {y_col.qname} as y FROM {table_q} WHERE {x_col.qname} IS NOT NULL AND {y_col.qname} IS NOT NULL LIMIT 2000",
+                            'x_column': x_col.name,
+                            'y_column': y_col.name,
+                            'score': 0.75
+                        }
+        
+        # Scatter/bubble charts with COUNT for dimension pairs
+        if len(dimension_cols) >= 2 and row_count >= MIN_ROWS_FOR_SCATTER:
+            bubble_dims = [dim for dim in dimension_cols[:4] if dim.cardinality <= 40]
+            for dim1, dim2 in islice(combinations(bubble_dims, 2), 3):  # Limit to 3 pairs
+                yield {
+                    'chart_type': 'scatter',
+                    'title': f'{table_name}: Count by {dim1.name} vs {dim2.name}',
+                    'description': f'Bubble chart showing record counts for {dim1.name}/{dim2.name} combinations',
+                    'sql': f"SELECT {dim1.qname} as x, {dim2.qname} as y, COUNT(*) as size FROM {table_q} WHERE {dim1.qname} IS NOT NULL AND {dim2.qname} IS NOT NULL GROUP BY 1, 2",
+                    'x_column': dim1.name,
+                    'y_column': dim2.name,
+                    'score': 0.77
+                }
+        
+        # Figlet for key metrics of the first measure, skipping id-style
+        # columns whose sum means nothing
+        key_measures = [col for col in numeric_cols
+                        if col.is_measure and not _ID_NAME_RE.search(col.name)]
+        for num_col in key_measures[:1]:
+            yield {
+                'chart_type': 'figlet',
+                'title': f'{table_name}: Total {num_col.name}',
+                'description': f'Sum of all {num_col.name} values in {table_name}',
+                'sql': f"SELECT SUM({num_col.qname}) as x, SUM({num_col.qname}) as y FROM {table_q}",
+                'score': 0.9
+            }
             
-            # Scatter plots with numeric pairs
-            if len(numeric_cols) >= 2:
-                for i, x_col in enumerate(numeric_cols[:4]):
-                    for y_col in numeric_cols[i+1:min(i+3, len(numeric_cols))]:
-                        if not x_col.is_geographic and not y_col.is_geographic:
-                            recommendations.append({
-                                'chart_type': 'scatter',
-                                'title': f'{table_name}: {y_col.name} vs {x_col.name}',
-                                'description': f'Scatter plot showing relationship between {x_col.name} and {y_col.name}',
-                                'sql': f"SELECT {x_col.name} as x, {y_col.name} as y FROM {table_name} WHERE {x_col.name} IS NOT NULL AND {y_col.name} IS NOT NULL LIMIT 2000",
-                                'x_column': x_col.name,
-                                'y_column': y_col.name,
-                                'score': 0.75
-                            })
+            yield {
+                'chart_type': 'figlet',
+                'title': f'{table_name}: Average {num_col.name}',
+                'description': f'Average value of {num_col.name} in {table_name}',
+                'sql': f"SELECT ROUND(AVG({num_col.qname}), 2) as x, ROUND(AVG({num_col.qname}), 2) as y FROM {table_q}",
+                'score': 0.85
+            }
+        
+        # Multi-series recommendations (with color dimension)
+        if dimension_cols and numeric_cols and (date_cols or dimension_cols):
+            # Find low cardinality dimensions for color
+            color_dims = small_dims
             
-            # Scatter/bubble charts with COUNT for dimension pairs
-            if len(dimension_cols) >= 2:
-                dim_pairs = []
-                for dim1 in dimension_cols[:4]:
-                    for dim2 in dimension_cols[:4]:
-                        if dim1 != dim2 and dim1.cardinality <= 40 and dim2.cardinality <= 40:
-                            # Sort to avoid duplicates
-                            pair = tuple(sorted([dim1.name, dim2.name]))
-                            if pair not in dim_pairs:
-                                dim_pairs.append(pair)
-                                recommendations.append({
-                                    'chart_type': 'scatter',
-                                    'title': f'{table_name}: Count by {dim1.name} vs {dim2.name}',
-                                    'description': f'Bubble chart showing record counts for {dim1.name}/{dim2.name} combinations',
-                                    'sql': f"SELECT {dim1.name} as x, {dim2.name} as y, COUNT(*) as size FROM {table_name} WHERE {dim1.name} IS NOT NULL AND {dim2.name} IS NOT NULL GROUP BY 1, 2",
-                                    'x_column': dim1.name,
-                                    'y_column': dim2.name,
-                                    'score': 0.77
-                                })
-                                if len(dim_pairs) >= 3:  # Limit to 3 pairs
-                                    break
-                    if len(dim_pairs) >= 3:
-                        break
-                
-                # Figlet for key metrics
-                recommendations.append({
-                    'chart_type': 'figlet',
-                    'title': f'{table_name}: Total {num_col.name}',
-                    'description': f'Sum of all {num_col.name} values in {table_name}',
-                    'sql': f"SELECT SUM({num_col.name}) as x, SUM({num_col.name}) as y FROM {table_name}",
-                    'score': 0.9
-                })
+            if color_dims:
+                color_col = color_dims[0]  # Pick first suitable color dimension
                 
-                recommendations.append({
-                    'chart_type': 'figlet',
-                    'title': f'{table_name}: Average {num_col.name}',
-                    'description': f'Average value of {num_col.name} in {table_name}',
-                    'sql': f"SELECT ROUND(AVG({num_col.name}), 2) as x, ROUND(AVG({num_col.name}), 2) as y FROM {table_name}",
-                    'score': 0.85
-                })
-            
-            # Multi-series recommendations (with color dimension)
-            if dimension_cols and numeric_cols and (date_cols or dimension_cols):
-                # Find low cardinality dimensions for color
-                color_dims = [col for col in dimension_cols if 2 <= col.cardinality <= 10]
+                # Time series with color
+                if date_cols:
+                    date_col = date_cols[0]
+                    num_col = numeric_cols[0]
+                    yield {
+                        'chart_type': 'line',
+                        'title': f'{table_name}: {num_col.name} by {date_col.name}, colored by {color_col.name}',
+                        'description': f'Multi-series time series with {color_col.name} as color dimension',
+                        'sql': f"SELECT strftime('%d/%m/%Y', {date_col.qname}) as x, {num_col.qname} as y, {color_col.qname} as color FROM {table_q} ORDER BY {date_col.qname}",
+                        'x_column': date_col.name,
+                        'y_column': num_col.name,
+                        'color_column': color_col.name,
+                        'score': 0.85
+                    }
                 
-                if color_dims:
-                    color_col = color_dims[0]  # Pick first suitable color dimension
-                    
-                    # Time series with color
-                    if date_cols:
-                        date_col = date_cols[0]
+                # Grouped bar chart
+                if dimension_cols:
+                    x_dim = [col for col in at_most_10_dims if col != color_col]
+                    if x_dim:
+                        x_col = x_dim[0]
                         num_col = numeric_cols[0]
-                        recommendations.append({
-                            'chart_type': 'line',
-                            'title': f'{table_name}: {num_col.name} by {date_col.name}, colored by {color_col.name}',
-                            'description': f'Multi-series time series with {color_col.name} as color dimension',
-                            'sql': f"SELECT strftime('%d/%m/%Y', {date_col.name}) as x, {num_col.name} as y, {color_col.name} as color FROM {table_name} ORDER BY {date_col.name}",
-                            'x_column': date_col.name,
+                        yield {
+                            'chart_type': 'bar',
+                            'title': f'{table_name}: {num_col.name} by {x_col.name}, grouped by {color_col.name}',
+                            'description': f'Grouped bar chart with {x_col.name} on x-axis and {color_col.name} as groups',
+                            'sql': f"SELECT {x_col.qname} as x, SUM({num_col.qname}) as y, {color_col.qname} as color FROM {table_q} GROUP BY 1, 3 ORDER BY 1",
+                            'x_column': x_col.name,
                             'y_column': num_col.name,
                             'color_column': color_col.name,
-                            'score': 0.85
-                        })
-                    
-                    # Grouped bar chart
-                    if dimension_cols:
-                        x_dim = [col for col in dimension_cols if col != color_col and col.cardinality <= 10]
-                        if x_dim:
-                            x_col = x_dim[0]
-                            num_col = numeric_cols[0]
-                            recommendations.append({
-                                'chart_type': 'bar',
-                                'title': f'{table_name}: {num_col.name} by {x_col.name}, grouped by {color_col.name}',
-                                'description': f'Grouped bar chart with {x_col.name} on x-axis and {color_col.name} as groups',
-                                'sql': f"SELECT {x_col.name} as x, SUM({num_col.name}) as y, {color_col.name} as color FROM {table_name} GROUP BY 1, 3 ORDER BY 1",
-                                'x_column': x_col.name,
-                                'y_column': num_col.name,
-                                'color_column': color_col.name,
-                                'score': 0.8
-                            })
-                            
-                            # Termgraph stacked bars - both dimension arrangements
-                            # Version 1: x_col on x-axis, color_col as stack segments
-                            recommendations.append({
-                                'chart_type': 'tg_stacked',
-                                'title': f'{table_name}: {num_col.name} by {x_col.name}, stacked by {color_col.name}',
-                                'description': f'Stacked bar chart with {x_col.name} on x-axis and {color_col.name} as stack segments',
-                                'sql': f"SELECT {x_col.name} as x, SUM({num_col.name}) as y, {color_col.name} as color FROM {table_name} WHERE {x_col.name} IS NOT NULL AND {color_col.name} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 3",
-                                'x_column': x_col.name,
-                                'y_column': num_col.name,
-                                'color_column': color_col.name,
-                                'score': 0.82
-                            })
-                            
-                            # Version 2: color_col on x-axis, x_col as stack segments
-                            recommendations.append({
-                                'chart_type': 'tg_stacked',
-                                'title': f'{table_name}: {num_col.name} by {color_col.name}, stacked by {x_col.name}',
-                                'description': f'Stacked bar chart with {color_col.name} on x-axis and {x_col.name} as stack segments',
-                                'sql': f"SELECT {color_col.name} as x, SUM({num_col.name}) as y, {x_col.name} as color FROM {table_name} WHERE {x_col.name} IS NOT NULL AND {color_col.name} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 3",
-                                'x_column': color_col.name,
-                                'y_column': num_col.name,
-                                'color_column': x_col.name,
-                                'score': 0.82
-                            })
-                
-                # Also add termgraph stacked for single dimension with counts
-                for dim_col in dimension_cols:
-                    if 2 <= dim_col.cardinality <= 20:
-                        # Find another dimension to pair with
-                        other_dims = [col for col in dimension_cols if col != dim_col and 2 <= col.cardinality <= 10]
-                        if other_dims:
-                            other_dim = other_dims[0]
-                            # Count stacked bars
-                            recommendations.append({
-                                'chart_type': 'tg_stacked',
-                                'title': f'{table_name}: Count by {dim_col.name}, stacked by {other_dim.name}',
-                                'description': f'Stacked count chart with {dim_col.name} categories and {other_dim.name} segments',
-                                'sql': f"SELECT {dim_col.name} as x, COUNT(*) as y, {other_dim.name} as color FROM {table_name} WHERE {dim_col.name} IS NOT NULL AND {other_dim.name} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 3",
-                                'x_column': dim_col.name,
-                                'y_column': 'count',
-                                'color_column': other_dim.name,
-                                'score': 0.83
-                            })
-            
-            # Special handling for single-row summary tables
-            if table_analysis.row_count == 1 and numeric_cols:
-                for num_col in numeric_cols:
-                    recommendations.append({
-                        'chart_type': 'figlet',
-                        'title': f'{table_name}: {num_col.name} Value',
-                        'description': f'Single value display of {num_col.name}',
-                        'sql': f"SELECT {num_col.name} as x, {num_col.name} as y FROM {table_name}",
-                        'x_column': num_col.name,
-                        'y_column': num_col.name,
-                        'score': 0.95
-                    })
-            
-            # Rich table for detailed views
-            if len(table_analysis.columns) >= 3:
-                col_list = list(table_analysis.columns.keys())[:10]  # Limit columns
-                recommendations.append({
-                    'chart_type': 'rich_table',
-                    'title': f'{table_name}: Sample Records',
-                    'description': f'Table view showing columns: {', '.join(col_list[:5])}{'...' if len(col_list) > 5 else ''}',
-                    'sql': f"SELECT {', '.join(col_list)} FROM {table_name} LIMIT 100",
-                    'score': 0.6
-                })
-            
-            # Add more count-based figlet displays
-            if table_analysis.row_count > 0:
-                # Count of unique values for each dimension
-                for dim_col in dimension_cols:
-                    if dim_col.cardinality > 1:
-                        recommendations.append({
-                            'chart_type': 'figlet',
-                            'title': f'{table_name}: Unique {dim_col.name} Count',
-                            'description': f'Number of distinct {dim_col.name} values',
-                            'sql': f"SELECT COUNT(DISTINCT {dim_col.name}) as x, COUNT(DISTINCT {dim_col.name}) as y FROM {table_name}",
                             'score': 0.8
-                        })
+                        }
+                        
+                        # Termgraph stacked bars - both dimension arrangements
+                        # Version 1: x_col on x-axis, color_col as stack segments
+                        yield {
+                            'chart_type': 'tg_stacked',
+                            'title': f'{table_name}: {num_col.name} by {x_col.name}, stacked by {color_col.name}',
+                            'description': f'Stacked bar chart with {x_col.name} on x-axis and {color_col.name} as stack segments',
+                            'sql': f"SELECT {x_col.qname} as x, SUM({num_col.qname}) as y, {color_col.qname} as color FROM {table_q} WHERE {x_col.qname} IS NOT NULL AND {color_col.qname} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 3",
+                            'x_column': x_col.name,
+                            'y_column': num_col.name,
+                            'color_column': color_col.name,
+                            'score': 0.82
+                        }
+                        
+                        # Version 2: color_col on x-axis, x_col as stack segments
+                        yield {
+                            'chart_type': 'tg_stacked',
+                            'title': f'{table_name}: {num_col.name} by {color_col.name}, stacked by {x_col.name}',
+                            'description': f'Stacked bar chart with {color_col.name} on x-axis and {x_col.name} as stack segments',
+                            'sql': f"SELECT {color_col.qname} as x, SUM({num_col.qname}) as y, {x_col.qname} as color FROM {table_q} WHERE {x_col.qname} IS NOT NULL AND {color_col.qname} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 3",
+                            'x_column': color_col.name,
+                            'y_column': num_col.name,
+                            'color_column': x_col.name,
+                            'score': 0.82
+                        }
             
-            # Sort by score and save
-            recommendations.sort(key=lambda x: x['score'], reverse=True)
-            table_analysis.recommended_charts = recommendations
+            # Also add termgraph stacked for single dimension with counts
+            for dim_col in dimension_cols:
+                if 2 <= dim_col.cardinality <= 20:
+                    # Find another dimension to pair with
+                    other_dims = [col for col in small_dims if col != dim_col]
+                    if other_dims:
+                        other_dim = other_dims[0]
+                        # Count stacked bars
+                        yield {
+                            'chart_type': 'tg_stacked',
+                            'title': f'{table_name}: Count by {dim_col.name}, stacked by {other_dim.name}',
+                            'description': f'Stacked count chart with {dim_col.name} categories and {other_dim.name} segments',
+                            'sql': f"SELECT {dim_col.qname} as x, COUNT(*) as y, {other_dim.qname} as color FROM {table_q} WHERE {dim_col.qname} IS NOT NULL AND {other_dim.qname} IS NOT NULL GROUP BY 1, 3 ORDER BY 1, 3",
+                            'x_column': dim_col.name,
+                            'y_column': 'count',
+                            'color_column': other_dim.name,
+                            'score': 0.83
+                        }
+        
+        # Special handling for single-row summary tables
+        if row_count == 1 and numeric_cols:
+            for num_col in numeric_cols:
+                yield {
+                    'chart_type': 'figlet',
+                    'title': f'{table_name}: {num_col.name} Value',
+                    'description': f'Single value display of {num_col.name}',
+                    'sql': f"SELECT {num_col.qname} as x, {num_col.qname} as y FROM {table_q}",
+                    'x_column': num_col.name,
+                    'y_column': num_col.name,
+                    'score': 0.95
+                }
+        
+        # Rich table for detailed views
+        if len(table_analysis.columns) >= 3:
+            col_list = list(table_analysis.columns.values())[:10]  # Limit columns
+            head = ', '.join(col.name for col in col_list[:5])
+            suffix = '...' if len(col_list) > 5 else ''
+            col_list_str = ', '.join(col.qname for col in col_list)
+            yield {
+                'chart_type': 'rich_table',
+                'title': f'{table_name}: Sample Records',
+                'description': f'Table view showing columns: {head}{suffix}',
+                'sql': f"SELECT {col_list_str} FROM {table_q} LIMIT 100",
+                'score': 0.6
+            }
+        
+        # Add more count-based figlet displays
+        # Count of unique values for each dimension
+        for dim_col in dimension_cols:
+            if dim_col.cardinality > 1:
+                yield {
+                    'chart_type': 'figlet',
+                    'title': f'{table_name}: Unique {dim_col.name} Count',
+                    'description': f'Number of distinct {dim_col.name} values',
+                    'sql': f"SELECT COUNT(DISTINCT {dim_col.qname}) as x, COUNT(DISTINCT {dim_col.qname}) as y FROM {table_q}",
+                    'score': 0.8
+                }
     
-    def save_results(self, output_path: str = '.cheshire_analysis.json') -> None:
-        """Save analysis results to JSON file"""
+    def save_results(self, output_path: str = '.cheshire_analysis.json', pretty: bool = False) -> None:
+        """Save analysis results to JSON file (indented if pretty)"""
         # Build database info
         db_info = {
             'type': self.db_type
@@ -1151,19 +1591,19 @@ class DatabaseAnalyzer:
             'tables': {name: table.to_dict() for name, table in self.analysis_results.items()}
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        write_json(output_path, output, pretty)
         
         print(f"\n💾 Analysis saved to: {output_path}")
 
 
-def analyze_http_file(url: str, file_type: str = 'csv', output_path: Optional[str] = None) -> None:
+def analyze_http_file(url: str, file_type: str = 'csv', output_path: Optional[str] = None, pretty: bool = False) -> None:
     """Analyze a remote file via HTTP/HTTPS using DuckDB
     
     Args:
         url: HTTP/HTTPS URL to the file
         file_type: Type of file ('csv', 'tsv', 'parquet', 'json')
         output_path: Optional custom output path for JSON results
+        pretty: Indent the JSON results instead of writing them compactly
     """
     import hashlib
     
@@ -1329,8 +1769,10 @@ def analyze_http_file(url: str, file_type: str = 'csv', output_path: Optional[st
         analyzer.analysis_results[table_ref] = table_analysis
         
         # Temporarily override the table name for recommendation generation
+        # (the table expression is used in SQL as is, not as a quoted identifier)
         original_table_name = table_analysis.name
         table_analysis.name = table_ref
+        table_analysis.qname = table_ref
         
         analyzer._generate_recommendations()
         
@@ -1363,8 +1805,7 @@ def analyze_http_file(url: str, file_type: str = 'csv', output_path: Optional[st
             'tables': {'remote_data': table_analysis.to_dict()}
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2)
+        write_json(output_path, output, pretty)
         
         print(f"\n💾 Analysis saved to: {output_path}")
         print(f"🚀 Run 'cheshire' to browse recommendations in the TUI")
@@ -1377,7 +1818,7 @@ def analyze_http_file(url: str, file_type: str = 'csv', output_path: Optional[st
         conn.close()
 
 
-def analyze_database(db_identifier: Any, db_type: str = 'duckdb', output_path: Optional[str] = None, db_name: Optional[str] = None) -> None:
+def analyze_database(db_identifier: Any, db_type: str = 'duckdb', output_path: Optional[str] = None, db_name: Optional[str] = None, pretty: bool = False) -> None:
     """Main entry point for database analysis
     
     Args:
@@ -1385,17 +1826,19 @@ def analyze_database(db_identifier: Any, db_type: str = 'duckdb', output_path: O
         db_type: Type of database ('duckdb', 'sqlite', etc.)
         output_path: Optional custom output path for JSON results
         db_name: Optional database name for generating default output filename
+        pretty: Indent the JSON results instead of writing them compactly
     """
     analyzer = DatabaseAnalyzer(db_identifier, db_type, db_name)
     results = analyzer.analyze()
     
     # Print summary
+    counts = [(table_name, len(table_analysis.recommended_charts))
+              for table_name, table_analysis in results.items()]
+    total_recommendations = sum(chart_count for _, chart_count in counts)
     print("\n📈 Analysis Summary:")
-    total_recommendations = 0
-    for table_name, table_analysis in results.items():
-        chart_count = len(table_analysis.recommended_charts)
-        total_recommendations += chart_count
-        print(f"  {table_name}: {chart_count} chart recommendations")
+    if counts:
+        print('\n'.join(f"  {table_name}: {chart_count} chart recommendations"
+                        for table_name, chart_count in counts))
     
     print(f"\n✨ Total recommendations: {total_recommendations}")
     
@@ -1404,11 +1847,10 @@ def analyze_database(db_identifier: Any, db_type: str = 'duckdb', output_path: O
         # Generate output filename based on database name or path
         if db_name:
             # Named database from config
-            safe_name = db_name.replace('/', '_').replace('\\', '_')
+            safe_name = db_name.translate(_SAFE_NAME_TABLE)
             output_path = f'.cheshire_analysis_{safe_name}.json'
         elif isinstance(db_identifier, str) and db_identifier != ':memory:':
             # File-based database
-            from pathlib import Path
             db_path = Path(db_identifier)
             safe_name = db_path.stem.replace('.', '_')
             output_path = f'.cheshire_analysis_{safe_name}.json'
@@ -1417,19 +1859,18 @@ def analyze_database(db_identifier: Any, db_type: str = 'duckdb', output_path: O
             output_path = '.cheshire_analysis.json'
     
     # Save results
-    analyzer.save_results(output_path)
+    analyzer.save_results(output_path, pretty)
 
 
-def analyze_csv_tsv_file(file_path: str, file_type: str = 'csv', output_path: Optional[str] = None) -> None:
+def analyze_csv_tsv_file(file_path: str, file_type: str = 'csv', output_path: Optional[str] = None, pretty: bool = False) -> None:
     """Analyze a CSV or TSV file using DuckDB
     
     Args:
         file_path: Path to the CSV/TSV file
         file_type: 'csv' or 'tsv'
         output_path: Optional custom output path for JSON results
+        pretty: Indent the JSON results instead of writing them compactly
     """
-    from pathlib import Path
-    
     # Check if file exists
     if not Path(file_path).exists():
         print(f"Error: File not found: {file_path}")
@@ -1481,8 +1922,9 @@ def analyze_csv_tsv_file(file_path: str, file_type: str = 'csv', output_path: Op
             col_analysis.sql_type = col_type
             
             # Determine data characteristics
-            col_analysis.is_numeric = any(t in col_type.upper() for t in ['INT', 'FLOAT', 'DOUBLE', 'DECIMAL', 'NUMERIC'])
-            col_analysis.is_date = any(t in col_type.upper() for t in ['DATE', 'TIME', 'TIMESTAMP'])
+            col_type_upper = col_type.upper()
+            col_analysis.is_numeric = _NUMERIC_TYPE_RE.search(col_type_upper) is not None
+            col_analysis.is_date = _DATE_TYPE_RE.search(col_type_upper) is not None
             
             # Get column statistics
             try:
@@ -1561,8 +2003,7 @@ def analyze_csv_tsv_file(file_path: str, file_type: str = 'csv', output_path: Op
             'tables': {name: table.to_dict() for name, table in results.items()}
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(save_data, f, indent=2, default=str)
+        write_json(output_path, save_data, pretty)
         
         print(f"\n💾 Analysis saved to: {output_path}")
         print(f"✨ Generated {len(recommendations)} chart recommendations")
@@ -1596,26 +2037,30 @@ def generate_csv_recommendations(table: TableAnalysis, from_clause: str) -> List
     has_geo = lat_cols and lon_cols
     
     # 1. Bar charts for categorical vs numeric
-    for cat_col in categorical_cols[:3]:  # Limit to top 3 categorical
-        for num_col in numeric_cols[:3]:  # Limit to top 3 numeric
-            recommendations.append({
-                'chart_type': 'bar',
-                'title': f'{num_col} by {cat_col}',
-                'description': f'Average {num_col} for each {cat_col}',
-                'sql': f"SELECT {cat_col} as x, AVG({num_col}) as y FROM {from_clause} WHERE {cat_col} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT 20",
-                'score': 0.85
-            })
+    recommendations.extend([
+        {
+            'chart_type': 'bar',
+            'title': f'{num_col} by {cat_col}',
+            'description': f'Average {num_col} for each {cat_col}',
+            'sql': f"SELECT {cat_col} as x, AVG({num_col}) as y FROM {from_clause} WHERE {cat_col} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT 20",
+            'score': 0.85
+        }
+        for cat_col in categorical_cols[:3]  # Limit to top 3 categorical
+        for num_col in numeric_cols[:3]  # Limit to top 3 numeric
+    ])
             
     # 2. Time series if date columns exist
-    for date_col in date_cols[:2]:
-        for num_col in numeric_cols[:3]:
-            recommendations.append({
-                'chart_type': 'line',
-                'title': f'{num_col} over time',
-                'description': f'Trend of {num_col} by {date_col}',
-                'sql': f"SELECT {date_col} as x, AVG({num_col}) as y FROM {from_clause} GROUP BY 1 ORDER BY 1",
-                'score': 0.90
-            })
+    recommendations.extend([
+        {
+            'chart_type': 'line',
+            'title': f'{num_col} over time',
+            'description': f'Trend of {num_col} by {date_col}',
+            'sql': f"SELECT {date_col} as x, AVG({num_col}) as y FROM {from_clause} GROUP BY 1 ORDER BY 1",
+            'score': 0.90
+        }
+        for date_col in date_cols[:2]
+        for num_col in numeric_cols[:3]
+    ])
     
     # 3. Distribution charts
     for num_col in numeric_cols[:3]:
@@ -1631,15 +2076,14 @@ def generate_csv_recommendations(table: TableAnalysis, from_clause: str) -> List
     
     # 4. Scatter plots for numeric correlations
     if len(numeric_cols) >= 2:
-        for i, col1 in enumerate(numeric_cols[:3]):
-            for col2 in numeric_cols[i+1:4]:
-                recommendations.append({
-                    'chart_type': 'scatter',
-                    'title': f'{col1} vs {col2}',
-                    'description': f'Correlation between {col1} and {col2}',
-                    'sql': f"SELECT {col1} as x, {col2} as y FROM {from_clause} WHERE {col1} IS NOT NULL AND {col2} IS NOT NULL",
-                    'score': 0.70
-                })
+        for col1, col2 in combinations(numeric_cols[:4], 2):
+            recommendations.append({
+                'chart_type': 'scatter',
+                'title': f'{col1} vs {col2}',
+                'description': f'Correlation between {col1} and {col2}',
+                'sql': f"SELECT {col1} as x, {col2} as y FROM {from_clause} WHERE {col1} IS NOT NULL AND {col2} IS NOT NULL",
+                'score': 0.70
+            })
     
     # 5. Pie charts for small categorical columns
     for cat_col in categorical_cols:
@@ -1701,19 +2145,19 @@ def generate_csv_recommendations(table: TableAnalysis, from_clause: str) -> List
     })
     
     # Sort by score
-    recommendations.sort(key=lambda x: x['score'], reverse=True)
+    recommendations.sort(key=itemgetter('score'), reverse=True)
     
     return recommendations
 
 
-def analyze_parquet_file(path: str, output_path: Optional[str] = None) -> None:
+def analyze_parquet_file(path: str, output_path: Optional[str] = None, pretty: bool = False) -> None:
     """Analyze a Parquet file or folder of Parquet files using DuckDB
     
     Args:
         path: Path to a Parquet file or directory containing Parquet files
         output_path: Optional custom output path for JSON results
+        pretty: Indent the JSON results instead of writing them compactly
     """
-    from pathlib import Path
     import glob
     
     path_obj = Path(path)
@@ -1794,8 +2238,9 @@ def analyze_parquet_file(path: str, output_path: Optional[str] = None) -> None:
             col_analysis.sql_type = col_type
             
             # Determine data characteristics
-            col_analysis.is_numeric = any(t in col_type.upper() for t in ['INT', 'FLOAT', 'DOUBLE', 'DECIMAL', 'NUMERIC'])
-            col_analysis.is_date = any(t in col_type.upper() for t in ['DATE', 'TIME', 'TIMESTAMP'])
+            col_type_upper = col_type.upper()
+            col_analysis.is_numeric = _NUMERIC_TYPE_RE.search(col_type_upper) is not None
+            col_analysis.is_date = _DATE_TYPE_RE.search(col_type_upper) is not None
             
             # Get column statistics
             try:
@@ -1882,8 +2327,7 @@ def analyze_parquet_file(path: str, output_path: Optional[str] = None) -> None:
             'tables': {name: table.to_dict() for name, table in results.items()}
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(save_data, f, indent=2, default=str)
+        write_json(output_path, save_data, pretty)
         
         print(f"\n💾 Analysis saved to: {output_path}")
         print(f"✨ Generated {len(recommendations)} chart recommendations")
@@ -1911,26 +2355,30 @@ def generate_parquet_recommendations(table: TableAnalysis, from_clause: str) ->
     has_geo = lat_cols and lon_cols
     
     # 1. Bar charts for categorical vs numeric
-    for cat_col in categorical_cols[:3]:
-        for num_col in numeric_cols[:3]:
-            recommendations.append({
-                'chart_type': 'bar',
-                'title': f'{num_col} by {cat_col}',
-                'description': f'Average {num_col} for each {cat_col}',
-                'sql': f"SELECT {cat_col} as x, AVG({num_col}) as y FROM {from_clause} WHERE {cat_col} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT 20",
-                'score': 0.85
-            })
+    recommendations.extend([
+        {
+            'chart_type': 'bar',
+            'title': f'{num_col} by {cat_col}',
+            'description': f'Average {num_col} for each {cat_col}',
+            'sql': f"SELECT {cat_col} as x, AVG({num_col}) as y FROM {from_clause} WHERE {cat_col} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC LIMIT 20",
+            'score': 0.85
+        }
+        for cat_col in categorical_cols[:3]
+        for num_col in numeric_cols[:3]
+    ])
     
     # 2. Time series if date columns exist
-    for date_col in date_cols[:2]:
-        for num_col in numeric_cols[:3]:
-            recommendations.append({
-                'chart_type': 'line',
-                'title': f'{num_col} over time',
-                'description': f'Trend of {num_col} by {date_col}',
-                'sql': f"SELECT {date_col} as x, AVG({num_col}) as y FROM {from_clause} GROUP BY 1 ORDER BY 1",
-                'score': 0.90
-            })
+    recommendations.extend([
+        {
+            'chart_type': 'line',
+            'title': f'{num_col} over time',
+            'description': f'Trend of {num_col} by {date_col}',
+            'sql': f"SELECT {date_col} as x, AVG({num_col}) as y FROM {from_clause} GROUP BY 1 ORDER BY 1",
+            'score': 0.90
+        }
+        for date_col in date_cols[:2]
+        for num_col in numeric_cols[:3]
+    ])
     
     # 3. Distribution charts
     for num_col in numeric_cols[:3]:
@@ -1946,15 +2394,14 @@ def generate_parquet_recommendations(table: TableAnalysis, from_clause: str) ->
     
     # 4. Scatter plots
     if len(numeric_cols) >= 2:
-        for i, col1 in enumerate(numeric_cols[:3]):
-            for col2 in numeric_cols[i+1:4]:
-                recommendations.append({
-                    'chart_type': 'scatter',
-                    'title': f'{col1} vs {col2}',
-                    'description': f'Correlation between {col1} and {col2}',
-                    'sql': f"SELECT {col1} as x, {col2} as y FROM {from_clause} WHERE {col1} IS NOT NULL AND {col2} IS NOT NULL LIMIT 10000",
-                    'score': 0.70
-                })
+        for col1, col2 in combinations(numeric_cols[:4], 2):
+            recommendations.append({
+                'chart_type': 'scatter',
+                'title': f'{col1} vs {col2}',
+                'description': f'Correlation between {col1} and {col2}',
+                'sql': f"SELECT {col1} as x, {col2} as y FROM {from_clause} WHERE {col1} IS NOT NULL AND {col2} IS NOT NULL LIMIT 10000",
+                'score': 0.70
+            })
     
     # 5. Pie charts for small categorical columns
     for cat_col in categorical_cols:
@@ -2023,6 +2470,6 @@ def generate_parquet_recommendations(table: TableAnalysis, from_clause: str) ->
     })
     
     # Sort by score
-    recommendations.sort(key=lambda x: x['score'], reverse=True)
+    recommendations.sort(key=itemgetter('score'), reverse=True)
     
     return recommendations
\ No newline at end of file
@@ -4,155 +4,343 @@ Database connectors for cheshire.
 Supports DuckDB, PostgreSQL, MySQL, SQLite (via DuckDB extensions), ClickHouse, and osquery.
 """
 
+import atexit
 import duckdb
 import subprocess
 import json
+import queue
 import shutil
-from typing import List, Dict, Any, Optional
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 
+# orjson is an optional speedup for parsing large osquery results
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class DatabaseConnector:
     """Base class for database connections."""
     
     def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute query and return results as list of dictionaries."""
+        """Execute query and return results as list of dictionaries.
+        
+        Values keep the driver's native Python types (datetime, Decimal, UUID,
+        bytes, ...); callers convert them only where they need text.
+        """
         raise NotImplementedError
+    
+    def close(self) -> None:
+        """Release any connection held by the connector."""
+    
+    def refresh(self) -> None:
+        """Forget cached schema information, so new tables and columns show up."""
+    
+    @contextmanager
+    def hold(self) -> Iterator['DatabaseConnector']:
+        """Keep connections open across the queries run inside the block.
+        
+        Connectors that release their connection after each query (file-backed
+        DuckDB) reuse one for the whole block instead; others ignore it.
+        """
+        yield self
+
+
+# Concurrent queries each DuckDB-backed connector can run
+DEFAULT_POOL_SIZE = 4
+
 
+def _sql_literal(value: str) -> str:
+    """Quote a string as a SQL literal (ATTACH doesn't take bound parameters)."""
+    return "'" + value.replace("'", "''") + "'"
 
-class DuckDBConnector(DatabaseConnector):
-    """Direct DuckDB connection for .duckdb files and in-memory databases."""
+
+def _load_extension(conn: duckdb.DuckDBPyConnection, extension: str) -> None:
+    """LOAD a DuckDB extension, installing it only if it isn't cached locally yet."""
+    try:
+        conn.execute(f"LOAD {extension}")
+    except duckdb.Error:
+        conn.execute(f"INSTALL {extension}; LOAD {extension};")
+
+
+class DuckDBBackedConnector(DatabaseConnector):
+    """Base class for connectors that run their queries through DuckDB.
     
-    def __init__(self, path: str = ':memory:'):
-        self.path = path
+    The DuckDB connection, with its extensions loaded and database attached, is
+    opened on first use and reused by later queries until close() is called.
+    A DuckDB connection runs one query at a time, so concurrent queries get
+    cursors of it (up to pool_size connections sharing the same attached
+    database), and wait for a free one beyond that.
+    
+    Connectors with `keep_open` False instead close the pool as soon as no
+    query is running, unless a hold() block keeps it open.
+    
+    Subclasses that ATTACH a database set `catalog` to its alias; every pooled
+    connection then USEs it, so unqualified table names resolve to the attached
+    database without rewriting the query text. Scanners that cache the attached
+    database's schema set `clear_cache_sql`; a query failing on a missing table
+    or column is retried once after clearing it.
+    """
+    
+    # Alias of the attached database that unqualified table names resolve to
+    catalog: Optional[str] = None
+    
+    # Statement dropping the scanner's cached schema of the attached database
+    clear_cache_sql: Optional[str] = None
+    
+    # Whether the pool stays open between queries outside of hold() blocks
+    keep_open = True
+    
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = max(1, pool_size)
+        self._conn: Optional[duckdb.DuckDBPyConnection] = None
+        self._opened = 0
+        self._active = 0  # Queries running
+        self._holds = 0   # Open hold() blocks
+        self._idle: "queue.LifoQueue[duckdb.DuckDBPyConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+    
+    def _open_connection(self) -> duckdb.DuckDBPyConnection:
+        """Open and set up a new DuckDB connection for this database."""
+        raise NotImplementedError
+    
+    def _prepare_connection(self, conn: duckdb.DuckDBPyConnection) -> duckdb.DuckDBPyConnection:
+        """Apply per-connection settings once, when conn joins the pool."""
+        # The progress bar is pure overhead for many short queries (and draws over the TUI)
+        conn.execute("SET enable_progress_bar = false")
+        # Make the attached database the default for unqualified table names
+        if self.catalog:
+            conn.execute(f"USE {self.catalog}")
+        return conn
+    
+    def _acquire(self) -> duckdb.DuckDBPyConnection:
+        """Take an idle pooled connection, opening one if the pool isn't full yet."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._prepared(self._open_connection())
+                self._opened = 1
+                return self._conn
+            if self._opened < self.pool_size:
+                # Cursors share the database instance, so extensions and ATTACHes carry over
+                conn = self._prepared(self._conn.cursor())
+                # Count the slot only once it holds a usable connection
+                self._opened += 1
+                return conn
+        return self._idle.get()
+    
+    def _prepared(self, conn: duckdb.DuckDBPyConnection) -> duckdb.DuckDBPyConnection:
+        """Prepare a new connection for the pool, closing it if that fails."""
+        try:
+            return self._prepare_connection(conn)
+        except Exception:
+            conn.close()
+            raise
+    
+    @contextmanager
+    def _connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a pooled connection for one query."""
+        with self._lock:
+            self._active += 1
+        try:
+            conn = self._acquire()
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._close_if_unused()
+    
+    @contextmanager
+    def hold(self) -> Iterator['DuckDBBackedConnector']:
+        """Keep the pool open across the queries run inside the block."""
+        with self._lock:
+            self._holds += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._holds -= 1
+                self._close_if_unused()
+    
+    def _close_if_unused(self) -> None:
+        """Close the pool if it isn't kept open and nothing uses it (lock held)."""
+        if not self.keep_open and self._active == 0 and self._holds == 0:
+            self._close_pool()
+    
+    def _close_pool(self) -> None:
+        """Close every pooled connection (lock held, no queries running)."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if conn is not self._conn:
+                conn.close()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._opened = 0
+    
+    def close(self) -> None:
+        """Close all pooled connections (call once no queries are running)."""
+        with self._lock:
+            self._close_pool()
+    
+    def refresh(self) -> None:
+        """Clear the scanner's cached schema of the attached database."""
+        if not self.clear_cache_sql:
+            return
+        with self._lock:
+            if self._conn is not None:
+                # The cache belongs to the database instance, shared by every cursor
+                self._conn.cursor().execute(self.clear_cache_sql).close()
     
     def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute query using DuckDB."""
-        # Special handling for in-memory database
-        if self.path == ':memory:' or not self.path:
-            conn = duckdb.connect(':memory:')
-        else:
-            conn = duckdb.connect(self.path, read_only=True)
+        """Execute query on a pooled DuckDB connection."""
         try:
+            return self._execute(query)
+        except (duckdb.CatalogException, duckdb.BinderException):
+            # The table or column may have been created after the schema was cached
+            if not self.clear_cache_sql:
+                raise
+            self.refresh()
+            return self._execute(query)
+    
+    def _execute(self, query: str) -> List[Dict[str, Any]]:
+        with self._connection() as conn:
             result = conn.execute(query).fetchall()
             columns = [desc[0] for desc in conn.description]
-            return [dict(zip(columns, row)) for row in result]
-        finally:
-            conn.close()
+        return [dict(zip(columns, row)) for row in result]
+
+
+class DuckDBConnector(DuckDBBackedConnector):
+    """Direct DuckDB connection for .duckdb files and in-memory databases.
+    
+    Even a read-only connection holds the database file's lock, which would stop
+    other processes (e.g. the one filling a live-refreshed database) from
+    writing to it. Connections are therefore closed after every query, except
+    inside a hold() block; for in-memory databases this also means each query
+    starts from an empty database, as it would with a connection of its own.
+    """
+    
+    keep_open = False
+    
+    def __init__(self, path: str = ':memory:', pool_size: int = DEFAULT_POOL_SIZE):
+        super().__init__(pool_size)
+        self.path = path
+    
+    def _open_connection(self) -> duckdb.DuckDBPyConnection:
+        # Special handling for in-memory database
+        if self.path == ':memory:' or not self.path:
+            return duckdb.connect(':memory:')
+        return duckdb.connect(self.path, read_only=True)
 
 
-class PostgreSQLConnector(DatabaseConnector):
+class PostgreSQLConnector(DuckDBBackedConnector):
     """PostgreSQL connection via DuckDB's postgres_scanner extension."""
     
-    def __init__(self, connection_string: str):
+    catalog = 'pg'
+    clear_cache_sql = "CALL pg_clear_cache()"
+    
+    def __init__(self, connection_string: str, pool_size: int = DEFAULT_POOL_SIZE):
+        super().__init__(pool_size)
         self.connection_string = connection_string
-        
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute query using DuckDB's PostgreSQL scanner."""
+        self._attach_sql = f"ATTACH {_sql_literal(connection_string)} AS pg (TYPE postgres)"
+    
+    def _open_connection(self) -> duckdb.DuckDBPyConnection:
         conn = duckdb.connect(':memory:')
         try:
-            # Install and load postgres_scanner extension
-            conn.execute("INSTALL postgres_scanner; LOAD postgres_scanner;")
+            # Load postgres_scanner extension, installing it on first use
+            _load_extension(conn, 'postgres_scanner')
             
             # For postgres_scanner, we can either:
             # 1. Use postgres_scan function for specific tables
             # 2. Attach the entire database
             
             # Try to attach the database
-            conn.execute(f"ATTACH '{self.connection_string}' AS pg (TYPE postgres)")
-            
-            # If query references tables without schema, try with pg prefix
-            try:
-                result = conn.execute(query).fetchall()
-            except Exception:
-                # Try prefixing tables with pg.
-                # This is a simple approach - in production you'd want better SQL parsing
-                modified_query = query.replace("FROM ", "FROM pg.")
-                result = conn.execute(modified_query).fetchall()
-            
-            columns = [desc[0] for desc in conn.description]
-            return [dict(zip(columns, row)) for row in result]
-        finally:
+            conn.execute(self._attach_sql)
+        except Exception:
             conn.close()
+            raise
+        return conn
 
 
-class MySQLConnector(DatabaseConnector):
+class MySQLConnector(DuckDBBackedConnector):
     """MySQL connection via DuckDB's mysql_scanner extension."""
     
-    def __init__(self, connection_string: str):
+    catalog = 'mysql_db'
+    clear_cache_sql = "CALL mysql_clear_cache()"
+    
+    def __init__(self, connection_string: str, pool_size: int = DEFAULT_POOL_SIZE):
+        super().__init__(pool_size)
         self.connection_string = connection_string
-        
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute query using DuckDB's MySQL scanner."""
+        self._attach_sql = f"ATTACH {_sql_literal(connection_string)} AS mysql_db (TYPE mysql)"
+    
+    def _open_connection(self) -> duckdb.DuckDBPyConnection:
         conn = duckdb.connect(':memory:')
         try:
-            # Install and load mysql_scanner extension
-            conn.execute("INSTALL mysql_scanner; LOAD mysql_scanner;")
+            # Load mysql_scanner extension, installing it on first use
+            _load_extension(conn, 'mysql_scanner')
             
             # Attach the MySQL database
-            conn.execute(f"ATTACH '{self.connection_string}' AS mysql_db (TYPE mysql)")
-            
-            # Try to execute query
-            try:
-                result = conn.execute(query).fetchall()
-            except Exception:
-                # Try prefixing tables with mysql_db.
-                modified_query = query.replace("FROM ", "FROM mysql_db.")
-                result = conn.execute(modified_query).fetchall()
-            
-            columns = [desc[0] for desc in conn.description]
-            return [dict(zip(columns, row)) for row in result]
-        finally:
+            conn.execute(self._attach_sql)
+        except Exception:
             conn.close()
+            raise
+        return conn
 
 
-class SQLiteConnector(DatabaseConnector):
+class SQLiteConnector(DuckDBBackedConnector):
     """SQLite connection via DuckDB's sqlite_scanner extension."""
     
-    def __init__(self, path: str):
+    catalog = 'sqlite_db'
+    
+    def __init__(self, path: str, pool_size: int = DEFAULT_POOL_SIZE):
+        super().__init__(pool_size)
         self.path = path
-        
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute query using DuckDB's SQLite scanner."""
+        self._attach_sql = f"ATTACH {_sql_literal(path)} AS sqlite_db (TYPE sqlite)"
+    
+    def _open_connection(self) -> duckdb.DuckDBPyConnection:
         conn = duckdb.connect(':memory:')
         try:
-            # Install and load sqlite_scanner extension
-            conn.execute("INSTALL sqlite_scanner; LOAD sqlite_scanner;")
+            # Load sqlite_scanner extension, installing it on first use
+            _load_extension(conn, 'sqlite_scanner')
             
             # Attach the SQLite database
-            conn.execute(f"ATTACH '{self.path}' AS sqlite_db (TYPE sqlite)")
-            
-            # Try to execute query
-            try:
-                result = conn.execute(query).fetchall()
-            except Exception as e:
-                # Handle PRAGMA queries specially
-                if query.strip().upper().startswith("PRAGMA"):
-                    # For PRAGMA table_info, we need to prefix the table name, not the PRAGMA
-                    if "table_info" in query:
-                        # Extract table name and prefix it
-                        import re
-                        match = re.search(r'table_info\((.*?)\)', query)
-                        if match:
-                            table_name = match.group(1).strip()
-                            modified_query = query.replace(f"table_info({table_name})", f"table_info(sqlite_db.{table_name})")
-                        else:
-                            raise e
-                    else:
-                        raise e
-                else:
-                    # Try prefixing tables with sqlite_db.
-                    modified_query = query.replace("FROM ", "FROM sqlite_db.")
-                result = conn.execute(modified_query).fetchall()
-            
-            columns = [desc[0] for desc in conn.description]
-            return [dict(zip(columns, row)) for row in result]
-        finally:
+            conn.execute(self._attach_sql)
+        except Exception:
             conn.close()
+            raise
+        return conn
+
+
+def _clickhouse_compression() -> Any:
+    """LZ4 when its optional packages are installed, else no compression."""
+    try:
+        import lz4  # noqa: F401
+        import clickhouse_cityhash  # noqa: F401
+    except ImportError:
+        return False
+    return 'lz4'
 
 
 class ClickHouseConnector(DatabaseConnector):
-    """Native ClickHouse connection using clickhouse-driver."""
+    """Native ClickHouse connection using clickhouse-driver.
+    
+    Each thread keeps its own Client (a Client runs one query at a time), so
+    the TCP session is opened once and reused until close() is called.
+    """
     
     def __init__(self, host: str = 'localhost', port: int = 9000, 
                  database: str = 'default', user: str = 'default', 
@@ -163,9 +351,16 @@ class ClickHouseConnector(DatabaseConnector):
         self.user = user
         self.password = password
         self.extra_params = kwargs
+        self._local = threading.local()
+        self._clients: List[Any] = []
+        self._lock = threading.Lock()
+    
+    def _client(self) -> Any:
+        """Return this thread's Client, connecting on first use."""
+        client = getattr(self._local, 'client', None)
+        if client is not None:
+            return client
         
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute query using clickhouse-driver."""
         try:
             from clickhouse_driver import Client
         except ImportError:
@@ -173,11 +368,11 @@ class ClickHouseConnector(DatabaseConnector):
                 "clickhouse-driver not installed. Run: pip install clickhouse-driver"
             )
         
-        # Disable compression by default to avoid lz4 errors
-        params = {
-            'compression': False,
-            **self.extra_params
-        }
+        # Compress with LZ4 unless configured otherwise; without lz4 and
+        # clickhouse-cityhash installed, compression would fail, so it stays off
+        params = dict(self.extra_params)
+        if params.get('compression') is None:
+            params['compression'] = _clickhouse_compression()
         
         client = Client(
             host=self.host,
@@ -187,9 +382,15 @@ class ClickHouseConnector(DatabaseConnector):
             password=self.password,
             **params
         )
+        self._local.client = client
+        with self._lock:
+            self._clients.append(client)
+        return client
         
+    def execute_query(self, query: str) -> List[Dict[str, Any]]:
+        """Execute query using clickhouse-driver."""
         # Execute query with column info
-        result = client.execute(query, with_column_types=True)
+        result = self._client().execute(query, with_column_types=True)
         
         if not result or not result[0]:
             return []
@@ -199,31 +400,108 @@ class ClickHouseConnector(DatabaseConnector):
         
         # Convert rows to list of dicts
         return [dict(zip(columns, row)) for row in rows]
+    
+    def close(self) -> None:
+        """Disconnect every thread's Client."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+            self._local = threading.local()
+        for client in clients:
+            client.disconnect()
+
+
+@lru_cache(maxsize=1)
+def _osqueryi_path() -> Optional[str]:
+    """Locate osqueryi on PATH once per process."""
+    return shutil.which('osqueryi')
+
+
+# Extensions socket a running osqueryd listens on by default
+DEFAULT_OSQUERY_SOCKET = '/var/osquery/osquery.em'
 
 
 class OsqueryConnector(DatabaseConnector):
-    """osquery connection via osqueryi CLI tool."""
+    """osquery connection via a running osqueryd, or the osqueryi CLI tool.
+    
+    When the optional `osquery` package is installed and the daemon's
+    extensions socket exists, queries go over one Thrift client to osqueryd
+    instead of starting an osqueryi process per query.
+    """
     
-    def __init__(self):
-        """Initialize osquery connector."""
+    def __init__(self, socket_path: Optional[str] = None):
+        """Initialize osquery connector.
+        
+        Args:
+            socket_path: osqueryd extensions socket; the default socket is
+                used when it exists, otherwise queries fall back to osqueryi
+        """
+        self._extension = None
+        self._client = None
+        self._client_lock = threading.Lock()
+        if socket_path or Path(DEFAULT_OSQUERY_SOCKET).exists():
+            self._connect_socket(socket_path or DEFAULT_OSQUERY_SOCKET, required=bool(socket_path))
+        
         # Check if osqueryi is available
-        self.osqueryi_path = shutil.which('osqueryi')
-        if not self.osqueryi_path:
+        self.osqueryi_path = _osqueryi_path()
+        if not self.osqueryi_path and self._client is None:
             raise RuntimeError(
                 "osqueryi not found in PATH. Please install osquery: "
                 "https://osquery.io/downloads/"
             )
     
+    def _connect_socket(self, socket_path: str, required: bool) -> None:
+        """Open a Thrift client on osqueryd's extensions socket.
+        
+        A configured socket must work; an auto-detected one is skipped quietly.
+        """
+        try:
+            import osquery
+        except ImportError:
+            if required:
+                raise ImportError(
+                    "osquery not installed. Run: pip install osquery"
+                )
+            return
+        
+        extension = osquery.ExtensionClient(socket_path)
+        try:
+            extension.open()
+        except Exception as e:
+            extension.close()
+            if required:
+                raise RuntimeError(f"Failed to connect to osqueryd at {socket_path}: {e}")
+            return
+        self._extension = extension
+        self._client = extension.extension_client()
+    
+    def _query_socket(self, query: str) -> List[Dict[str, Any]]:
+        """Run query on osqueryd; the Thrift client handles one call at a time."""
+        with self._client_lock:
+            response = self._client.query(query)
+        if response.status.code != 0:
+            raise RuntimeError(f"osquery error: {response.status.message}")
+        return list(response.response)
+    
+    def close(self) -> None:
+        """Close the osqueryd socket, if one is open."""
+        if self._extension is not None:
+            self._extension.close()
+            self._extension = None
+            self._client = None
+    
     def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute query using osqueryi CLI and return results."""
+        """Execute query on osqueryd if connected, else via the osqueryi CLI."""
+        if self._client is not None:
+            return self._query_socket(query)
+        
         try:
             # Execute query via osqueryi with JSON output
             # Use --json for JSON output format
             # Use --disable_events to avoid event-based tables that might hang
+            # Output is kept as bytes, which the JSON parser reads without a decode pass
             result = subprocess.run(
                 [self.osqueryi_path, '--json', '--disable_events', query],
                 capture_output=True,
-                text=True,
                 timeout=30,  # 30 second timeout
                 check=False  # Don't raise on non-zero exit codes
             )
@@ -231,10 +509,12 @@ class OsqueryConnector(DatabaseConnector):
             # Check for errors
             if result.returncode != 0:
                 # osqueryi returns non-zero for SQL errors
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+                stdout = result.stdout.decode(errors='replace')
+                stderr = result.stderr.decode(errors='replace').strip()
+                error_msg = stderr or "Unknown error"
                 # Try to extract meaningful error from output
-                if "Error:" in result.stdout:
-                    error_msg = result.stdout.split("Error:")[1].strip()
+                if "Error:" in stdout:
+                    error_msg = stdout.split("Error:")[1].strip()
                 raise RuntimeError(f"osquery error: {error_msg}")
             
             # Parse JSON output
@@ -242,14 +522,14 @@ class OsqueryConnector(DatabaseConnector):
                 return []
                 
             try:
-                data = json.loads(result.stdout)
+                data = _json_loads(result.stdout)
                 # osqueryi returns a list of dictionaries
                 if isinstance(data, list):
                     return data
                 else:
                     # Unexpected format
                     return []
-            except json.JSONDecodeError as e:
+            except json.JSONDecodeError as e:  # Also raised by orjson
                 # If JSON parsing fails, try to provide helpful error
                 raise RuntimeError(f"Failed to parse osquery output: {e}")
                 
@@ -261,12 +541,23 @@ class OsqueryConnector(DatabaseConnector):
 
 def is_osquery_available() -> bool:
     """Check if osquery is installed and available."""
-    return shutil.which('osqueryi') is not None
+    return _osqueryi_path() is not None
+
+
+# Connectors shared by every caller using the same database config
+_CONNECTORS: Dict[str, DatabaseConnector] = {}
+_CONNECTORS_LOCK = threading.Lock()
 
 
 def create_connector(db_config: Dict[str, Any]) -> DatabaseConnector:
     """
-    Factory function to create appropriate database connector.
+    Factory function to get the database connector for a config.
+    
+    Connectors are cached by config, so repeated calls for the same database
+    share one connector for the life of the process. Cached connectors of
+    .duckdb files hold no connection between queries (see DuckDBConnector),
+    so other processes can keep writing to the file. In-memory DuckDB configs
+    get a new connector every call, so no state carries over between callers.
     
     Args:
         db_config: Database configuration dict with 'type' and connection params
@@ -274,10 +565,42 @@ def create_connector(db_config: Dict[str, Any]) -> DatabaseConnector:
     Returns:
         DatabaseConnector instance
     """
+    if _is_in_memory(db_config):
+        return _build_connector(db_config)
+    
+    key = json.dumps(db_config, sort_keys=True, default=str)
+    with _CONNECTORS_LOCK:
+        connector = _CONNECTORS.get(key)
+        if connector is None:
+            connector = _CONNECTORS[key] = _build_connector(db_config)
+    return connector
+
+
+@atexit.register
+def close_all_connectors() -> None:
+    """Close and forget every cached connector."""
+    with _CONNECTORS_LOCK:
+        connectors = list(_CONNECTORS.values())
+        _CONNECTORS.clear()
+    for connector in connectors:
+        connector.close()
+
+
+def _is_in_memory(db_config: Dict[str, Any]) -> bool:
+    """Whether a config is for an in-memory DuckDB database."""
+    if db_config.get('type', 'duckdb').lower() != 'duckdb':
+        return False
+    path = db_config.get('path', ':memory:')
+    return not path or path == ':memory:'
+
+
+def _build_connector(db_config: Dict[str, Any]) -> DatabaseConnector:
+    """Create a new connector for a database config."""
     db_type = db_config.get('type', 'duckdb').lower()
+    pool_size = db_config.get('pool_size', DEFAULT_POOL_SIZE)
     
     if db_type == 'duckdb':
-        return DuckDBConnector(db_config.get('path', ':memory:'))
+        return DuckDBConnector(db_config.get('path', ':memory:'), pool_size)
         
     elif db_type in ['postgres', 'postgresql']:
         connection = db_config.get('connection', '')
@@ -294,7 +617,7 @@ def create_connector(db_config: Dict[str, Any]) -> DatabaseConnector:
                 connection += f" password={password}"
             connection += f" dbname={database}"
             
-        return PostgreSQLConnector(connection)
+        return PostgreSQLConnector(connection, pool_size)
         
     elif db_type == 'mysql':
         connection = db_config.get('connection', '')
@@ -313,13 +636,13 @@ def create_connector(db_config: Dict[str, Any]) -> DatabaseConnector:
             if database:
                 connection += f" database={database}"
                 
-        return MySQLConnector(connection)
+        return MySQLConnector(connection, pool_size)
         
     elif db_type == 'sqlite':
         path = db_config.get('path', '')
         if not path:
             raise ValueError("SQLite requires 'path' parameter")
-        return SQLiteConnector(path)
+        return SQLiteConnector(path, pool_size)
         
     elif db_type == 'clickhouse':
         return ClickHouseConnector(
@@ -330,30 +653,35 @@ def create_connector(db_config: Dict[str, Any]) -> DatabaseConnector:
             password=db_config.get('password', ''),
             secure=db_config.get('secure', False),
             verify=db_config.get('verify', True),
-            compression=db_config.get('compression', True)
+            compression=db_config.get('compression')
         )
         
     elif db_type == 'osquery':
-        return OsqueryConnector()
+        return OsqueryConnector(db_config.get('socket'))
         
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
 
-# For backward compatibility
-def execute_query_compat(query: str, db_path: str) -> List[Dict[str, Any]]:
+def compat_connector(db_path: Any) -> DatabaseConnector:
     """
-    Backward compatible execute_query function.
-    If db_path looks like a file path, use DuckDB directly.
-    Otherwise, treat it as a database config dict.
+    Connector for a file path (DuckDB) or a database config dict.
     """
     if isinstance(db_path, str):
         # Legacy mode - direct file path
-        connector = DuckDBConnector(db_path)
+        return create_connector({'type': 'duckdb', 'path': db_path})
     elif isinstance(db_path, dict):
         # New mode - database config
-        connector = create_connector(db_path)
+        return create_connector(db_path)
     else:
         raise ValueError(f"Invalid db_path type: {type(db_path)}")
-        
-    return connector.execute_query(query)
\ No newline at end of file
+
+
+# For backward compatibility
+def execute_query_compat(query: str, db_path: str) -> List[Dict[str, Any]]:
+    """
+    Backward compatible execute_query function.
+    If db_path looks like a file path, use DuckDB directly.
+    Otherwise, treat it as a database config dict.
+    """
+    return compat_connector(db_path).execute_query(query)
\ No newline at end of file
@@ -42,7 +42,7 @@ import pyfiglet
 from rich.console import Console
 from rich.table import Table
 from rich import box
-from .db_connectors import create_connector, execute_query_compat, is_osquery_available
+from .db_connectors import compat_connector, create_connector, execute_query_compat, is_osquery_available
 import termgraph.termgraph as tg
 from .map_renderer import render_map
 from .matrix_heatmap import render_matrix_heatmap, extract_matrix_data
@@ -264,19 +264,28 @@ def execute_query(query: str, db_identifier: Any, config: Optional[Dict[str, Any
         # The query already contains the full path to the file
         return execute_query_compat(query, ':memory:')
     
+    return execute_query_compat(query, _resolve_database(db_identifier, config))
+
+
+def refresh_database(db_identifier: Any, config: Optional[Dict[str, Any]] = None) -> None:
+    """Drop cached schema information of a database, so new tables and columns show up."""
+    compat_connector(_resolve_database(db_identifier, config)).refresh()
+
+
+def _resolve_database(db_identifier: Any, config: Optional[Dict[str, Any]] = None) -> Any:
+    """Resolve a database name from config to its config dict; paths and dicts pass through."""
     # Handle different types of db_identifier
     if isinstance(db_identifier, dict):
         # Direct config dict
-        return execute_query_compat(query, db_identifier)
+        return db_identifier
     elif isinstance(db_identifier, str):
         # Could be a database name or file path
         if config and 'databases' in config and db_identifier in config['databases']:
             # It's a named database from config
-            db_config = config['databases'][db_identifier]
-            return execute_query_compat(query, db_config)
+            return config['databases'][db_identifier]
         else:
             # Assume it's a file path (backward compatibility)
-            return execute_query_compat(query, db_identifier)
+            return db_identifier
     else:
         raise ValueError(f"Invalid db_identifier type: {type(db_identifier)}")
 
@@ -1279,6 +1288,7 @@ class CheshireCommand(click.Command):
 @click.option('--font', help='Font for figlet chart type (e.g., "ansi_regular", "colossal", "big")')
 @click.option('--list-databases', is_flag=True, help='List available databases from config')
 @click.option('--sniff', is_flag=True, help='Analyze database and generate chart recommendations')
+@click.option('--pretty', is_flag=True, help='Write the --sniff analysis file as indented JSON')
 @click.option('--csv', help='CSV file to analyze with --sniff or query directly')
 @click.option('--tsv', help='TSV file to analyze with --sniff or query directly')
 @click.option('--parquet', help='Parquet file or folder to analyze with --sniff or query directly')
@@ -1288,7 +1298,7 @@ class CheshireCommand(click.Command):
 @click.option('--height', help='Chart height in lines (e.g., 20) or percentage of terminal (e.g., "50%")')
 @click.option('--no-clear', is_flag=True, help='Do not clear terminal before rendering (useful for scripts/logs)')
 @click.option('--version', is_flag=True, is_eager=True, expose_value=False, callback=lambda ctx, param, value: (display_logo(), click.echo("cheshire, version 0.1.1"), ctx.exit()) if value else None, help='Show the version and exit.')
-def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str], database: Optional[str], config: str, color: Optional[str], theme: Optional[str], title: Optional[str], font: Optional[str], list_databases: bool, sniff: bool, csv: Optional[str], tsv: Optional[str], parquet: Optional[str], http: Optional[str], json_input: bool, width: Optional[str], height: Optional[str], no_clear: bool):
+def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str], database: Optional[str], config: str, color: Optional[str], theme: Optional[str], title: Optional[str], font: Optional[str], list_databases: bool, sniff: bool, pretty: bool, csv: Optional[str], tsv: Optional[str], parquet: Optional[str], http: Optional[str], json_input: bool, width: Optional[str], height: Optional[str], no_clear: bool):
     """Terminal-based SQL visualization tool.
 
     QUERY: SQL query to execute (must select 'x', 'y', and optionally 'color' columns)
@@ -1350,7 +1360,7 @@ def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str]
             
             # Analyze using DuckDB's ability to read HTTP URLs
             from .database_analyzer import analyze_http_file
-            analyze_http_file(url, file_type)
+            analyze_http_file(url, file_type, pretty=pretty)
             return
         # Check if analyzing CSV/TSV/Parquet file
         elif csv or tsv or parquet:
@@ -1363,7 +1373,7 @@ def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str]
                     sys.exit(1)
                 print(f"🔍 Analyzing Parquet: {file_path}")
                 from .database_analyzer import analyze_parquet_file
-                analyze_parquet_file(file_path)
+                analyze_parquet_file(file_path, pretty=pretty)
             else:
                 file_path = csv or tsv
                 file_type = 'csv' if csv else 'tsv'
@@ -1375,7 +1385,7 @@ def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str]
                     
                 print(f"🔍 Analyzing {file_type.upper()} file: {file_path}")
                 from .database_analyzer import analyze_csv_tsv_file
-                analyze_csv_tsv_file(file_path, file_type)
+                analyze_csv_tsv_file(file_path, file_type, pretty=pretty)
             return
             
         # Need a database to analyze
@@ -1386,7 +1396,7 @@ def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str]
                 db_type = db_config.get('type', 'duckdb')
                 print(f"🔍 Analyzing database: {database}")
                 from .database_analyzer import analyze_database
-                analyze_database(db_config, db_type, db_name=database)
+                analyze_database(db_config, db_type, db_name=database, pretty=pretty)
             else:
                 print(f"Error: Database '{database}' not found in config")
                 sys.exit(1)
@@ -1399,7 +1409,7 @@ def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str]
                     db_type = 'sqlite'
                 print(f"🔍 Analyzing database: {db}")
                 from .database_analyzer import analyze_database
-                analyze_database(db, db_type)
+                analyze_database(db, db_type, pretty=pretty)
             else:
                 print(f"Error: Database file not found: {db}")
                 sys.exit(1)
@@ -1411,7 +1421,7 @@ def main(query: Optional[str], chart_type: str, interval: str, db: Optional[str]
                 db_type = db_config.get('type', 'duckdb')
                 print(f"🔍 Analyzing default database: {default_db_name}")
                 from .database_analyzer import analyze_database
-                analyze_database(db_config, db_type, db_name=default_db_name)
+                analyze_database(db_config, db_type, db_name=default_db_name, pretty=pretty)
             else:
                 print("Error: No database specified. Use --db or --database option.")
                 sys.exit(1)
@@ -7,6 +7,40 @@ Creates circular visualizations for proportional data.
 from typing import List, Dict, Any, Optional, Tuple
 import math
 import os
+from bisect import bisect_left
+
+# Segments start at the top of the circle
+_START_ANGLE = -math.pi / 2
+
+# Distinct colors that work well together
+_DISTINCT_PALETTE = (
+    (26, 188, 156),   # Turquoise
+    (52, 152, 219),   # Blue
+    (155, 89, 182),   # Purple
+    (231, 76, 60),    # Red
+    (230, 126, 34),   # Orange
+    (241, 196, 15),   # Yellow
+    (46, 204, 113),   # Green
+    (149, 165, 166),  # Gray
+    (52, 73, 94),     # Dark blue
+    (192, 57, 43),    # Dark red
+)
+
+# Horizontal compression of canvas distances (the canvas is stretched so the
+# circle looks round). The Braille renderer tunes the fill, the edge ring and
+# the dot sampling separately; changing them changes the drawn edges.
+_BLOCK_X_SCALE = 2.0
+_BRAILLE_FILL_X_SCALE = 1.8
+_BRAILLE_RING_X_SCALE = 1.85
+_BRAILLE_DOT_X_SCALE = 2.0
+
+# Braille dot bits by (column, row) within a character cell
+_BRAILLE_DOTS = ((0x01, 0x02, 0x04, 0x40), (0x08, 0x10, 0x20, 0x80))
+
+# ANSI escape fragments for true-color output
+_ANSI_RESET = "\033[0m"
+_FG_PREFIX = "\033[38;2;"
+_LEGEND_SWATCH = (_FG_PREFIX + "{};{};{}m██" + _ANSI_RESET).format
 
 
 def render_pie_chart(
@@ -56,7 +90,7 @@ def render_pie_chart(
 
     # Calculate angles for each segment
     angles = []
-    current_angle = -math.pi / 2  # Start at top
+    current_angle = _START_ANGLE
     for value in values:
         angle = (value / total) * 2 * math.pi
         angles.append((current_angle, current_angle + angle))
@@ -105,12 +139,13 @@ def render_pie_chart(
     radius_y = radius              # Vertical radius (normal in calculation space)
     width = radius_x * 2 + 5
     height = int(radius_y * 1.5) + 6  # Reduce height to fit better
-    canvas = [[' ' for _ in range(width)] for _ in range(height)]
-    canvas_colors = [[None for _ in range(width)] for _ in range(height)]
+    # One list per row; cells hold immutable chars and color tuples, so [x] * width is safe
+    canvas = [[' '] * width for _ in range(height)]
+    canvas_colors = [[None] * width for _ in range(height)]
 
     # Center of the circle
     cx = width // 2
-    cy = height // 1.9
+    cy = int(height // 1.9)  # Whole rows, so vertical offsets stay integers
 
     # Draw the pie chart
     if use_braille:
@@ -126,16 +161,22 @@ def render_pie_chart(
         lines.append(f"\033[1m{title.center(width)}\033[0m")
         lines.append("")
 
-    # Render canvas
-    for y in range(height):
+    # Render canvas, switching the color only where it changes along a row
+    for chars, cell_colors in zip(canvas, canvas_colors):
         row = []
-        for x in range(width):
-            if canvas_colors[y][x] is not None:
-                r, g, b = canvas_colors[y][x]
-                row.append(f"\033[38;2;{r};{g};{b}m{canvas[y][x]}\033[0m")
-            else:
-                row.append(canvas[y][x])
-        lines.append(''.join(row))
+        current = None
+        for char, color in zip(chars, cell_colors):
+            if color != current:
+                if color is None:
+                    row.append(_ANSI_RESET)
+                else:
+                    row.append(f"{_FG_PREFIX}{color[0]};{color[1]};{color[2]}m")
+                current = color
+            row.append(char)
+        if current is not None:
+            row.append(_ANSI_RESET)
+        # Blank cells past the circle's right edge carry nothing worth sending
+        lines.append(''.join(row).rstrip(' '))
 
     # Legend
     if show_legend and labels:
@@ -147,13 +188,6 @@ def render_pie_chart(
                 r, g, b = colors[i]
                 percentage = value / total * 100
 
-                # Use block character for legend
-                legend_parts = [f"\033[38;2;{r};{g};{b}m██\033[0m"]
-                legend_parts.append(f"{label}")
-
-                if show_percentages:
-                    legend_parts.append(f"({percentage:.1f}%)")
-
                 # Add actual value
                 if value >= 1000000:
                     value_str = f"{value / 1000000:.1f}M"
@@ -161,151 +195,146 @@ def render_pie_chart(
                     value_str = f"{value / 1000:.1f}K"
                 else:
                     value_str = f"{value:,.0f}"
-                legend_parts.append(f"= {value_str}")
 
-                lines.append(" ".join(legend_parts))
+                # Use block character for legend
+                swatch = _LEGEND_SWATCH(r, g, b)
+                if show_percentages:
+                    lines.append(f"{swatch} {label} ({percentage:.1f}%) = {value_str}")
+                else:
+                    lines.append(f"{swatch} {label} = {value_str}")
 
     return "\n".join(lines)
 
 
-def draw_pie_blocks(canvas, canvas_colors, cx, cy, radius_x, radius_y, angles, colors):
-    """Draw pie chart using half-block characters with aspect ratio correction."""
-    # Use half blocks for better aspect ratio
-    # Upper half block: ▀, Lower half block: ▄, Full block: █
+def _segment_index(angle, ends):
+    """Index of the segment an atan2 angle falls in, or None if past the last one.
+
+    Segments run clockwise from the top (-π/2) to just under 3π/2 and ends holds
+    their (ascending) end angles, so angles left of the top wrap around by 2π.
+    """
+    if angle < _START_ANGLE:
+        angle += 2 * math.pi
+    i = bisect_left(ends, angle)
+    return i if i < len(ends) else None
+
+
+def _fill_pie(canvas, canvas_colors, cx, cy, x_scale, radius_y, angles, colors):
+    """Fill every cell inside the circle with a full block in its segment's color.
+
+    x_scale compresses the horizontal distance, since the canvas is stretched
+    horizontally to make the circle look round. Only the cells in each row's
+    span of the circle are visited; the exact distance test still decides the
+    cells at the rim.
+    """
+    height = len(canvas)
+    width = len(canvas[0])
+    ends = [end_angle for _, end_angle in angles]
+    sqrt, atan2 = math.sqrt, math.atan2  # Local lookups in the per-cell loop
+
+    # Horizontal offsets depend only on the column, so they are computed once
+    dxs = [(x - cx) / x_scale for x in range(width)]  # Compress horizontal since we stretched canvas
+
+    for y in range(height):
+        dy = y - cy          # Normal vertical
+        if abs(dy) > radius_y:
+            continue
+        dy2 = dy * dy
 
-    for y in range(len(canvas)):
-        for x in range(len(canvas[0])):
+        # Columns this row of the circle can reach, padded by one for rounding
+        half_span = sqrt(radius_y * radius_y - dy2) * x_scale
+        x_start = max(0, int(cx - half_span) - 1)
+        x_end = min(width, int(cx + half_span) + 2)
+
+        for x in range(x_start, x_end):
             # Calculate distance and angle from center with aspect correction
-            dx = (x - cx) / 2.0  # Compress horizontal since we stretched canvas
-            dy = y - cy          # Normal vertical
-            dist = math.sqrt(dx * dx + dy * dy)
+            dx = dxs[x]
+            dist = sqrt(dx * dx + dy2)
 
             if dist <= radius_y:
                 # Calculate angle (atan2 returns -π to π)
-                angle = math.atan2(dy, dx)
+                angle = atan2(dy, dx)
 
                 # Find which segment this point belongs to
-                for i, (start_angle, end_angle) in enumerate(angles):
-                    # Normalize angle to be in the same range as our segments
-                    # Our segments go from -π/2 and wrap around to > π
-                    test_angle = angle
-                    if test_angle < start_angle:
-                        test_angle += 2 * math.pi
-
-                    # Also check if end wrapped around
-                    test_end = end_angle
-                    if test_end < start_angle:
-                        test_end += 2 * math.pi
+                i = _segment_index(angle, ends)
+                if i is not None:
+                    # Fill with full blocks (no half-blocks to avoid gaps)
+                    canvas[y][x] = '█'
+                    canvas_colors[y][x] = colors[i]
 
-                    # Now simple comparison works
-                    in_segment = (start_angle <= test_angle <= test_end)
 
-                    if in_segment:
-                        # Fill with full blocks (no half-blocks to avoid gaps)
-                        canvas[y][x] = '█'
-                        canvas_colors[y][x] = colors[i]
-                        break
+def draw_pie_blocks(canvas, canvas_colors, cx, cy, radius_x, radius_y, angles, colors):
+    """Draw pie chart using full-block characters with aspect ratio correction."""
+    _fill_pie(canvas, canvas_colors, cx, cy, _BLOCK_X_SCALE, radius_y, angles, colors)
 
 
 def draw_pie_braille(canvas, canvas_colors, cx, cy, radius_x, radius_y, angles, colors):
     """Draw pie chart using Braille characters for smoother edges with aspect correction."""
-    # First pass: draw filled segments
-    for y in range(len(canvas)):
-        for x in range(len(canvas[0])):
-            dx = (x - cx) / 1.8  # Compress horizontal since we stretched canvas
-            dy = y - cy          # Normal vertical
-            dist = math.sqrt(dx * dx + dy * dy)
-
-            if dist <= radius_y:  # Fill entire circle
-                angle = math.atan2(dy, dx)
-
-                for i, (start_angle, end_angle) in enumerate(angles):
-                    # Normalize angle to be in the same range as our segments
-                    test_angle = angle
-                    if test_angle < start_angle:
-                        test_angle += 2 * math.pi
-
-                    # Also check if end wrapped around
-                    test_end = end_angle
-                    if test_end < start_angle:
-                        test_end += 2 * math.pi
+    braille_base = 0x2800
+    ends = [end_angle for _, end_angle in angles]
+    height = len(canvas)
+    width = len(canvas[0])
+    sqrt, atan2 = math.sqrt, math.atan2  # Local lookups in the per-cell loop
+    inner_radius = radius_y - 1.0
+    outer_radius = radius_y + 0.9
+
+    # Horizontal offsets depend only on the column, so they are computed once per
+    # chart: for the fill, for the edge ring and for the two Braille dot columns
+    columns = range(width)
+    fill_dxs = [(x - cx) / _BRAILLE_FILL_X_SCALE for x in columns]  # Compress horizontal since we stretched canvas
+    ring_dxs = [(x - cx) / _BRAILLE_RING_X_SCALE for x in columns]
+    dot_dxs = [((x - cx) / _BRAILLE_DOT_X_SCALE, (x + 0.5 - cx) / _BRAILLE_DOT_X_SCALE) for x in columns]
+
+    # Single pass: cells inside the circle are filled with solid blocks, and the
+    # cells left empty around its rim get Braille edges for aesthetic effect
+    for y in range(height):
+        dy = y - cy
+        if abs(dy) > outer_radius:
+            continue
+        dy2 = dy * dy
+        dot_dys = [y + sub_y * 0.25 - cy for sub_y in range(4)]
 
-                    # Now simple comparison works
-                    in_segment = (start_angle <= test_angle <= test_end)
+        # The edge ring reaches further out than the fill, so its span (padded
+        # by one for rounding) covers every cell this row can draw
+        half_span = sqrt(outer_radius * outer_radius - dy2) * _BRAILLE_RING_X_SCALE
 
-                    if in_segment:
-                        # Fill with solid blocks
-                        canvas[y][x] = '█'
-                        canvas_colors[y][x] = colors[i]
-                        break
+        for x in range(max(0, int(cx - half_span) - 1), min(width, int(cx + half_span) + 2)):
+            dx = fill_dxs[x]
+            dist = sqrt(dx * dx + dy2)
 
-    # Second pass: Add Braille edges for aesthetic effect
-    braille_base = 0x2800
-    for y in range(len(canvas)):
-        for x in range(len(canvas[0])):
-            # Only process edge positions that are empty
-            if canvas[y][x] != ' ':
-                continue
+            if dist <= radius_y:  # Fill entire circle
+                i = _segment_index(atan2(dy, dx), ends)
+                if i is not None:
+                    # Fill with solid blocks
+                    canvas[y][x] = '█'
+                    canvas_colors[y][x] = colors[i]
+                    continue
 
             # Check if this position is near the edge of the circle
-            dx = (x - cx) / 1.85
-            dy = y - cy
-            dist = math.sqrt(dx * dx + dy * dy)
+            dx = ring_dxs[x]
+            dist = sqrt(dx * dx + dy2)
 
             # Only process points near the edge
-            if radius_y - 1.0 <= dist <= radius_y + 0.9:
+            if inner_radius <= dist <= outer_radius:
                 # Build Braille pattern for this position
                 pattern = 0
                 edge_color = None
 
-                # Sample 2x4 sub-positions for Braille
-                for sub_x in range(7):
-                    for sub_y in range(9):
-                        # Calculate sub-position
-                        px = x + sub_x * 0.35
-                        py = y + sub_y * 0.25
-
+                # Sample the cell at its 2x4 Braille dot positions
+                for sub_dx, column_bits in zip(dot_dxs[x], _BRAILLE_DOTS):
+                    for sub_dy, bit in zip(dot_dys, column_bits):
                         # Check distance and angle for this sub-position
-                        sub_dx = (px - cx) / 2.0
-                        sub_dy = py - cy
-                        sub_dist = math.sqrt(sub_dx * sub_dx + sub_dy * sub_dy)
+                        sub_dist = sqrt(sub_dx * sub_dx + sub_dy * sub_dy)
 
                         if sub_dist <= radius_y:
                             # This sub-pixel is inside the circle
-                            angle = math.atan2(sub_dy, sub_dx)
+                            angle = atan2(sub_dy, sub_dx)
 
                             # Find which segment this belongs to
-                            for i, (start_angle, end_angle) in enumerate(angles):
-                                test_angle = angle
-                                if test_angle < start_angle:
-                                    test_angle += 2 * math.pi
-
-                                test_end = end_angle
-                                if test_end < start_angle:
-                                    test_end += 2.6 * math.pi
-
-                                if start_angle <= test_angle <= test_end:
-                                    # Set the Braille dot
-                                    if sub_x == 0:
-                                        if sub_y == 0:
-                                            pattern |= 0x01
-                                        elif sub_y == 1:
-                                            pattern |= 0x02
-                                        elif sub_y == 2:
-                                            pattern |= 0x04
-                                        elif sub_y == 3:
-                                            pattern |= 0x40
-                                    else:
-                                        if sub_y == 0:
-                                            pattern |= 0x08
-                                        elif sub_y == 1:
-                                            pattern |= 0x10
-                                        elif sub_y == 2:
-                                            pattern |= 0x20
-                                        elif sub_y == 3:
-                                            pattern |= 0x80
-                                    edge_color = colors[i]
-                                    break
+                            i = _segment_index(angle, ends)
+                            if i is not None:
+                                # Set the Braille dot
+                                pattern |= bit
+                                edge_color = colors[i]
 
                 # Place the Braille character if we have a pattern
                 if pattern > 0 and edge_color:
@@ -324,43 +353,30 @@ def generate_colors(
         return custom_colors[:n]
 
     if scheme == "distinct":
-        # Distinct colors that work well together
-        palette = [
-            (26, 188, 156),   # Turquoise
-            (52, 152, 219),   # Blue
-            (155, 89, 182),   # Purple
-            (231, 76, 60),    # Red
-            (230, 126, 34),   # Orange
-            (241, 196, 15),   # Yellow
-            (46, 204, 113),   # Green
-            (149, 165, 166),  # Gray
-            (52, 73, 94),     # Dark blue
-            (192, 57, 43),    # Dark red
-        ]
-        return palette[:n] if n <= len(palette) else palette * (n // len(palette) + 1)[:n]
+        # Repeat the palette when there are more segments than colors
+        repeats = -(-n // len(_DISTINCT_PALETTE))
+        return list(_DISTINCT_PALETTE * repeats)[:n]
 
     elif scheme == "gradient":
         # Rainbow gradient
-        colors = []
-        for i in range(n):
-            hue = i / n
-            r, g, b = hsv_to_rgb(hue, 1.0, 1.0)
-            colors.append((int(r * 255), int(g * 255), int(b * 255)))
-        return colors
+        return _hue_palette(n, 1.0, 1.0)
 
     elif scheme == "pastel":
         # Pastel colors
-        colors = []
-        for i in range(n):
-            hue = i / n
-            r, g, b = hsv_to_rgb(hue, 0.5, 0.95)
-            colors.append((int(r * 255), int(g * 255), int(b * 255)))
-        return colors
+        return _hue_palette(n, 0.5, 0.95)
 
     else:
         return generate_colors(n, "distinct")
 
 
+def _hue_palette(n: int, saturation: float, value: float) -> List[Tuple[int, int, int]]:
+    """n colors evenly spaced around the hue wheel."""
+    return [
+        (int(r * 255), int(g * 255), int(b * 255))
+        for r, g, b in (hsv_to_rgb(i / n, saturation, value) for i in range(n))
+    ]
+
+
 def hsv_to_rgb(h: float, s: float, v: float) -> Tuple[float, float, float]:
     """Convert HSV to RGB color space."""
     i = int(h * 6)
@@ -410,21 +426,28 @@ def extract_pie_data(results: List[Dict[str, Any]]) -> Tuple[List[float], List[s
     elif not value_col and len(keys) >= 1:
         value_col = keys[0]
 
-    labels = []
+    labels = [str(row.get(label_col, "Unknown")) for row in results] if label_col else []
     values = []
 
-    for row in results:
-        if label_col:
-            labels.append(str(row.get(label_col, "Unknown")))
-        if value_col:
-            try:
-                values.append(float(row.get(value_col, 0)))
-            except (ValueError, TypeError):
-                values.append(0)
+    if value_col:
+        raw_values = [row.get(value_col, 0) for row in results]
+        try:
+            # Numeric columns convert in one pass
+            values = list(map(float, raw_values))
+        except (ValueError, TypeError):
+            values = [_to_float(value) for value in raw_values]
 
     return values, labels
 
 
+def _to_float(value: Any) -> float:
+    """Convert a value to float, treating non-numeric values as 0."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0
+
+
 if __name__ == "__main__":
     # Test the pie chart
     print("Pie Chart Examples")
@@ -8,8 +8,9 @@ import sys
 import re
 import json
 import glob
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import redirect_stdout
 
 from textual import events
@@ -25,14 +26,183 @@ from rich.ansi import AnsiDecoder
 
 import duckdb
 import plotext as plt
+
+# orjson is an optional speedup for parsing large analysis files
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 from .main import (
-    load_config, execute_query, extract_chart_data, 
+    load_config, execute_query, refresh_database, extract_chart_data, 
     render_chart, parse_interval, render_single_series,
     group_by_color, get_color_for_series, hex_to_rgb,
     render_termgraph
 )
 
 
+CHART_TYPE_ICONS = {
+    'line': '📈',
+    'bar': '📊',
+    'scatter': '🔵',
+    'histogram': '📊',
+    'figlet': '🔤',
+    'rich_table': '📋',
+    'tg_calendar': '📅',
+    'tg_bar': '▬',
+    'tg_multi': '▬▬',
+    'tg_stacked': '▬▬▬',
+    'tg_histogram': '▬📊',
+    'matrix_heatmap': '🔥',
+    'waffle': '⬛',
+    'pie': '🥧',
+}
+
+CHART_TYPE_LABELS = {
+    'line': 'Line Charts',
+    'bar': 'Bar Charts',
+    'scatter': 'Scatter Plots',
+    'histogram': 'Histograms',
+    'figlet': 'Large Display',
+    'rich_table': 'Data Tables',
+    'tg_calendar': 'Calendar Heatmaps',
+    'tg_bar': 'Termgraph Bars',
+    'tg_multi': 'Multi-Series',
+    'tg_stacked': 'Stacked Charts',
+    'tg_histogram': 'TG Histograms',
+    'matrix_heatmap': 'Matrix Heatmaps',
+    'waffle': 'Waffle Charts',
+    'pie': 'Pie Charts',
+}
+
+# Grouped suggestions per analysis file: path -> (mtime, grouped)
+_grouped_cache: Dict[str, Any] = {}
+
+# Many suggestions of a table share one query (e.g. the bar, pie and waffle views of
+# a COUNT(*) by dimension), so results of recently browsed suggestions are kept
+SUGGESTION_RESULT_CACHE_SIZE = 16
+
+
+def _prepare_grouped(analysis_data: Dict[str, Any], analysis_file: str) -> Dict[str, Any]:
+    """Shape an analysis file into the labels and node data shown in the suggestions tree."""
+    # Get database info
+    db_info = analysis_data.get('database', {})
+    if not db_info:
+        # Handle older format
+        db_info = {'type': analysis_data.get('db_type', 'unknown')}
+    
+    # Determine database identifier for switching
+    db_identifier = None
+    db_name_display = "Unknown"
+    is_http = False
+    
+    # Check if this is an HTTP-based analysis
+    if 'url' in db_info:
+        # This is an HTTP URL analysis
+        db_identifier = db_info['url']
+        is_http = True
+        # Show shortened URL for display
+        from urllib.parse import urlparse
+        parsed = urlparse(db_info['url'])
+        db_name_display = f"📡 {parsed.netloc}/{Path(parsed.path).name}"
+    elif 'name' in db_info:
+        # Named database from config
+        db_identifier = db_info['name']
+        db_name_display = db_info['name']
+    elif 'path' in db_info:
+        # File-based database
+        db_identifier = db_info['path']
+        db_name_display = Path(db_info['path']).stem
+    else:
+        # Try to infer from filename
+        db_name_display = Path(analysis_file).stem.replace('.cheshire_analysis_', '')
+    
+    # Process tables and their recommendations
+    tables = []
+    for table_name, table_data in analysis_data.get('tables', {}).items():
+        recommendations = table_data.get('recommended_charts', [])
+        if not recommendations:
+            continue
+        
+        # Group recommendations by chart type
+        chart_type_groups = {}
+        for rec in recommendations:
+            chart_type = rec.get('chart_type', 'unknown')
+            if chart_type not in chart_type_groups:
+                chart_type_groups[chart_type] = []
+            chart_type_groups[chart_type].append(rec)
+        
+        chart_types = []
+        for chart_type, recs in sorted(chart_type_groups.items()):
+            # Create chart type label with icon
+            icon = CHART_TYPE_ICONS.get(chart_type, '📊')
+            type_label = CHART_TYPE_LABELS.get(chart_type, chart_type.title())
+            
+            # Add individual chart recommendations (sorted by score)
+            suggestions = []
+            for rec in sorted(recs, key=lambda x: x.get('score', 0), reverse=True):
+                title = rec.get('title', 'Untitled')
+                description = rec.get('description', '')
+                score = rec.get('score', 0)
+                
+                # For HTTP sources, remove the long table reference from title
+                if is_http and 'read_' in title:
+                    # Remove the read_csv_auto/read_parquet function reference
+                    title = re.sub(r"read_\w+\([^)]+\):\s*", "", title)
+                    title = re.sub(r"read_\w+\([^)]+\)", "Data", title)
+                
+                # Simplify the title for display - remove table name prefix
+                simple_title = title
+                for prefix in [f'{table_name}: ', f'{table_name} ', 'remote_data: ', 'remote_data ']:
+                    if simple_title.startswith(prefix):
+                        simple_title = simple_title[len(prefix):]
+                        break
+                
+                # Use description if available, otherwise use simplified title
+                if description:
+                    label = f"{description} [{score:.1f}]"
+                else:
+                    label = f"{simple_title} [{score:.1f}]"
+                
+                # Store the full recommendation data including database info
+                suggestions.append((label, {
+                    "type": "suggestion",
+                    "sql": rec.get('sql', ''),
+                    "chart_type": chart_type,
+                    "title": title,
+                    "table": table_name,
+                    "db_identifier": db_identifier,
+                    "db_info": db_info,
+                    "is_http": is_http
+                }))
+            
+            chart_types.append((chart_type, f"{icon} {type_label} ({len(recs)})", suggestions))
+        
+        tables.append((table_name, chart_types))
+    
+    return {
+        'db_identifier': db_identifier,
+        'db_name_display': db_name_display,
+        'db_info': db_info,
+        'is_http': is_http,
+        'tables': tables,
+    }
+
+
+def _load_grouped(analysis_file: str) -> Dict[str, Any]:
+    """Load and group an analysis file, reusing the previous result while the file is unchanged."""
+    key = os.path.getmtime(analysis_file)
+    cached = _grouped_cache.get(analysis_file)
+    if cached and cached[0] == key:
+        return cached[1]
+    
+    with open(analysis_file, 'rb') as f:
+        analysis_data = _json_loads(f.read())
+    grouped = _prepare_grouped(analysis_data, analysis_file)
+    _grouped_cache[analysis_file] = (key, grouped)
+    return grouped
+
+
 class ChartPreview(RichLog):
     """Widget to display chart preview or status messages with ANSI support."""
     
@@ -312,6 +482,8 @@ class cheshireTUI(App):
                 self.db_path = 'example.duckdb'
         
         self.last_command = ""
+        # (database, sql) -> rows for recently browsed suggestions, oldest first
+        self._suggestion_results: "OrderedDict[Tuple[str, str], List[Dict[str, Any]]]" = OrderedDict()
         
     def compose(self) -> ComposeResult:
         """Create child widgets."""
@@ -654,8 +826,12 @@ ORDER BY date"""
         # Replace ' with '\'' (end quote, escaped quote, start quote)
         return cmd.replace("'", "'\\''")
     
-    def run_query(self) -> None:
-        """Execute the query and display results."""
+    def run_query(self, reuse_results: bool = False) -> None:
+        """Execute the query and display results.
+        
+        With reuse_results, rows fetched for the same database and query by a
+        recently browsed suggestion are shown instead of running the query again.
+        """
         try:
             # Get inputs
             sql_input = self.query_one("#sql-input", TextArea)
@@ -758,7 +934,7 @@ ORDER BY date"""
             command_display_single.update(f"[bold yellow]{escaped_single}[/bold yellow]")
             
             # Execute query with the selected database
-            results = execute_query(query, db_identifier, self.config)
+            results = self._fetch_results(query, db_identifier, db_path, reuse_results)
             if not results:
                 self.update_preview("No results returned from query")
                 return
@@ -928,6 +1104,24 @@ ORDER BY date"""
         except Exception as e:
             self.update_preview(f"[bold red]Error:[/bold red] {str(e)}")
     
+    def _fetch_results(self, query: str, db_identifier: Any, db_path: str,
+                       reuse_results: bool) -> List[Dict[str, Any]]:
+        """Run a query, reusing the rows of a recently browsed suggestion if allowed."""
+        if not reuse_results:
+            return execute_query(query, db_identifier, self.config)
+        
+        key = (db_path, query)
+        results = self._suggestion_results.get(key)
+        if results is not None:
+            self._suggestion_results.move_to_end(key)
+            return results
+        
+        results = execute_query(query, db_identifier, self.config)
+        self._suggestion_results[key] = results
+        if len(self._suggestion_results) > SUGGESTION_RESULT_CACHE_SIZE:
+            self._suggestion_results.popitem(last=False)
+        return results
+    
     def render_chart_to_string(self, chart_type: str, x_values: List, y_values: List, 
                                color_values: Optional[List], title: Optional[str], 
                                default_color: Optional[str] = None) -> str:
@@ -1346,6 +1540,9 @@ ORDER BY date"""
             else:
                 tables_query = "SHOW TABLES"
             
+            # Pick up tables and columns created since the schema was last loaded
+            refresh_database(db_identifier, self.config)
+            
             # Execute query to get tables
             tables = execute_query(tables_query, db_identifier, self.config)
             
@@ -1372,13 +1569,11 @@ ORDER BY date"""
                 
                 # Get columns for this table
                 try:
-                    if db_type == 'duckdb':
+                    if db_type in ['duckdb', 'sqlite']:
+                        # SQLite is attached to DuckDB, which describes its tables natively
                         columns_query = f"DESCRIBE {table_name}"
                     elif db_type in ['postgres', 'mysql']:
                         columns_query = f"SELECT column_name, data_type FROM information_schema.columns WHERE table_name = '{table_name}'"
-                    elif db_type == 'sqlite':
-                        # For SQLite via DuckDB, the connector handles the schema
-                        columns_query = f"PRAGMA table_info({table_name})"
                     elif db_type == 'clickhouse':
                         columns_query = f"DESCRIBE TABLE {table_name}"
                     else:
@@ -1450,157 +1645,39 @@ ORDER BY date"""
             total_suggestions = 0
             for analysis_file in sorted(analysis_files):
                 try:
-                    with open(analysis_file, 'r') as f:
-                        analysis_data = json.load(f)
-                    
-                    # Get database info
-                    db_info = analysis_data.get('database', {})
-                    if not db_info:
-                        # Handle older format
-                        db_info = {'type': analysis_data.get('db_type', 'unknown')}
-                    
-                    # Determine database identifier for switching
-                    db_identifier = None
-                    db_name_display = "Unknown"
-                    is_http = False
-                    
-                    # Check if this is an HTTP-based analysis
-                    if 'url' in db_info:
-                        # This is an HTTP URL analysis
-                        db_identifier = db_info['url']
-                        is_http = True
-                        # Show shortened URL for display
-                        from urllib.parse import urlparse
-                        parsed = urlparse(db_info['url'])
-                        db_name_display = f"📡 {parsed.netloc}/{Path(parsed.path).name}"
-                    elif 'name' in db_info:
-                        # Named database from config
-                        db_identifier = db_info['name']
-                        db_name_display = db_info['name']
-                    elif 'path' in db_info:
-                        # File-based database
-                        db_identifier = db_info['path']
-                        db_name_display = Path(db_info['path']).stem
-                    else:
-                        # Try to infer from filename
-                        db_name_display = Path(analysis_file).stem.replace('.cheshire_analysis_', '')
-                    
-                    # Add database node
-                    db_node = tree.root.add(f"🗄️ {db_name_display}", data={
-                        "type": "database",
-                        "db_identifier": db_identifier,
-                        "db_info": db_info,
-                        "is_http": is_http
-                    })
-                    
-                    # Process tables and their recommendations
-                    tables = analysis_data.get('tables', {})
-                    if not tables:
-                        db_node.add_leaf("[dim]No recommendations[/dim]")
-                        continue
-                    
-                    for table_name, table_data in tables.items():
-                        recommendations = table_data.get('recommended_charts', [])
-                        if recommendations:
-                            # Add table node under database
-                            table_node = db_node.add(
-                                f"📋 {table_name}",
-                                data={"name": table_name, "type": "table"}
-                            )
-                            
-                            # Group recommendations by chart type
-                            chart_type_groups = {}
-                            for rec in recommendations:
-                                chart_type = rec.get('chart_type', 'unknown')
-                                if chart_type not in chart_type_groups:
-                                    chart_type_groups[chart_type] = []
-                                chart_type_groups[chart_type].append(rec)
-                            
-                            # Add chart type nodes
-                            for chart_type, recs in sorted(chart_type_groups.items()):
-                                # Create chart type label with icon
-                                icon = {
-                                    'line': '📈',
-                                    'bar': '📊',
-                                    'scatter': '🔵',
-                                    'histogram': '📊',
-                                    'figlet': '🔤',
-                                    'rich_table': '📋',
-                                    'tg_calendar': '📅',
-                                    'tg_bar': '▬',
-                                    'tg_multi': '▬▬',
-                                    'tg_stacked': '▬▬▬',
-                                    'tg_histogram': '▬📊',
-                                    'matrix_heatmap': '🔥',
-                                    'waffle': '⬛',
-                                    'pie': '🥧',
-                                }.get(chart_type, '📊')
-                                
-                                chart_type_label = {
-                                    'line': 'Line Charts',
-                                    'bar': 'Bar Charts',
-                                    'scatter': 'Scatter Plots',
-                                    'histogram': 'Histograms',
-                                    'figlet': 'Large Display',
-                                    'rich_table': 'Data Tables',
-                                    'tg_calendar': 'Calendar Heatmaps',
-                                    'tg_bar': 'Termgraph Bars',
-                                    'tg_multi': 'Multi-Series',
-                                    'tg_stacked': 'Stacked Charts',
-                                    'tg_histogram': 'TG Histograms',
-                                    'matrix_heatmap': 'Matrix Heatmaps',
-                                    'waffle': 'Waffle Charts',
-                                    'pie': 'Pie Charts',
-                                }.get(chart_type, chart_type.title())
-                                
-                                chart_type_node = table_node.add(
-                                    f"{icon} {chart_type_label} ({len(recs)})",
-                                    data={"type": "chart_type", "chart_type": chart_type}
-                                )
-                                
-                                # Add individual chart recommendations (sorted by score)
-                                for i, rec in enumerate(sorted(recs, key=lambda x: x.get('score', 0), reverse=True)):
-                                    title = rec.get('title', 'Untitled')
-                                    description = rec.get('description', '')
-                                    score = rec.get('score', 0)
-                                    total_suggestions += 1
-                                    
-                                    # For HTTP sources, remove the long table reference from title
-                                    if is_http and 'read_' in title:
-                                        # Remove the read_csv_auto/read_parquet function reference
-                                        import re
-                                        title = re.sub(r"read_\w+\([^)]+\):\s*", "", title)
-                                        title = re.sub(r"read_\w+\([^)]+\)", "Data", title)
-                                    
-                                    # Simplify the title for display - remove table name prefix
-                                    simple_title = title
-                                    for prefix in [f'{table_name}: ', f'{table_name} ', 'remote_data: ', 'remote_data ']:
-                                        if simple_title.startswith(prefix):
-                                            simple_title = simple_title[len(prefix):]
-                                            break
-                                    
-                                    # Use description if available, otherwise use simplified title
-                                    if description:
-                                        label = f"{description} [{score:.1f}]"
-                                    else:
-                                        label = f"{simple_title} [{score:.1f}]"
-                                    
-                                    # Store the full recommendation data including database info
-                                    chart_type_node.add_leaf(label, data={
-                                        "type": "suggestion",
-                                        "sql": rec.get('sql', ''),
-                                        "chart_type": chart_type,
-                                        "title": title,
-                                        "table": table_name,
-                                        "db_identifier": db_identifier,
-                                        "db_info": db_info,
-                                        "is_http": is_http
-                                    })
-                
+                    grouped = _load_grouped(analysis_file)
                 except Exception as e:
                     # Skip files that fail to load silently
                     # Only show actual errors, not warnings
                     continue
+                
+                # Add database node
+                db_node = tree.root.add(f"🗄️ {grouped['db_name_display']}", data={
+                    "type": "database",
+                    "db_identifier": grouped['db_identifier'],
+                    "db_info": grouped['db_info'],
+                    "is_http": grouped['is_http']
+                })
+                
+                if not grouped['tables']:
+                    db_node.add_leaf("[dim]No recommendations[/dim]")
+                    continue
+                
+                for table_name, chart_types in grouped['tables']:
+                    # Add table node under database
+                    table_node = db_node.add(
+                        f"📋 {table_name}",
+                        data={"name": table_name, "type": "table"}
+                    )
+                    
+                    for chart_type, chart_type_label, suggestions in chart_types:
+                        chart_type_node = table_node.add(
+                            chart_type_label,
+                            data={"type": "chart_type", "chart_type": chart_type}
+                        )
+                        for label, data in suggestions:
+                            chart_type_node.add_leaf(label, data=data)
+                        total_suggestions += len(suggestions)
             
             # Expand only to database level by default (to keep it manageable)
             tree.root.expand()
@@ -1664,7 +1741,6 @@ ORDER BY date"""
                 
                 # Reload the schema for the new database
                 # Skip schema loading for CSV/TSV files (they don't have schemas)
-                db_info = node.data.get('db_info', {})
                 if db_info.get('type') not in ['csv', 'tsv']:
                     self.load_database_schema()
             
@@ -1685,8 +1761,8 @@ ORDER BY date"""
             # Show notification
             # Silenced: self.notify(f"Loaded suggestion: {node.data.get('title', 'Chart')}", severity="success")
             
-            # Auto-run the query
-            self.run_query()
+            # Auto-run the query (suggestions sharing a query reuse its rows)
+            self.run_query(reuse_results=True)
             
             # Return focus to SQL editor
             sql_input.focus()
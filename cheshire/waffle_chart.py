@@ -6,6 +6,30 @@ Perfect for showing proportions, parts-of-whole, and percentages.
 
 from typing import List, Dict, Any, Optional, Tuple
 import math
+import re
+from operator import itemgetter
+
+# ANSI escape fragments shared by all renderers
+_ANSI_RESET = "\033[0m"
+_ANSI_DIM = "\033[90m"
+_ANSI_BOLD = "\033[1m"
+_FG_PREFIX = "\033[38;2;"
+
+# Column name hints used to detect label/value columns in query results
+_LABEL_COL_RE = re.compile(r'name|label|category|type|group')
+_VALUE_COL_RE = re.compile(r'value|count|sum|total|amount')
+
+# (threshold, divisor, suffix) pairs for compact legend values, largest first
+_HUMANIZE_UNITS = ((1000000, 1000000.0, "M"), (1000, 1000.0, "K"))
+
+
+def _humanize(value: float) -> str:
+    """Format a value compactly (e.g. 1.5M, 2.3K, 950)."""
+    for threshold, divisor, suffix in _HUMANIZE_UNITS:
+        if value >= threshold:
+            return f"{value / divisor:.1f}{suffix}"
+    return f"{value:,.0f}"
+
 
 def render_waffle_chart(
     values: List[float],
@@ -85,12 +109,16 @@ def render_waffle_chart(
     
     # Title
     if title:
-        lines.append(f"\033[1m{title}\033[0m")
+        lines.append(f"{_ANSI_BOLD}{title}{_ANSI_RESET}")
         lines.append("")
     
     # Calculate rows
     num_rows = math.ceil(total_cells / cells_per_row)
     
+    # Build each series' colored cell once; index -1 is the empty cell
+    colored_cells = [f"{_FG_PREFIX}{r};{g};{b}m{cell_char}{_ANSI_RESET}" for r, g, b in colors]
+    empty_cell = f"{_ANSI_DIM}{empty_char}{_ANSI_RESET}"
+    
     # Draw waffle
     for row in range(num_rows):
         row_chars = []
@@ -98,13 +126,7 @@ def render_waffle_chart(
             idx = row * cells_per_row + col
             if idx < len(cells):
                 cell_value = cells[idx]
-                if cell_value == -1:
-                    # Empty cell
-                    row_chars.append(f"\033[90m{empty_char}\033[0m")
-                else:
-                    # Colored cell
-                    r, g, b = colors[cell_value]
-                    row_chars.append(f"\033[38;2;{r};{g};{b}m{cell_char}\033[0m")
+                row_chars.append(empty_cell if cell_value == -1 else colored_cells[cell_value])
             else:
                 # Beyond total cells
                 row_chars.append(" ")
@@ -116,25 +138,19 @@ def render_waffle_chart(
         lines.append("")
         lines.append("─" * (cells_per_row * 2 - 1))
         
+        inv_total_pct = 100.0 / total
         for i, (label, value, count) in enumerate(zip(labels, values, cell_counts)):
             if count > 0:
-                r, g, b = colors[i]
-                percentage = value / total * 100
+                percentage = value * inv_total_pct
                 
-                legend_parts = [f"\033[38;2;{r};{g};{b}m{cell_char}\033[0m"]
+                legend_parts = [colored_cells[i]]
                 legend_parts.append(f"{label}")
                 
                 if show_percentages:
                     legend_parts.append(f"({percentage:.1f}%)")
                 
                 # Add actual value
-                if value >= 1000000:
-                    value_str = f"{value/1000000:.1f}M"
-                elif value >= 1000:
-                    value_str = f"{value/1000:.1f}K"
-                else:
-                    value_str = f"{value:,.0f}"
-                legend_parts.append(f"= {value_str}")
+                legend_parts.append(f"= {_humanize(value)}")
                 
                 lines.append(" ".join(legend_parts))
     
@@ -248,18 +264,17 @@ def render_progress_waffle(
     
     # Title
     if title:
-        lines.append(f"\033[1m{title}\033[0m")
+        lines.append(f"{_ANSI_BOLD}{title}{_ANSI_RESET}")
     
-    # Progress bar
-    for row in range(height):
-        row_chars = []
-        for col in range(width):
-            idx = row * width + col
-            if idx < filled_cells:
-                row_chars.append(f"\033[38;2;{r};{g};{b}m{filled_char}\033[0m")
-            else:
-                row_chars.append(f"\033[90m{empty_char}\033[0m")
-        lines.append("".join(row_chars))
+    filled = f"{_FG_PREFIX}{r};{g};{b}m{filled_char}{_ANSI_RESET}"
+    empty = f"{_ANSI_DIM}{empty_char}{_ANSI_RESET}"
+    
+    # Progress bar: full rows, at most one partially filled row, then empty rows
+    full_rows, remainder = divmod(filled_cells, width)
+    lines.extend([filled * width] * full_rows)
+    if remainder:
+        lines.append(filled * remainder + empty * (width - remainder))
+    lines.extend([empty * width] * (height - full_rows - (1 if remainder else 0)))
     
     # Stats
     lines.append("")
@@ -283,10 +298,12 @@ def extract_waffle_data(results: List[Dict[str, Any]]) -> Tuple[List[float], Lis
     # Look for appropriate columns
     for key in keys:
         key_lower = key.lower()
-        if not label_col and any(word in key_lower for word in ['name', 'label', 'category', 'type', 'group']):
+        if not label_col and _LABEL_COL_RE.search(key_lower):
             label_col = key
-        elif not value_col and any(word in key_lower for word in ['value', 'count', 'sum', 'total', 'amount']):
+        elif not value_col and _VALUE_COL_RE.search(key_lower):
             value_col = key
+        if label_col and value_col:
+            break
     
     # Fallback to first two columns
     if not label_col and len(keys) >= 1:
@@ -299,15 +316,20 @@ def extract_waffle_data(results: List[Dict[str, Any]]) -> Tuple[List[float], Lis
     # Extract data
     labels = []
     values = []
+    if not label_col or not value_col:
+        return values, labels
     
+    get_pair = itemgetter(label_col, value_col)
     for row in results:
-        if label_col:
-            labels.append(str(row.get(label_col, "Unknown")))
-        if value_col:
-            try:
-                values.append(float(row.get(value_col, 0)))
-            except (ValueError, TypeError):
-                values.append(0)
+        try:
+            label, value = get_pair(row)
+        except KeyError:
+            label, value = row.get(label_col, "Unknown"), row.get(value_col, 0)
+        labels.append(str(label))
+        try:
+            values.append(float(value))
+        except (ValueError, TypeError):
+            values.append(0)
     
     return values, labels
 
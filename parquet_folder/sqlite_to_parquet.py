@@ -1,30 +1,53 @@
 #!/usr/bin/env python3
-import sqlite3
-import pandas as pd
-import pyarrow.parquet as pq
+import duckdb
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Most tables exported at once; DuckDB releases the GIL while a COPY runs
+MAX_WORKERS = 8
+
+def sql_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
 
 def export_sqlite_to_parquet(db_path):
-    conn = sqlite3.connect(db_path)
-    
+    # DuckDB reads the SQLite file through sqlite_scanner and streams each
+    # table straight into its Parquet writer, no DataFrame in between
+    conn = duckdb.connect()
+    try:
+        conn.execute("LOAD sqlite_scanner")
+    except duckdb.Error:
+        conn.execute("INSTALL sqlite_scanner; LOAD sqlite_scanner;")
+    conn.execute(f"ATTACH {sql_literal(db_path)} AS s (TYPE sqlite, READ_ONLY)")
+
     # Get all table names
-    tables = pd.read_sql_query(
-        "SELECT name FROM sqlite_master WHERE type='table';", conn
-    )
-    
-    for table_name in tables['name']:
-        print(f"Exporting {table_name}...")
-        df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-        df.to_parquet(f"{table_name}.parquet", engine='pyarrow')
-        print(f"✓ Saved {table_name}.parquet")
-    
+    tables = conn.execute(
+        "SELECT table_name FROM information_schema.tables "
+        "WHERE table_catalog = 's' AND table_type = 'BASE TABLE'"
+    ).fetchall()
+
+    def export_table(table_name):
+        # Cursors share the attached database but run their COPY independently
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"COPY s.{quote_identifier(table_name)} TO {sql_literal(table_name + '.parquet')} "
+                "(FORMAT PARQUET, COMPRESSION zstd, COMPRESSION_LEVEL 3, ROW_GROUP_SIZE 128000)"
+            )
+        return table_name
+
+    print(f"Exporting {len(tables)} tables...")
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(tables)))) as executor:
+        futures = [executor.submit(export_table, table_name) for (table_name,) in tables]
+        for future in as_completed(futures):
+            print(f"✓ Saved {future.result()}.parquet")
+
     conn.close()
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
         print("Usage: python sqlite_to_parquet.py <database.db>")
         sys.exit(1)
-    
-    export_sqlite_to_parquet(sys.argv[1])
-
 
+    export_sqlite_to_parquet(sys.argv[1])
@@ -5,8 +5,14 @@ import tempfile
 import os
 import json
 import csv
+import importlib
+import re
 from pathlib import Path
 
+# ESC-prefixed control sequences (CSI and two-character escapes), compiled once
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_ANSI_BYTES_RE = re.compile(_ANSI_RE.pattern.encode())
+
 
 @pytest.fixture
 def temp_dir():
@@ -15,10 +21,24 @@ def temp_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture
-def sample_csv_file(temp_dir):
+@pytest.fixture(scope="session")
+def cheshire_main():
+    """Import cheshire.main (and duckdb, rich, pyfiglet with it) once per session."""
+    # The package re-exports the main() command under the same name, so import
+    # the submodule by path rather than with "from cheshire import main"
+    return importlib.import_module('cheshire.main')
+
+
+@pytest.fixture(scope="session")
+def data_dir(tmp_path_factory):
+    """Directory for the sample data files, shared by the whole test session."""
+    return tmp_path_factory.mktemp("data")
+
+
+@pytest.fixture(scope="session")
+def sample_csv_file(data_dir):
     """Create a sample CSV file for testing."""
-    csv_path = temp_dir / "test_data.csv"
+    csv_path = data_dir / "test_data.csv"
     data = [
         ["name", "value", "category"],
         ["Alice", "100", "A"],
@@ -32,10 +52,10 @@ def sample_csv_file(temp_dir):
     return str(csv_path)
 
 
-@pytest.fixture
-def sample_tsv_file(temp_dir):
+@pytest.fixture(scope="session")
+def sample_tsv_file(data_dir):
     """Create a sample TSV file for testing."""
-    tsv_path = temp_dir / "test_data.tsv"
+    tsv_path = data_dir / "test_data.tsv"
     data = [
         ["product", "sales", "region"],
         ["Widget", "1000", "North"],
@@ -49,12 +69,12 @@ def sample_tsv_file(temp_dir):
     return str(tsv_path)
 
 
-@pytest.fixture
-def sample_parquet_file(temp_dir):
+@pytest.fixture(scope="session")
+def sample_parquet_file(data_dir):
     """Create a sample Parquet file for testing."""
     try:
         import duckdb
-        parquet_path = temp_dir / "test_data.parquet"
+        parquet_path = data_dir / "test_data.parquet"
         
         # Create a simple parquet file using DuckDB
         conn = duckdb.connect(':memory:')
@@ -74,11 +94,11 @@ def sample_parquet_file(temp_dir):
         pytest.skip("DuckDB not available")
 
 
-@pytest.fixture
-def sample_sqlite_db(temp_dir):
+@pytest.fixture(scope="session")
+def sample_sqlite_db(data_dir):
     """Create a sample SQLite database for testing."""
     import sqlite3
-    db_path = temp_dir / "test.db"
+    db_path = data_dir / "test.db"
     
     conn = sqlite3.connect(str(db_path))
     cursor = conn.cursor()
@@ -107,6 +127,34 @@ def sample_sqlite_db(temp_dir):
     return str(db_path)
 
 
+@pytest.fixture(scope="module")
+def duckdb_conn():
+    """Provide one in-memory DuckDB connection shared by a test module."""
+    duckdb = pytest.importorskip("duckdb")
+    conn = duckdb.connect(':memory:')
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def sqlite_conn(sample_sqlite_db):
+    """Open the sample SQLite database with disk syncing turned off."""
+    import sqlite3
+    conn = sqlite3.connect(sample_sqlite_db)
+    conn.executescript(
+        "PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY; PRAGMA temp_store=MEMORY;"
+    )
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def standard_figlet():
+    """Load pyfiglet's standard font once per session."""
+    pyfiglet = pytest.importorskip("pyfiglet")
+    return pyfiglet.Figlet(font='standard')
+
+
 @pytest.fixture
 def mock_config_file(temp_dir):
     """Create a mock configuration file."""
@@ -134,7 +182,26 @@ def mock_config_file(temp_dir):
 
 
 def strip_ansi_codes(text):
-    """Remove ANSI escape codes from text for testing."""
-    import re
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
\ No newline at end of file
+    """Remove ANSI escape codes from text (str or raw subprocess bytes) for testing."""
+    if isinstance(text, bytes):
+        if b'\x1b' not in text:
+            return text
+        return _ANSI_BYTES_RE.sub(b'', text)
+    # Plain output (e.g. JSON) has no ESC at all; skip the regex scan for it
+    if '\x1b' not in text:
+        return text
+    return _ANSI_RE.sub('', text)
+
+
+def extract_json_array(text):
+    """Parse the JSON array spanning the first '[' to the last ']' in text.
+
+    text may be str or bytes (json.loads reads UTF-8 bytes directly).
+    Returns None when the text holds no such array.
+    """
+    open_bracket, close_bracket = (b'[', b']') if isinstance(text, bytes) else ('[', ']')
+    start = text.find(open_bracket)
+    end = text.rfind(close_bracket)
+    if start == -1 or end < start:
+        return None
+    return json.loads(text[start:end + 1])
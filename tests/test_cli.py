@@ -3,11 +3,15 @@
 import pytest
 import subprocess
 import json
+import re
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from click.testing import CliRunner
 
+# Every test here launches the cheshire executable in a subprocess
+pytestmark = pytest.mark.slow
+
 
 def test_version_command():
     """Test that --version command works."""
@@ -45,7 +49,6 @@ def test_json_output_format():
             # The output might have ANSI codes, so we need to extract JSON
             output = result.stdout
             # Look for JSON array pattern
-            import re
             json_match = re.search(r'\[.*\]', output, re.DOTALL)
             if json_match:
                 data = json.loads(json_match.group())
@@ -1,19 +1,14 @@
 """Tests for data processing and transformation functions."""
 
 import pytest
-import sys
 import os
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests.conftest import strip_ansi_codes
 
 
-def test_sql_result_to_json():
+def test_sql_result_to_json(cheshire_main):
     """Test converting SQL results to JSON format."""
-    from cheshire.main import main
-    
     # Mock the DuckDB connection and results
     with patch('cheshire.main.duckdb.connect') as mock_connect:
         mock_conn = Mock()
@@ -33,123 +28,85 @@ def test_sql_result_to_json():
         pass
 
 
-def test_csv_data_loading(sample_csv_file):
+def test_csv_data_loading(duckdb_conn, sample_csv_file):
     """Test loading and querying CSV data."""
-    try:
-        import duckdb
-        
-        conn = duckdb.connect(':memory:')
-        
-        # Load CSV file
-        result = conn.execute(f"""
-            SELECT COUNT(*) as count 
-            FROM read_csv_auto('{sample_csv_file}')
-        """).fetchall()
-        
-        assert result[0][0] == 4  # Should have 4 rows
-        
-        # Test column names
-        result = conn.execute(f"""
-            SELECT * 
-            FROM read_csv_auto('{sample_csv_file}')
-            LIMIT 1
-        """)
-        
-        columns = [desc[0] for desc in result.description]
-        assert 'name' in columns
-        assert 'value' in columns
-        assert 'category' in columns
-        
-        conn.close()
-    except ImportError:
-        pytest.skip("DuckDB not available")
+    # Load CSV file
+    result = duckdb_conn.execute(f"""
+        SELECT COUNT(*) as count 
+        FROM read_csv_auto('{sample_csv_file}')
+    """).fetchall()
+    
+    assert result[0][0] == 4  # Should have 4 rows
+    
+    # Test column names (a relation exposes them without fetching any rows)
+    columns = duckdb_conn.sql(f"""
+        SELECT * 
+        FROM read_csv_auto('{sample_csv_file}')
+        LIMIT 1
+    """).columns
+    
+    assert 'name' in columns
+    assert 'value' in columns
+    assert 'category' in columns
 
 
-def test_tsv_data_loading(sample_tsv_file):
+def test_tsv_data_loading(duckdb_conn, sample_tsv_file):
     """Test loading and querying TSV data."""
-    try:
-        import duckdb
-        
-        conn = duckdb.connect(':memory:')
-        
-        # Load TSV file
-        result = conn.execute(f"""
-            SELECT COUNT(*) as count 
-            FROM read_csv_auto('{sample_tsv_file}', delim='\\t')
-        """).fetchall()
-        
-        assert result[0][0] == 4  # Should have 4 rows
-        
-        conn.close()
-    except ImportError:
-        pytest.skip("DuckDB not available")
+    # Load TSV file
+    result = duckdb_conn.execute(f"""
+        SELECT COUNT(*) as count 
+        FROM read_csv_auto('{sample_tsv_file}', delim='\\t')
+    """).fetchall()
+    
+    assert result[0][0] == 4  # Should have 4 rows
 
 
-def test_parquet_data_loading(sample_parquet_file):
+def test_parquet_data_loading(duckdb_conn, sample_parquet_file):
     """Test loading and querying Parquet data."""
-    try:
-        import duckdb
-        
-        conn = duckdb.connect(':memory:')
-        
-        # Load Parquet file
-        result = conn.execute(f"""
-            SELECT COUNT(*) as count 
-            FROM read_parquet('{sample_parquet_file}')
-        """).fetchall()
-        
-        assert result[0][0] == 3  # Should have 3 rows
-        
-        # Test data types
-        result = conn.execute(f"""
-            SELECT item, price, category
-            FROM read_parquet('{sample_parquet_file}')
-            WHERE item = 'Item1'
-        """).fetchall()
-        
-        assert len(result) == 1
-        assert result[0][0] == 'Item1'
-        assert result[0][1] == 10.5
-        assert result[0][2] == 'Category1'
-        
-        conn.close()
-    except ImportError:
-        pytest.skip("DuckDB not available")
+    # Load Parquet file
+    result = duckdb_conn.execute(f"""
+        SELECT COUNT(*) as count 
+        FROM read_parquet('{sample_parquet_file}')
+    """).fetchall()
+    
+    assert result[0][0] == 3  # Should have 3 rows
+    
+    # Test data types
+    result = duckdb_conn.execute(f"""
+        SELECT item, price, category
+        FROM read_parquet('{sample_parquet_file}')
+        WHERE item = 'Item1'
+    """).fetchall()
+    
+    assert len(result) == 1
+    assert result[0][0] == 'Item1'
+    assert result[0][1] == 10.5
+    assert result[0][2] == 'Category1'
 
 
-def test_sqlite_connection(sample_sqlite_db):
+def test_sqlite_connection(sqlite_conn):
     """Test connecting to and querying SQLite database."""
-    try:
-        import sqlite3
-        
-        conn = sqlite3.connect(sample_sqlite_db)
-        cursor = conn.cursor()
-        
-        # Test basic query
-        result = cursor.execute("SELECT COUNT(*) FROM sales").fetchone()
-        assert result[0] == 4
-        
-        # Test aggregation
-        result = cursor.execute("""
-            SELECT product, SUM(amount) as total
-            FROM sales
-            GROUP BY product
-            ORDER BY total DESC
-        """).fetchall()
-        
-        assert len(result) == 3  # 3 unique products
-        assert result[0][0] == 'Product A'  # Most sales
-        assert result[0][1] == 300.0  # Total for Product A
-        
-        conn.close()
-    except ImportError:
-        pytest.skip("SQLite not available")
+    cursor = sqlite_conn.cursor()
+    
+    # Test basic query
+    result = cursor.execute("SELECT COUNT(*) FROM sales").fetchone()
+    assert result[0] == 4
+    
+    # Test aggregation
+    result = cursor.execute("""
+        SELECT product, SUM(amount) as total
+        FROM sales
+        GROUP BY product
+        ORDER BY total DESC
+    """).fetchall()
+    
+    assert len(result) == 3  # 3 unique products
+    assert result[0][0] == 'Product A'  # Most sales
+    assert result[0][1] == 300.0  # Total for Product A
 
 
 def test_ansi_stripping():
     """Test ANSI code stripping utility."""
-    from tests.conftest import strip_ansi_codes
-    
     # Test various ANSI codes
     text_with_ansi = "\x1b[31mRed Text\x1b[0m Normal \x1b[1;32mBold Green\x1b[0m"
     cleaned = strip_ansi_codes(text_with_ansi)
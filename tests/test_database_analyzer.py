@@ -0,0 +1,110 @@
+"""Tests for database analysis and chart recommendations."""
+
+import pytest
+import duckdb
+
+from cheshire.database_analyzer import DatabaseAnalyzer
+
+
+@pytest.fixture
+def duckdb_file(tmp_path):
+    """Create an empty DuckDB database file and return its path."""
+    db_path = str(tmp_path / "analyze.duckdb")
+    duckdb.connect(db_path).close()
+    return db_path
+
+
+def run_sql(db_path, *statements):
+    """Run statements on a DuckDB file with a short-lived writer connection."""
+    conn = duckdb.connect(db_path)
+    for statement in statements:
+        conn.execute(statement)
+    conn.close()
+
+
+def test_cardinality_just_under_limit_is_exact(duckdb_file):
+    """Test that a column with just under 200 values gets its exact cardinality."""
+    # 199 values repeated over 995 rows, which HyperLogLog estimates above 200
+    run_sql(duckdb_file, "CREATE TABLE t AS SELECT range % 199 AS v FROM range(995)")
+    
+    analyzer = DatabaseAnalyzer(duckdb_file, 'duckdb')
+    stats = analyzer._fetch_column_stats('t', [('v', 'BIGINT')], 995)
+    
+    assert stats['v']['distinct_count'] == 199
+
+
+def test_stats_cache_skipped_without_file(tmp_path, monkeypatch):
+    """Test that server databases (no file mtime to fingerprint) are not cached."""
+    monkeypatch.chdir(tmp_path)
+    config = {"type": "postgres", "host": "localhost", "database": "prod"}
+    
+    assert DatabaseAnalyzer(config, 'postgres', 'prod')._stats_cache_path() is None
+
+
+def test_stats_cache_invalidated_by_update(duckdb_file, tmp_path, monkeypatch, capsys):
+    """Test that an UPDATE keeping the row count still refreshes cached stats."""
+    monkeypatch.chdir(tmp_path)
+    run_sql(duckdb_file, "CREATE TABLE t AS SELECT 1 AS v FROM range(100)")
+    
+    first = DatabaseAnalyzer(duckdb_file, 'duckdb').analyze()
+    assert first['t'].columns['v'].cardinality == 1
+    assert list(tmp_path.glob('.cheshire_stats_*.json'))
+    
+    run_sql(duckdb_file, "UPDATE t SET v = rowid")
+    
+    second = DatabaseAnalyzer(duckdb_file, 'duckdb').analyze()
+    assert second['t'].row_count == 100
+    assert second['t'].columns['v'].cardinality > 1
+    assert "Using cached stats" not in capsys.readouterr().out
+
+
+def test_figlet_skips_leading_id_column(duckdb_file, tmp_path, monkeypatch):
+    """Test that figlet totals use a real measure rather than a leading integer id."""
+    monkeypatch.chdir(tmp_path)
+    run_sql(duckdb_file,
+            "CREATE TABLE orders AS SELECT range AS id, range % 7 AS amount FROM range(50)")
+    
+    analysis = DatabaseAnalyzer(duckdb_file, 'duckdb').analyze()
+    figlet_titles = [chart['title'] for chart in analysis['orders'].recommended_charts
+                     if chart['chart_type'] == 'figlet']
+    
+    assert 'orders: Total amount' in figlet_titles
+    assert 'orders: Average amount' in figlet_titles
+    assert not [title for title in figlet_titles if title.endswith(' id')]
+
+
+def test_table_progress_is_grouped_in_table_order(duckdb_file, tmp_path, monkeypatch, capsys):
+    """Test that concurrent table workers print each table's progress as one block."""
+    monkeypatch.chdir(tmp_path)
+    run_sql(duckdb_file,
+            "CREATE TABLE a AS SELECT range AS x, range % 3 AS y FROM range(20)",
+            "CREATE TABLE b AS SELECT range AS p, range % 5 AS q FROM range(20)")
+    
+    DatabaseAnalyzer(duckdb_file, 'duckdb').analyze()
+    lines = [line for line in capsys.readouterr().out.splitlines()
+             if line.startswith(("📊", "  Analyzing column"))]
+    
+    assert lines == [
+        "📊 Analyzing table: a",
+        "  Analyzing column: x (BIGINT)",
+        "  Analyzing column: y (BIGINT)",
+        "📊 Analyzing table: b",
+        "  Analyzing column: p (BIGINT)",
+        "  Analyzing column: q (BIGINT)",
+    ]
+
+
+def test_figlet_keeps_unique_float_measure(duckdb_file, tmp_path, monkeypatch):
+    """Test that a measure with all-distinct values still gets the figlet totals."""
+    monkeypatch.chdir(tmp_path)
+    run_sql(duckdb_file,
+            "CREATE TABLE sales AS SELECT range AS id, range * 1.25 + 0.001 AS revenue, "
+            "range % 4 AS region FROM range(200)")
+    
+    analysis = DatabaseAnalyzer(duckdb_file, 'duckdb').analyze()
+    figlet_titles = [chart['title'] for chart in analysis['sales'].recommended_charts
+                     if chart['chart_type'] == 'figlet']
+    
+    assert 'sales: Total revenue' in figlet_titles
+    assert 'sales: Average revenue' in figlet_titles
+    assert not [title for title in figlet_titles if title.endswith((' id', ' region'))]
@@ -0,0 +1,81 @@
+"""Tests for database connectors."""
+
+import pytest
+import duckdb
+
+from cheshire.db_connectors import DuckDBBackedConnector
+from cheshire.main import execute_query
+
+
+def test_duckdb_file_writable_between_queries(tmp_path):
+    """Test that a queried .duckdb file can be written to before the next query."""
+    db_path = str(tmp_path / "live.duckdb")
+    conn = duckdb.connect(db_path)
+    conn.execute("CREATE TABLE events (id INTEGER)")
+    conn.execute("INSERT INTO events VALUES (1)")
+    conn.close()
+    
+    assert execute_query("SELECT COUNT(*) AS n FROM events", db_path) == [{"n": 1}]
+    
+    # A writer (e.g. the process filling a live-refreshed database) must not be
+    # locked out by the connection cheshire used for the previous query
+    writer = duckdb.connect(db_path)
+    writer.execute("INSERT INTO events VALUES (2)")
+    writer.close()
+    
+    assert execute_query("SELECT COUNT(*) AS n FROM events", db_path) == [{"n": 2}]
+
+
+def test_memory_database_fresh_per_query():
+    """Test that every in-memory query starts from an empty database."""
+    for _ in range(2):
+        assert execute_query("CREATE TABLE t AS SELECT 1 AS a", ':memory:') == [{"Count": 1}]
+
+
+class StaleCatalogConnector(DuckDBBackedConnector):
+    """Connector whose table only becomes visible once its schema cache is cleared."""
+    
+    clear_cache_sql = "CREATE TABLE late AS SELECT 1 AS a"
+    
+    def _open_connection(self):
+        return duckdb.connect(':memory:')
+
+
+def test_query_retried_after_clearing_schema_cache():
+    """Test that a missing table clears the scanner's schema cache and retries."""
+    connector = StaleCatalogConnector()
+    try:
+        assert connector.execute_query("SELECT a FROM late") == [{"a": 1}]
+    finally:
+        connector.close()
+
+
+class FlakyPrepareConnector(DuckDBBackedConnector):
+    """Connector whose second pooled connection fails to prepare once."""
+    
+    def __init__(self):
+        super().__init__(pool_size=2)
+        self.prepared = 0
+    
+    def _open_connection(self):
+        return duckdb.connect(':memory:')
+    
+    def _prepare_connection(self, conn):
+        self.prepared += 1
+        if self.prepared == 2:
+            raise duckdb.Error("prepare failed")
+        return super()._prepare_connection(conn)
+
+
+def test_failed_prepare_does_not_use_up_pool_slot():
+    """Test that a connection failing to prepare leaves its pool slot free."""
+    connector = FlakyPrepareConnector()
+    try:
+        first = connector._acquire()
+        with pytest.raises(duckdb.Error):
+            connector._acquire()
+        assert connector._opened == 1
+        second = connector._acquire()
+        assert second is not first
+    finally:
+        connector.close()
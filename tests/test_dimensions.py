@@ -1,54 +1,56 @@
 """Tests for width and height dimension settings."""
 
 import pytest
-import subprocess
 import os
+from click.testing import CliRunner
+
+from tests.conftest import strip_ansi_codes
+
+
+@pytest.fixture(scope="module")
+def runner(cheshire_main):
+    """Invoke the cheshire command in-process."""
+    cli_runner = CliRunner()
+
+    def invoke(args):
+        return cli_runner.invoke(cheshire_main.main, args)
+
+    return invoke
 
 
 def count_output_lines(output):
     """Count non-empty lines in output, excluding ANSI escape sequences."""
-    from tests.conftest import strip_ansi_codes
     clean = strip_ansi_codes(output)
-    # Split and count non-empty lines
-    lines = [l for l in clean.split('\n') if l.strip()]
-    return len(lines)
+    # Count non-empty lines without building a list of them
+    return sum(1 for line in clean.splitlines() if line.strip())
 
 
 def measure_output_width(output):
     """Measure the maximum width of output lines."""
-    from tests.conftest import strip_ansi_codes
     clean = strip_ansi_codes(output)
-    lines = clean.split('\n')
-    max_width = 0
-    for line in lines:
-        # Strip trailing whitespace but keep internal spacing
-        line = line.rstrip()
-        if len(line) > max_width:
-            max_width = len(line)
-    return max_width
-
-
-def test_absolute_width_height():
-    """Test setting absolute width and height values."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 'A' as x, 10 as y UNION ALL SELECT 'B', 20", "bar", 
-         "--width", "40", "--height", "10"],
-        capture_output=True,
-        text=True
-    )
+    # Strip trailing whitespace but keep internal spacing
+    return max((len(line.rstrip()) for line in clean.splitlines()), default=0)
+
+
+@pytest.mark.parametrize("query,chart_type,width,height", [
+    ("SELECT 'A' as x, 10 as y UNION ALL SELECT 'B', 20", "bar", 40, 10),
+    ("SELECT 'Test' as x, 100 as y", "bar", 60, 15),
+    ("SELECT 1 as x, 10 as y UNION ALL SELECT 2, 20", "scatter", 45, 12),
+    ("SELECT 1 as x, 10 as y UNION ALL SELECT 2, 20 UNION ALL SELECT 3, 15", "line", 50, 10),
+], ids=["bar", "bar-single-row", "scatter", "line"])
+def test_absolute_width_height(runner, query, chart_type, width, height):
+    """Test that absolute width and height values constrain each chart type."""
+    result = runner([query, chart_type, "--width", str(width), "--height", str(height)])
     
     # Output should be constrained to roughly the specified dimensions
-    width = measure_output_width(result.stdout)
+    measured_width = measure_output_width(result.stdout)
     lines = count_output_lines(result.stdout)
     
-    # Width should be around 40 (allowing for some variance)
-    assert 35 <= width <= 45, f"Width was {width}, expected around 40"
-    
-    # Height should be around 10 lines
-    assert 8 <= lines <= 12, f"Height was {lines}, expected around 10"
+    assert width - 5 <= measured_width <= width + 5, f"Width was {measured_width}, expected around {width}"
+    assert height - 2 <= lines <= height + 2, f"Height was {lines}, expected around {height}"
 
 
-def test_percentage_width():
+def test_percentage_width(runner):
     """Test setting width as a percentage."""
     # Get terminal width
     try:
@@ -56,11 +58,7 @@ def test_percentage_width():
     except:
         terminal_width = 80
     
-    result = subprocess.run(
-        ["cheshire", "SELECT 'A' as x, 10 as y", "bar", "--width", "50%"],
-        capture_output=True,
-        text=True
-    )
+    result = runner(["SELECT 'A' as x, 10 as y", "bar", "--width", "50%"])
     
     width = measure_output_width(result.stdout)
     expected_width = terminal_width * 0.5
@@ -69,7 +67,7 @@ def test_percentage_width():
     assert abs(width - expected_width) < 10, f"Width was {width}, expected around {expected_width}"
 
 
-def test_percentage_height():
+def test_percentage_height(runner):
     """Test setting height as a percentage."""
     # Get terminal height
     try:
@@ -77,11 +75,7 @@ def test_percentage_height():
     except:
         terminal_height = 24
     
-    result = subprocess.run(
-        ["cheshire", "SELECT 'A' as x, 10 as y", "bar", "--height", "50%"],
-        capture_output=True,
-        text=True
-    )
+    result = runner(["SELECT 'A' as x, 10 as y", "bar", "--height", "50%"])
     
     lines = count_output_lines(result.stdout)
     expected_height = terminal_height * 0.5
@@ -90,101 +84,25 @@ def test_percentage_height():
     assert abs(lines - expected_height) < 5, f"Height was {lines}, expected around {expected_height}"
 
 
-def test_combined_width_height():
-    """Test setting both width and height together."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 'Test' as x, 100 as y", "bar", 
-         "--width", "60", "--height", "15"],
-        capture_output=True,
-        text=True
-    )
-    
-    width = measure_output_width(result.stdout)
-    lines = count_output_lines(result.stdout)
-    
-    assert 55 <= width <= 65, f"Width was {width}, expected around 60"
-    assert 13 <= lines <= 17, f"Height was {lines}, expected around 15"
-
-
-def test_invalid_width():
-    """Test handling of invalid width values."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 'A' as x, 10 as y", "bar", "--width", "invalid"],
-        capture_output=True,
-        text=True
-    )
-    
-    # Should get a warning about invalid width
-    assert "Invalid size value" in result.stderr or "Warning" in result.stderr
-
-
-def test_invalid_percentage():
-    """Test handling of invalid percentage values."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 'A' as x, 10 as y", "bar", "--width", "150%"],
-        capture_output=True,
-        text=True  
-    )
-    
-    # Should get a warning about percentage out of range
-    assert "Percentage must be between" in result.stderr or "Warning" in result.stderr
-
-
-def test_negative_dimensions():
-    """Test handling of negative dimension values."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 'A' as x, 10 as y", "bar", "--width", "-50"],
-        capture_output=True,
-        text=True
-    )
+@pytest.mark.parametrize("width,expected_message", [
+    ("invalid", "Invalid size value"),
+    ("150%", "Percentage must be between"),
+    ("-50", "must be positive"),
+])
+def test_invalid_width(runner, width, expected_message):
+    """Test that invalid, out-of-range and negative widths produce a warning."""
+    result = runner(["SELECT 'A' as x, 10 as y", "bar", "--width", width])
     
-    # Should get a warning about negative size
-    assert "must be positive" in result.stderr or "Warning" in result.stderr
+    assert expected_message in result.stderr or "Warning" in result.stderr
 
 
-def test_width_height_with_json():
+def test_width_height_with_json(runner):
     """Test that width/height don't affect JSON output."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 'A' as x, 10 as y", "json", 
-         "--width", "40", "--height", "10"],
-        capture_output=True,
-        text=True
+    result = runner(
+        ["SELECT 'A' as x, 10 as y", "json", 
+         "--width", "40", "--height", "10"]
     )
     
     # JSON output should not be affected by width/height
     assert '"x": "A"' in result.stdout
     assert '"y": 10' in result.stdout
-
-
-def test_width_height_applies_to_scatter():
-    """Test that width/height applies to scatter charts."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 1 as x, 10 as y UNION ALL SELECT 2, 20", "scatter",
-         "--width", "45", "--height", "12"],
-        capture_output=True,
-        text=True
-    )
-    
-    width = measure_output_width(result.stdout)
-    lines = count_output_lines(result.stdout)
-    
-    # Scatter plot should respect dimensions
-    assert 40 <= width <= 50
-    assert 10 <= lines <= 14
-
-
-def test_width_height_applies_to_line():
-    """Test that width/height applies to line charts."""
-    result = subprocess.run(
-        ["cheshire", "SELECT 1 as x, 10 as y UNION ALL SELECT 2, 20 UNION ALL SELECT 3, 15", "line",
-         "--width", "50", "--height", "10"],
-        capture_output=True,
-        text=True
-    )
-    
-    width = measure_output_width(result.stdout)
-    lines = count_output_lines(result.stdout)
-    
-    # Line chart should respect dimensions  
-    assert 45 <= width <= 55
-    assert 8 <= lines <= 12
\ No newline at end of file
@@ -7,38 +7,38 @@ import tempfile
 import os
 from pathlib import Path
 
+from tests.conftest import strip_ansi_codes, extract_json_array
 
-def test_json_input_via_pipe():
-    """Test piping JSON data into cheshire."""
-    json_data = [
+# Every test here launches the cheshire executable in a subprocess
+pytestmark = pytest.mark.slow
+
+
+@pytest.fixture(scope="module")
+def scores_payload():
+    """Scores for three people, pre-encoded for stdin."""
+    return json.dumps([
         {"name": "Alice", "score": 90},
         {"name": "Bob", "score": 85},
         {"name": "Charlie", "score": 95}
-    ]
-    
+    ]).encode()
+
+
+def test_json_input_via_pipe(scores_payload):
+    """Test piping JSON data into cheshire."""
     # Pipe JSON and query it
-    process = subprocess.Popen(
+    process = subprocess.run(
         ["cheshire", "SELECT name as x, score as y FROM data", "json"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        input=scores_payload,
+        capture_output=True
     )
-    
-    stdout, stderr = process.communicate(input=json.dumps(json_data))
+    stdout, stderr = process.stdout, process.stderr
     
     # Check that data was loaded
-    assert "Loaded 3 rows" in stderr
+    assert b"Loaded 3 rows" in stderr
     
-    # Parse the JSON output
-    # Extract JSON from output (might have ANSI codes)
-    import re
-    # Clean ANSI codes first
-    from tests.conftest import strip_ansi_codes
-    clean_stdout = strip_ansi_codes(stdout)
-    json_match = re.search(r'\[.*?\]', clean_stdout, re.DOTALL)
-    if json_match:
-        result = json.loads(json_match.group())
+    # Parse the JSON output (might have ANSI codes)
+    result = extract_json_array(strip_ansi_codes(stdout))
+    if result is not None:
         assert len(result) == 3
         assert any(r["x"] == "Alice" and r["y"] == 90 for r in result)
         assert any(r["x"] == "Charlie" and r["y"] == 95 for r in result)
@@ -51,49 +51,44 @@ def test_json_input_with_flag():
         {"category": "B", "value": 20}
     ]
     
-    process = subprocess.Popen(
+    process = subprocess.run(
         ["cheshire", "SELECT * FROM data", "json", "--json-input"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        input=json.dumps(json_data),
+        capture_output=True,
         text=True
     )
-    
-    stdout, stderr = process.communicate(input=json.dumps(json_data))
+    stdout, stderr = process.stdout, process.stderr
     
     # Check that data was loaded
     assert "Loaded 2 rows" in stderr
     assert "category, value" in stderr
 
 
-def test_json_aggregation():
-    """Test SQL aggregation on JSON data."""
-    json_data = [
+@pytest.fixture(scope="module")
+def category_amounts_payload():
+    """Amounts across two categories, pre-encoded for stdin."""
+    return json.dumps([
         {"category": "A", "amount": 100},
         {"category": "B", "amount": 200},
         {"category": "A", "amount": 150},
         {"category": "B", "amount": 50}
-    ]
-    
+    ]).encode()
+
+
+def test_json_aggregation(category_amounts_payload):
+    """Test SQL aggregation on JSON data."""
     query = "SELECT category as x, SUM(amount) as y FROM data GROUP BY category ORDER BY y DESC"
     
-    process = subprocess.Popen(
+    process = subprocess.run(
         ["cheshire", query, "json"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        input=category_amounts_payload,
+        capture_output=True
     )
-    
-    stdout, stderr = process.communicate(input=json.dumps(json_data))
+    stdout, stderr = process.stdout, process.stderr
     
     # Parse the JSON output
-    import re
-    from tests.conftest import strip_ansi_codes
-    clean_stdout = strip_ansi_codes(stdout)
-    json_match = re.search(r'\[.*?\]', clean_stdout, re.DOTALL)
-    if json_match:
-        result = json.loads(json_match.group())
+    result = extract_json_array(strip_ansi_codes(stdout))
+    if result is not None:
         assert len(result) == 2
         # Check aggregation results
         assert result[0]["x"] in ["A", "B"]
@@ -106,34 +101,31 @@ def test_json_aggregation():
             assert result[1]["y"] == 250
 
 
-def test_json_filtering():
-    """Test filtering JSON data with WHERE clause."""
-    json_data = [
+@pytest.fixture(scope="module")
+def people_payload():
+    """People with ages and cities, pre-encoded for stdin."""
+    return json.dumps([
         {"name": "Alice", "age": 30, "city": "NYC"},
         {"name": "Bob", "age": 25, "city": "LA"},
         {"name": "Charlie", "age": 35, "city": "NYC"},
         {"name": "David", "age": 28, "city": "Chicago"}
-    ]
-    
+    ]).encode()
+
+
+def test_json_filtering(people_payload):
+    """Test filtering JSON data with WHERE clause."""
     query = "SELECT name as x, age as y FROM data WHERE city = 'NYC'"
     
-    process = subprocess.Popen(
+    process = subprocess.run(
         ["cheshire", query, "json"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        input=people_payload,
+        capture_output=True
     )
-    
-    stdout, stderr = process.communicate(input=json.dumps(json_data))
+    stdout, stderr = process.stdout, process.stderr
     
     # Parse the JSON output
-    import re
-    from tests.conftest import strip_ansi_codes
-    clean_stdout = strip_ansi_codes(stdout)
-    json_match = re.search(r'\[.*?\]', clean_stdout, re.DOTALL)
-    if json_match:
-        result = json.loads(json_match.group())
+    result = extract_json_array(strip_ansi_codes(stdout))
+    if result is not None:
         assert len(result) == 2  # Only NYC records
         names = [r["x"] for r in result]
         assert "Alice" in names
@@ -146,15 +138,13 @@ def test_single_json_object():
     """Test that a single JSON object is handled correctly."""
     json_data = {"name": "Alice", "score": 100}
     
-    process = subprocess.Popen(
+    process = subprocess.run(
         ["cheshire", "SELECT * FROM data", "json"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        input=json.dumps(json_data),
+        capture_output=True,
         text=True
     )
-    
-    stdout, stderr = process.communicate(input=json.dumps(json_data))
+    stdout, stderr = process.stdout, process.stderr
     
     # Should wrap single object in array
     assert "Loaded 1 rows" in stderr or "Loaded 1 row" in stderr
@@ -164,30 +154,32 @@ def test_invalid_json():
     """Test handling of invalid JSON input."""
     invalid_json = "not valid json"
     
-    process = subprocess.Popen(
+    process = subprocess.run(
         ["cheshire", "SELECT * FROM data", "json", "--json-input"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        input=invalid_json,
+        capture_output=True,
         text=True
     )
-    
-    stdout, stderr = process.communicate(input=invalid_json)
+    stdout, stderr = process.stdout, process.stderr
     
     # When invalid JSON is provided with --json-input flag, it should handle gracefully
     # Since the JSON is invalid, it won't create the 'data' table, leading to an error
     assert "Error" in stdout or "data does not exist" in stdout or process.returncode != 0
 
 
-def test_json_with_complex_query():
-    """Test complex SQL queries on JSON data."""
-    json_data = [
+@pytest.fixture(scope="module")
+def daily_sales_payload():
+    """Two days of per-product sales, pre-encoded for stdin."""
+    return json.dumps([
         {"date": "2024-01-01", "product": "A", "sales": 100},
         {"date": "2024-01-01", "product": "B", "sales": 150},
         {"date": "2024-01-02", "product": "A", "sales": 120},
         {"date": "2024-01-02", "product": "B", "sales": 180},
-    ]
-    
+    ]).encode()
+
+
+def test_json_with_complex_query(daily_sales_payload):
+    """Test complex SQL queries on JSON data."""
     # Complex query with multiple aggregations
     query = """
     SELECT 
@@ -199,23 +191,16 @@ def test_json_with_complex_query():
     HAVING SUM(sales) > 200
     """
     
-    process = subprocess.Popen(
+    process = subprocess.run(
         ["cheshire", query, "json"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+        input=daily_sales_payload,
+        capture_output=True
     )
-    
-    stdout, stderr = process.communicate(input=json.dumps(json_data))
+    stdout, stderr = process.stdout, process.stderr
     
     # Parse the JSON output
-    import re
-    from tests.conftest import strip_ansi_codes
-    clean_stdout = strip_ansi_codes(stdout)
-    json_match = re.search(r'\[.*?\]', clean_stdout, re.DOTALL)
-    if json_match:
-        result = json.loads(json_match.group())
+    result = extract_json_array(strip_ansi_codes(stdout))
+    if result is not None:
         # Only product B should match (150 + 180 = 330 > 200)
         assert len(result) == 1
         assert result[0]["x"] == "B"
@@ -236,21 +221,18 @@ def test_json_from_file():
         temp_file = f.name
     
     try:
-        # Use cat to pipe the file content
-        result = subprocess.run(
-            f"cat {temp_file} | cheshire 'SELECT AVG(value) as avg_value FROM data' json",
-            shell=True,
-            capture_output=True,
-            text=True
-        )
+        # Feed the file straight to cheshire's stdin
+        with open(temp_file, 'rb') as json_file:
+            result = subprocess.run(
+                ["cheshire", "SELECT AVG(value) as avg_value FROM data", "json"],
+                stdin=json_file,
+                capture_output=True,
+                text=True
+            )
         
         # Parse the JSON output
-        import re
-        from tests.conftest import strip_ansi_codes
-        clean_stdout = strip_ansi_codes(result.stdout)
-        json_match = re.search(r'\[.*?\]', clean_stdout, re.DOTALL)
-        if json_match:
-            output = json.loads(json_match.group())
+        output = extract_json_array(strip_ansi_codes(result.stdout))
+        if output is not None:
             assert len(output) == 1
             assert output[0]["avg_value"] == 200.0
     finally:
@@ -2,18 +2,13 @@
 
 import pytest
 import json
-import sys
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
-from io import StringIO
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests.conftest import strip_ansi_codes
 
 
-def test_json_visualization():
+def test_json_visualization(cheshire_main):
     """Test JSON output format."""
-    from cheshire.main import main
-    
     # Test data
     test_results = [
         {"name": "Alice", "score": 95, "grade": "A"},
@@ -45,10 +40,11 @@ def test_rich_table_formatting():
         table.add_row("Alice", "100", "A")
         table.add_row("Bob", "200", "B")
         
-        # Capture output
-        console = Console(file=StringIO(), force_terminal=True)
-        console.print(table)
-        output = console.file.getvalue()
+        # Capture the rendered text without writing it to the terminal
+        console = Console(width=80)
+        with console.capture() as capture:
+            console.print(table)
+        output = capture.get()
         
         # Check that table was generated
         assert "Test Data" in output
@@ -59,20 +55,13 @@ def test_rich_table_formatting():
         pytest.skip("Rich library not available")
 
 
-def test_figlet_text_generation():
+def test_figlet_text_generation(standard_figlet):
     """Test Figlet ASCII art text generation."""
-    try:
-        from pyfiglet import Figlet
-        
-        fig = Figlet(font='standard')
-        output = fig.renderText("TEST")
-        
-        # Should generate ASCII art
-        assert len(output) > 0
-        assert "TEST" in output or "_" in output or "|" in output
-        
-    except ImportError:
-        pytest.skip("Pyfiglet not available")
+    output = standard_figlet.renderText("TEST")
+    
+    # Should generate ASCII art
+    assert len(output) > 0
+    assert "TEST" in output or "_" in output or "|" in output
 
 
 def test_bar_chart_data_validation():
@@ -145,6 +134,20 @@ def test_pie_chart_percentage_calculation():
     assert percentages[2] == 20.0
 
 
+def test_pie_chart_colors_cycle_past_palette():
+    """Test that pie charts with more segments than palette colors reuse colors."""
+    from cheshire.pie_chart import generate_colors, render_pie_chart
+
+    colors = generate_colors(13)
+    assert len(colors) == 13
+    assert colors[10:] == colors[:3]
+
+    values = [50] + [1] * 12
+    labels = [f"Slice {i}" for i in range(13)]
+    output = render_pie_chart(values, labels, radius=4, auto_size=False)
+    assert "Slice 12" in output
+
+
 def test_map_coordinate_validation():
     """Test validation of geographic coordinates."""
     
@@ -221,34 +224,19 @@ def test_chart_size_constraints():
         assert is_valid == should_be_valid
 
 
-def test_live_refresh_interval_parsing():
+@pytest.mark.parametrize("interval_str,expected_seconds", [
+    ("5s", 5),        # 5 seconds
+    ("1m", 60),       # 1 minute
+    ("0.5h", 1800),   # 30 minutes
+    ("2h", 7200),     # 2 hours
+])
+def test_live_refresh_interval_parsing(cheshire_main, interval_str, expected_seconds):
     """Test parsing of live refresh intervals."""
-    
-    test_intervals = [
-        ("5s", 5),        # 5 seconds
-        ("1m", 60),       # 1 minute
-        ("0.5h", 1800),   # 30 minutes
-        ("2h", 7200),     # 2 hours
-    ]
-    
-    for interval_str, expected_seconds in test_intervals:
-        # Parse interval
-        if interval_str.endswith('s'):
-            seconds = float(interval_str[:-1])
-        elif interval_str.endswith('m'):
-            seconds = float(interval_str[:-1]) * 60
-        elif interval_str.endswith('h'):
-            seconds = float(interval_str[:-1]) * 3600
-        else:
-            seconds = float(interval_str)
-        
-        assert seconds == expected_seconds
+    assert cheshire_main.parse_interval(interval_str) == expected_seconds
 
 
 def test_logo_display():
     """Test that logo displays without errors."""
-    from tests.conftest import strip_ansi_codes
-    
     # Mock logo data
     mock_logo = "\\e[31m╔═══╗\\e[0m\\n\\e[31m║ C ║\\e[0m\\n\\e[31m╚═══╝\\e[0m"
     